@@ -7,6 +7,10 @@ def create_app():
     app.config['SECRET_KEY'] = os.environ.get('FLASK_SECRET_KEY', 'devsecret')
     app.config['SESSION_TYPE'] = 'filesystem'
     Session(app)
+    if os.environ.get('HTTP_CASSETTE'):
+        # Offline runs: serve outbound HTTP from a recording (see replay)
+        import replay
+        replay.install_from_env()
     from .routes import main
     app.register_blueprint(main)
     return app 
\ No newline at end of file
@@ -1,13 +1,25 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, send_from_directory, abort, jsonify, session
+from flask import Blueprint, render_template, request, redirect, url_for, flash, send_file, send_from_directory, abort, jsonify, session
 from .forms import GenerateBriefingForm
-from main import run_pipeline, fetch_articles_for_briefing, generate_briefing_from_articles
+from main import run_pipeline, fetch_articles_for_briefing, resume_briefing
 import os
 import re
+import threading
+from contextlib import nullcontext
 from datetime import datetime
-from .utils import list_briefings, load_config, save_config, reset_config
-from fund_news_fetcher import fetch_news_for_funds
+from .utils import list_briefings, count_briefings, load_config, save_config, reset_config, get_config_path
+from config import ConfigError
+from jobs import FAILED, QUEUED, RUNNING, get_job_runner
+from screening_store import get_screening_store
+from news_store import FUND_NEWS, FUND_NEWS_PATH, NEWSAPI, PAGE_SIZE, SEARCH_PAGE_SIZE, get_news_store
+import artifact_cache
+import briefing_index
+import checkpoints
+import metrics
+import profiling
 import json
-import pandas as pd
+
+# fund_info, fund_history and fund_news_fetcher (pandas/NumPy) are imported inside the views
+# that use them, so the app starts without loading pandas.
 
 main = Blueprint('main', __name__)
 
@@ -15,32 +27,27 @@ main = Blueprint('main', __name__)
 OUTPUT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'output'))
 ALLOWED_EXTENSIONS = {'.pdf', '.html', '.md'}
 FILENAME_RE = re.compile(r'^briefing_\d{4}-\d{2}-\d{2}(_[\w-]+)?\.(pdf|html|md)$')
+BRIEFINGS_PAGE_SIZE = 50
 
 @main.route('/')
 def home():
     # Fetch recent briefings
-    all_briefings = list_briefings() # This is a dict
-    
-    # Sort briefings by datetime object, already provided by list_briefings
-    # The list_briefings function now returns a sorted dict, but we'll sort here just in case.
-    sorted_briefings = sorted(all_briefings.values(), key=lambda x: x['datetime'], reverse=True)
-    recent_briefings = sorted_briefings[:5]
+    recent_briefings = list(list_briefings(limit=5, include_archived=False).values())
 
     # Fetch fund performance data
+    from fund_info import load_fund_data, with_discount_analytics, FUND_DATA_PATH
+    from fund_history import get_discount_analytics
+
     fund_performance = None
     funds_last_updated = None
     try:
-        fund_data_path = 'data/fund_analysis_results.csv'
-        fund_df = pd.read_csv(fund_data_path)
-        # Sort by discount
-        fund_df_sorted = fund_df.sort_values('Discount (%)', ascending=False)
+        fund_data = load_fund_data(FUND_DATA_PATH)
+        if fund_data is None:
+            raise FileNotFoundError(FUND_DATA_PATH)
         fund_performance = {
-            'all_funds': fund_df_sorted.to_dict('records')
+            'all_funds': with_discount_analytics(fund_data['records'], get_discount_analytics())
         }
-        # Get last updated time
-        if os.path.exists(fund_data_path):
-            last_updated_ts = os.path.getmtime(fund_data_path)
-            funds_last_updated = datetime.fromtimestamp(last_updated_ts).strftime('%Y-%m-%d %H:%M:%S')
+        funds_last_updated = fund_data['last_updated']
     except Exception as e:
         print(f"Could not load fund performance data for dashboard: {e}")
 
@@ -61,32 +68,74 @@ def generate():
             if not articles:
                 error = 'No articles found.'
                 return render_template('generate.html', form=form, result=None, error=error)
-            # Store articles in session for human screening
-            session['screen_articles'] = articles
+            # Store articles once for human screening; the session keeps only the run id
+            store = get_screening_store()
+            if session.get('screen_run'):
+                store.delete_run(session['screen_run'])
+            session['screen_run'] = store.create_run(articles)
             session['screen_index'] = 0
-            session['accepted_articles'] = []
+            session['accepted_ids'] = set()
+            # /generate?profile=1: profile the briefing job started when screening finishes
+            session['profile'] = request.args.get('profile') == '1'
+
             return redirect(url_for('main.human_screen'))
         except Exception as e:
             error = str(e)
             flash(f'Error: {error}', 'danger')
     return render_template('generate.html', form=form, result=result, error=error)
 
-@main.route('/download/<path:filename>')
-def download_file(filename):
+def _send_briefing_file(filename, as_attachment):
+    """
+    Serve a briefing file with validators (ETag, Last-Modified; 304 and Range handled by
+    send_file). Files still linked to their rendered artifact get the artifact digest as a
+    strong ETag and, for clients that accept it, the precompressed sibling.
+    """
     if not FILENAME_RE.match(filename) or not os.path.splitext(filename)[1] in ALLOWED_EXTENSIONS:
         abort(404)
-    return send_from_directory(OUTPUT_DIR, filename, as_attachment=True)
+    file_path = os.path.join(OUTPUT_DIR, filename)
+    if not os.path.isfile(file_path):
+        abort(404)
+    ext = os.path.splitext(filename)[1][1:]
+    fmt = artifact_cache.EXTENSION_FORMATS[ext]
+    send_path, etag, encoding = file_path, True, None
+    info = briefing_index.get_file_info(OUTPUT_DIR, filename)
+    if info and info['digest'] and artifact_cache.is_artifact(OUTPUT_DIR, info['digest'], fmt, file_path):
+        etag = f"{info['digest']}-{ext}"
+        for candidate in artifact_cache.ENCODING_SUFFIXES:
+            accepted = request.accept_encodings[candidate] > 0
+            compressed = accepted and artifact_cache.compressed_path(OUTPUT_DIR, info['digest'], fmt, candidate)
+            if compressed:
+                send_path, encoding, etag = compressed, candidate, f"{etag}-{candidate}"
+                break
+    response = send_file(send_path, as_attachment=as_attachment, download_name=filename,
+                         etag=etag, last_modified=os.path.getmtime(file_path))
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.cache_control.no_cache = True  # same file names are regenerated: always revalidate
+    return response
+
+@main.route('/download/<path:filename>')
+def download_file(filename):
+    return _send_briefing_file(filename, as_attachment=True)
 
 @main.route('/view/<path:filename>')
 def view_file(filename):
-    if not FILENAME_RE.match(filename) or not os.path.splitext(filename)[1] in ALLOWED_EXTENSIONS:
-        abort(404)
-    return send_from_directory(OUTPUT_DIR, filename, as_attachment=False)
+    return _send_briefing_file(filename, as_attachment=False)
 
 @main.route('/briefings')
 def briefings():
-    briefings_by_date = list_briefings()
-    return render_template('briefings.html', briefings_by_date=briefings_by_date)
+    page = max(request.args.get('page', 1, type=int) or 1, 1)
+    total = count_briefings()
+    briefings_by_date = list_briefings(limit=BRIEFINGS_PAGE_SIZE, offset=(page - 1) * BRIEFINGS_PAGE_SIZE)
+    pages = max((total + BRIEFINGS_PAGE_SIZE - 1) // BRIEFINGS_PAGE_SIZE, 1)
+    return render_template('briefings.html', briefings_by_date=briefings_by_date, page=page, pages=pages, total=total)
+
+@main.route('/archive/<path:filename>')
+def download_archive(filename):
+    if not briefing_index.ARCHIVE_RE.match(filename):
+        abort(404)
+    return send_from_directory(os.path.join(OUTPUT_DIR, briefing_index.ARCHIVE_DIRNAME), filename, as_attachment=True)
 
 @main.route('/config', methods=['GET'])
 def config():
@@ -115,6 +164,8 @@ def save_config_route():
             existing_config['KEYWORDS'] = data['KEYWORDS']
         save_config(existing_config)
         return jsonify({'success': True, 'message': 'Configuration saved successfully.'})
+    except ConfigError as e:
+        return jsonify({'success': False, 'message': f'Invalid configuration: {e}'}), 400
     except Exception as e:
         return jsonify({'success': False, 'message': f'Error saving configuration: {str(e)}'}), 500
 
@@ -128,7 +179,7 @@ def reset_config_route():
 
 @main.route('/config/download', methods=['GET'])
 def download_config():
-    config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config.json')
+    config_path = get_config_path()
     return send_from_directory(os.path.dirname(config_path), os.path.basename(config_path), as_attachment=True)
 
 @main.route('/config/upload', methods=['POST'])
@@ -140,10 +191,11 @@ def upload_config():
         return jsonify({'success': False, 'message': 'No selected file.'}), 400
     try:
         config_data = file.read().decode('utf-8')
-        import json
         config_json = json.loads(config_data)
         save_config(config_json)
         return jsonify({'success': True, 'message': 'Configuration uploaded and saved.'})
+    except ValueError as e:  # malformed JSON or ConfigError
+        return jsonify({'success': False, 'message': f'Invalid configuration: {e}'}), 400
     except Exception as e:
         return jsonify({'success': False, 'message': f'Error uploading configuration: {str(e)}'}), 500
 
@@ -157,12 +209,9 @@ def preview_file(filename):
     if not os.path.exists(file_path):
         return jsonify({'error': 'File not found.'}), 404
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = [next(f) for _ in range(20)]  # First 20 lines
-        preview = ''.join(lines)
-        # Optionally, truncate if too long
-        if len(preview) > 2000:
-            preview = preview[:2000] + '\n...'
+        # Excerpt stored in the briefing index at render time; read the file only if missing
+        info = briefing_index.get_file_info(OUTPUT_DIR, filename)
+        preview = info['excerpt'] if info and info['excerpt'] is not None else briefing_index.read_excerpt(file_path)
         return jsonify({'preview': preview})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -176,6 +225,8 @@ def delete_file(filename):
         return jsonify({'error': 'File not found.'}), 404
     try:
         os.remove(file_path)
+        briefing_index.remove_files(OUTPUT_DIR, [filename])
+        artifact_cache.release(OUTPUT_DIR, [filename])
         return jsonify({'success': True})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -183,148 +234,316 @@ def delete_file(filename):
 @main.route('/delete_briefing/<string:group_key>', methods=['POST'])
 def delete_briefing_group(group_key):
     try:
-        # Reconstruct filenames from group_key (date_customName)
-        parts = group_key.split('_')
-        date_str = parts[0]
-        custom_name = parts[1] if len(parts) > 1 else None
-
-        # Find all files for this group and delete them
-        files_deleted_count = 0
-        for ext in ALLOWED_EXTENSIONS:
-            fname = f"briefing_{date_str}"
-            if custom_name and custom_name != 'daily':
-                fname += f"_{custom_name}"
-            fname += ext
-            
+        briefing = briefing_index.get_briefing(OUTPUT_DIR, group_key)
+        if not briefing or not briefing['files']:
+            return jsonify({'success': False, 'error': 'No files found for this briefing.'}), 404
+
+        deleted = []
+        for fname in briefing['files'].values():
             file_path = os.path.join(OUTPUT_DIR, fname)
             if os.path.exists(file_path):
                 os.remove(file_path)
-                files_deleted_count += 1
-        
-        if files_deleted_count > 0:
-            return jsonify({'success': True})
-        else:
-            return jsonify({'success': False, 'error': 'No files found for this briefing.'}), 404
-            
+            deleted.append(fname)
+        briefing_index.remove_files(OUTPUT_DIR, deleted)
+        artifact_cache.release(OUTPUT_DIR, deleted)
+        # Run reports and profiles are not indexed; they go with the briefing
+        base = os.path.splitext(os.path.join(OUTPUT_DIR, deleted[0]))[0]
+        for suffix in (metrics.RUN_REPORT_SUFFIX,) + profiling.PROFILE_SUFFIXES:
+            if os.path.exists(base + suffix):
+                os.remove(base + suffix)
+        return jsonify({'success': True})
+
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+def update_fund_news_job(progress=None):
+    if progress:
+        progress('fetch')
+    from fund_news_fetcher import fetch_news_for_funds
+
+    new_articles_count = fetch_news_for_funds()
+    message = f"Fund news updated. Found {new_articles_count} new articles."
+    if new_articles_count == 0:
+        message = "Fund news is already up-to-date. No new articles found."
+    return {'new_articles': new_articles_count, 'message': message}
+
 @main.route('/update_fund_news', methods=['POST'])
 def update_fund_news():
+    # Normally kept current by the scheduler; a manual update runs as a background job
     try:
-        new_articles_count = fetch_news_for_funds()
-        message = f"Fund news updated. Found {new_articles_count} new articles."
-        if new_articles_count == 0:
-            message = "Fund news is already up-to-date. No new articles found."
-        return jsonify({'success': True, 'message': message})
+        job_id = get_job_runner().submit('update_fund_news', update_fund_news_job)
+        return jsonify({'success': True, 'message': 'Fund news update started.', 'job_id': job_id,
+                        'status_url': url_for('main.job_status', job_id=job_id)})
     except Exception as e:
         return jsonify({'success': False, 'message': f'Error updating fund news: {str(e)}'}), 500
 
+DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+SENTIMENTS = ('Positive', 'Neutral', 'Negative')
+
+def _fund_news_filters(args):
+    """Query filters from request args; malformed dates and unknown sentiments are ignored."""
+    filters = {
+        'fund': args.get('fund') or None,
+        'start': args.get('start') if DATE_RE.match(args.get('start', '')) else None,
+        'end': args.get('end') if DATE_RE.match(args.get('end', '')) else None,
+        'sentiment': args.get('sentiment') if args.get('sentiment') in SENTIMENTS else None,
+        'text': (args.get('q') or '').strip() or None,
+    }
+    return filters
+
+def _query_fund_news(args):
+    filters = _fund_news_filters(args)
+    try:
+        page = get_news_store().query(cursor=args.get('cursor') or None, **filters)
+    except ValueError:
+        # Bad or stale cursor: start from the first page
+        page = get_news_store().query(**filters)
+    return filters, page
+
 @main.route('/fund_news', methods=['GET'])
 def fund_news():
-    news_path = 'data/marketaux_news_results.json'
     last_updated = None
-    if os.path.exists(news_path):
-        last_updated_ts = os.path.getmtime(news_path)
+    if os.path.exists(FUND_NEWS_PATH):
+        last_updated_ts = os.path.getmtime(FUND_NEWS_PATH)
         last_updated = datetime.fromtimestamp(last_updated_ts).strftime('%Y-%m-%d %H:%M:%S')
+    filters, page = _query_fund_news(request.args)
+    return render_template('fund_news.html', news=page['articles'], next_cursor=page['next_cursor'],
+                           funds=get_news_store().funds(), filters=filters, sentiments=SENTIMENTS,
+                           last_updated=last_updated)
+
+@main.route('/api/fund_news', methods=['GET'])
+def fund_news_api():
+    """Paginated fund news: ?fund=&start=YYYY-MM-DD&end=YYYY-MM-DD&sentiment=&q=&cursor=&limit="""
+    filters = _fund_news_filters(request.args)
+    try:
+        limit = min(max(int(request.args.get('limit', PAGE_SIZE)), 1), 500)
+    except ValueError:
+        return jsonify({'error': 'Invalid limit.'}), 400
+    try:
+        page = get_news_store().query(cursor=request.args.get('cursor') or None, limit=limit, **filters)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(page)
+
+@main.route('/api/fund_news/funds', methods=['GET'])
+def fund_news_funds_api():
+    return jsonify({'funds': get_news_store().funds()})
 
+SEARCH_KINDS = {FUND_NEWS: 'Fund news', NEWSAPI: 'NewsAPI'}
+
+def _search(args):
+    filters = _fund_news_filters(args)
+    kind = args.get('kind') if args.get('kind') in SEARCH_KINDS else None
+    try:
+        limit = min(max(int(args.get('limit', SEARCH_PAGE_SIZE)), 1), 100)
+        offset = max(int(args.get('offset', 0)), 0)
+    except ValueError:
+        raise ValueError('Invalid limit or offset.')
+    results = get_news_store().search(filters['text'] or '', kind=kind, fund=filters['fund'],
+                                      start=filters['start'], end=filters['end'], limit=limit, offset=offset)
+    return dict(filters, kind=kind, limit=limit, offset=offset), results
+
+@main.route('/search', methods=['GET'])
+def search():
+    try:
+        filters, results = _search(request.args)
+    except ValueError as e:
+        flash(str(e), 'warning')
+        filters, results = _search({'q': request.args.get('q', '')})
+    return render_template('search.html', results=results['results'], total=results['total'], filters=filters,
+                           funds=get_news_store().funds(), kinds=SEARCH_KINDS)
+
+@main.route('/api/search', methods=['GET'])
+def search_api():
+    """Ranked full-text search: ?q=&kind=&fund=&start=YYYY-MM-DD&end=YYYY-MM-DD&limit=&offset="""
     try:
-        with open(news_path, 'r', encoding='utf-8') as f:
-            news = json.load(f)
-    except Exception:
-        news = []
-    return render_template('fund_news.html', news=news, last_updated=last_updated)
+        filters, results = _search(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(dict(results, limit=filters['limit'], offset=filters['offset']))
 
 @main.route('/create_briefing_from_fund_news', methods=['GET', 'POST'])
 def create_briefing_from_fund_news():
-    import os
-    from datetime import datetime
-    result = None
-    error = None
-    # Load all fund news
-    try:
-        with open('data/marketaux_news_results.json', 'r', encoding='utf-8') as f:
-            all_news = json.load(f)
-    except Exception:
-        all_news = []
-    # Format published_at for readability
-    def format_date(date_str):
-        try:
-            dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            return dt.strftime('%d %b %Y, %H:%M')
-        except Exception:
-            return date_str
-    for art in all_news:
-        date_val = art.get('published_at') or art.get('publishedAt')
-        if date_val:
-            art['published_at_readable'] = format_date(date_val)
-    # Extract all unique funds
-    fund_set = set()
-    for art in all_news:
-        for fund in art.get('funds', []):
-            fund_set.add(fund)
-    funds = sorted(fund_set)
+    store = get_news_store()
+    filters, page = _query_fund_news(request.args)
+    context = {
+        'news': page['articles'],
+        'next_cursor': page['next_cursor'],
+        'funds': [fund['name'] for fund in store.funds()],
+        'filters': filters,
+        'result': None,
+        'error': None,
+    }
     # GET: show selection UI
     if request.method == 'GET':
-        return render_template('create_briefing_from_fund_news.html', news=all_news, funds=funds, result=None, error=None)
+        return render_template('create_briefing_from_fund_news.html', **context)
     # POST: generate briefing from selected articles
-    selected_uuids = request.form.getlist('selected_articles')
-    selected_articles = [art for art in all_news if str(art.get('uuid')) in selected_uuids]
-    if not selected_articles:
-        error = 'No articles selected.'
-        return render_template('create_briefing_from_fund_news.html', news=all_news, funds=funds, result=None, error=error)
-    # Generate briefing using the same format as the pipeline
-    # Use today's date for output
-    output_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'output'))
+    selected_ids = request.form.getlist('selected_articles')
+    if not selected_ids:
+        context['error'] = 'No articles selected.'
+        return render_template('create_briefing_from_fund_news.html', **context)
+    # Generate the briefing in the background; the page polls the job for progress
+    job_id = get_job_runner().submit('fund_news_briefing', generate_fund_news_briefing,
+                                     article_ids=selected_ids, output_dir=OUTPUT_DIR,
+                                     profile=request.args.get('profile') == '1')
+    return render_template('create_briefing_from_fund_news.html', job_id=job_id, **context)
+
+def generate_fund_news_briefing(article_ids, output_dir=OUTPUT_DIR, progress=None, profile=False):
+    """
+    Build and render a briefing from selected fund news articles (by news store id, no
+    summarisation), using the same formatter as the pipeline. Runs as a background job;
+    with profile=True its stages are profiled (see profiling).
+    """
+    from formatter import write_briefing_outputs
+    from reporter import build_briefing
+    articles = get_news_store().get_many(article_ids)
     os.makedirs(output_dir, exist_ok=True)
+    # Use today's date for output
     date_str = datetime.now().strftime('%Y-%m-%d')
     markdown_path = os.path.join(output_dir, f'briefing_{date_str}_custom.md')
     html_path = os.path.join(output_dir, f'briefing_{date_str}_custom.html')
     pdf_path = os.path.join(output_dir, f'briefing_{date_str}_custom.pdf')
-    # Use the same formatter as the pipeline
-    from formatter import generate_markdown, generate_html, generate_pdf
-    from reporter import build_briefing
-    # Build a minimal briefing dict
-    briefing = build_briefing(selected_articles)
-    # Optionally add a custom intro or fund performance if desired
-    generate_markdown(briefing, markdown_path)
-    html_content = generate_html(briefing, logo_path='images/logo.png')
-    with open(html_path, 'w', encoding='utf-8') as html_file:
-        html_file.write(html_content)
-    generate_pdf(briefing, pdf_path, logo_path='images/logo.png')
+    with metrics.run('fund_news_briefing') as run_report, \
+            (profiling.profile_run(run_report, output_dir) if profile else nullcontext()):
+        if progress:
+            progress('build')
+        # Build a minimal briefing dict
+        with metrics.stage('build', len(articles)) as stage:
+            briefing = build_briefing(articles)
+            stage.articles_out = len(briefing['articles'])
+        if progress:
+            progress('render')
+        with metrics.stage('render', len(briefing['articles'])):
+            timings = write_briefing_outputs(briefing, markdown_path, html_path, pdf_path, logo_path='images/logo.png')
+        run_report.path = metrics.run_report_path(markdown_path)
     result = {
         'markdown': os.path.basename(markdown_path),
         'html': os.path.basename(html_path),
-        'pdf': os.path.basename(pdf_path)
+        'pdf': os.path.basename(pdf_path),
+        'run_report': os.path.basename(run_report.path),
+        'timings_ms': timings
     }
-    return render_template('create_briefing_from_fund_news.html', news=all_news, funds=funds, result=result, error=None)
+    if profile:
+        result['profile'] = run_report.profile_files[0]
+    return result
+
+def _finish_screening(run_id, accepted_ids, total):
+    """Submit a briefing job for the accepted articles, clear the screening run and show progress."""
+    if not accepted_ids:
+        return render_template('human_screen.html',
+                               finished=True,
+                               accepted_articles=[],
+                               total=total,
+                               result=None,
+                               error='No articles accepted.')
+    store = get_screening_store()
+    accepted_articles = store.get_articles(run_id, accepted_ids)
+    # The articles go in the run's checkpoints; the job (and its stored params) only has the run id
+    checkpoints.prune_runs(OUTPUT_DIR)
+    checkpoint = checkpoints.RunCheckpoint.create(OUTPUT_DIR, accepted_articles)
+    job_id = get_job_runner().submit('briefing', resume_briefing,
+                                     run_id=checkpoint.run_id, output_dir=OUTPUT_DIR,
+                                     profile=session.pop('profile', False))
+    # Clean up session and the stored run
+    store.delete_run(run_id)
+    session.pop('screen_run', None)
+    session.pop('screen_index', None)
+    session.pop('accepted_ids', None)
+    return render_template('human_screen.html',
+                           finished=True,
+                           accepted_articles=accepted_articles,
+                           total=total,
+                           result=None,
+                           job_id=job_id,
+                           error=None)
+
+@main.route('/metrics')
+def metrics_endpoint():
+    # Pipeline stage timings and counters of this process, in the Prometheus text format
+    return metrics.render(), 200, {'Content-Type': metrics.CONTENT_TYPE}
+
+# run id -> latest resume job submitted by this process
+_resume_jobs = {}
+_resume_lock = threading.Lock()
+
+def _resumable_run(job_id):
+    """Run id of a failed briefing job whose checkpoints are still there and not in use, else None."""
+    params = get_job_runner().params(job_id) or {}
+    run_id = params.get('run_id')
+    output_dir = params.get('output_dir', OUTPUT_DIR)
+    if run_id and checkpoints.run_exists(output_dir, run_id) \
+            and not checkpoints.RunCheckpoint(output_dir, run_id).in_progress():
+        return run_id
+    return None
+
+def _job_with_resume_url(job_id):
+    job = get_job_runner().get(job_id)
+    if job is not None and job['status'] == FAILED and _resumable_run(job_id):
+        job['resume_url'] = url_for('main.resume_job', job_id=job_id)
+    return job
+
+@main.route('/jobs/<job_id>')
+def job_page(job_id):
+    job = _job_with_resume_url(job_id)
+    if job is None:
+        abort(404)
+    return render_template('job.html', job=job)
+
+@main.route('/jobs/<job_id>/status')
+def job_status(job_id):
+    job = _job_with_resume_url(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found.'}), 404
+    return jsonify(job)
+
+@main.route('/jobs/<job_id>/resume', methods=['POST'])
+def resume_job(job_id):
+    # Redo only the stages the failed run did not complete, as a new job (see checkpoints)
+    runner = get_job_runner()
+    job = runner.get(job_id)
+    if job is None:
+        abort(404)
+    run_id = _resumable_run(job_id) if job['status'] == FAILED else None
+    if run_id is None:
+        flash('This job cannot be resumed (it is already being resumed, or its run finished).', 'warning')
+        return redirect(url_for('main.job_page', job_id=job_id))
+    params = runner.params(job_id)
+    output_dir = params.get('output_dir', OUTPUT_DIR)
+    with _resume_lock:
+        # A double click: the first resume job may still be queued, before it takes the run's lock
+        if _resume_jobs.get(run_id) and runner.get(_resume_jobs[run_id])['status'] in (QUEUED, RUNNING):
+            return redirect(url_for('main.job_page', job_id=_resume_jobs[run_id]))
+        _resume_jobs[run_id] = runner.submit('briefing', resume_briefing, run_id=run_id, output_dir=output_dir,
+                                             profile=params.get('profile', False), pdf=params.get('pdf', True))
+    return redirect(url_for('main.job_page', job_id=_resume_jobs[run_id]))
 
 @main.route('/human_screen', methods=['GET', 'POST'])
 def human_screen():
-    # Use articles from session, not from file
-    all_articles = session.get('screen_articles', [])
-    if not all_articles:
-        # If no articles in session, redirect to generate
+    # Articles live in the screening store; the session only holds the run id, cursor and accepted positions
+    store = get_screening_store()
+    run_id = session.get('screen_run')
+    total = store.total(run_id) if run_id else None
+    if not total:
+        # If no screening run in session, redirect to generate
         flash('No articles to screen. Please generate briefing first.', 'warning')
         return redirect(url_for('main.generate'))
 
     # Initialize session state if not present
     if 'screen_index' not in session or request.method == 'GET':
         session['screen_index'] = 0
-        session['accepted_articles'] = []
+        session['accepted_ids'] = set()
 
     screen_index = session.get('screen_index', 0)
-    accepted_articles = session.get('accepted_articles', [])
+    accepted_ids = session.get('accepted_ids', set())
 
     # Handle POST actions
     if request.method == 'POST':
         action = request.form.get('action')
         if action == 'accept':
             # Accept current article
-            if 0 <= screen_index < len(all_articles):
-                if all_articles[screen_index] not in accepted_articles:
-                    accepted_articles.append(all_articles[screen_index])
-                session['accepted_articles'] = accepted_articles
+            if 0 <= screen_index < total:
+                accepted_ids.add(screen_index)
+                session['accepted_ids'] = accepted_ids
             screen_index += 1
         elif action == 'reject':
             # Just move to next article
@@ -333,62 +552,23 @@ def human_screen():
             # Move to previous article, remove from accepted if it was accepted
             if screen_index > 0:
                 screen_index -= 1
-                article = all_articles[screen_index]
-                if article in accepted_articles:
-                    accepted_articles.remove(article)
-                session['accepted_articles'] = accepted_articles
+                accepted_ids.discard(screen_index)
+                session['accepted_ids'] = accepted_ids
         elif action == 'finish':
             # Finish screening, generate briefing from accepted articles
-            if not accepted_articles:
-                return render_template('human_screen.html',
-                                       finished=True,
-                                       accepted_articles=[],
-                                       total=len(all_articles),
-                                       result=None,
-                                       error='No articles accepted.')
-            # Generate briefing
-            output_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'output'))
-            result = generate_briefing_from_articles(accepted_articles, output_dir=output_dir)
-            # Clean up session
-            session.pop('screen_articles', None)
-            session.pop('screen_index', None)
-            session.pop('accepted_articles', None)
-            return render_template('human_screen.html',
-                                   finished=True,
-                                   accepted_articles=accepted_articles,
-                                   total=len(all_articles),
-                                   result=result,
-                                   error=None)
+            return _finish_screening(run_id, accepted_ids, total)
         session['screen_index'] = screen_index
 
     # If finished all articles, generate briefing automatically
-    if screen_index >= len(all_articles):
-        if not accepted_articles:
-            return render_template('human_screen.html',
-                                   finished=True,
-                                   accepted_articles=[],
-                                   total=len(all_articles),
-                                   result=None,
-                                   error='No articles accepted.')
-        output_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'output'))
-        result = generate_briefing_from_articles(accepted_articles, output_dir=output_dir)
-        # Clean up session
-        session.pop('screen_articles', None)
-        session.pop('screen_index', None)
-        session.pop('accepted_articles', None)
-        return render_template('human_screen.html',
-                               finished=True,
-                               accepted_articles=accepted_articles,
-                               total=len(all_articles),
-                               result=result,
-                               error=None)
+    if screen_index >= total:
+        return _finish_screening(run_id, accepted_ids, total)
 
     # Show current article
-    article = all_articles[screen_index]
+    article = store.get_article(run_id, screen_index)
     return render_template('human_screen.html',
                            article=article,
                            index=screen_index+1,
-                           total=len(all_articles),
+                           total=total,
                            finished=False,
                            result=None,
-                           error=None) 
\ No newline at end of file
+                           error=None)
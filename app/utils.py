@@ -1,65 +1,35 @@
-import json
 import os
-import re
-from datetime import datetime
 from flask import current_app
+import briefing_index
+from config import get_config_store
 
 OUTPUT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'output'))
-ALLOWED_EXTENSIONS = {'.pdf', '.html', '.md'}
-FILENAME_RE = re.compile(r'^briefing_(\d{4}-\d{2}-\d{2})(?:_([\w-]+))?\.(pdf|html|md)$')
 
-def list_briefings():
+def list_briefings(limit=None, offset=0, include_archived=True):
     """
-    Scan OUTPUT_DIR for briefing files, group by date and custom name, and return metadata.
+    Briefing groups from the output directory's manifest index (briefing_index), newest first.
     Returns:
-        dict: {group_key: { 'name': str, 'files': {format: filename, ...}, 'datetime': datetime_obj }}
+        dict: {group_key: { 'name': str, 'files': {format: filename, ...}, 'datetime': datetime_obj, 'archive': bundle or None }}
     """
-    briefings = {}
-    if not os.path.exists(OUTPUT_DIR):
-        return {}
-    for entry in os.scandir(OUTPUT_DIR):
-        if entry.is_file():
-            match = FILENAME_RE.match(entry.name)
-            if match:
-                date_str, custom_name, ext = match.groups()
-                ext = ext.lower()
-                if f".{ext}" not in ALLOWED_EXTENSIONS:
-                    continue
-                
-                date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                group_key = f"{date_str}_{custom_name or 'daily'}"
-                
-                if group_key not in briefings:
-                    briefings[group_key] = {
-                        'name': f"Briefing for {date_str}" + (f" ({custom_name.replace('_', ' ').title()})" if custom_name else ""),
-                        'files': {},
-                        'datetime': date_obj,
-                        'date': date_str,
-                        'custom_name': custom_name
-                    }
-                briefings[group_key]['files'][ext] = entry.name
-                
-    # Sort by date descending, then by name
-    return dict(sorted(briefings.items(), key=lambda x: (x[1]['datetime'], x[1]['name']), reverse=True))
+    briefings = briefing_index.list_briefings(OUTPUT_DIR, limit=limit, offset=offset, include_archived=include_archived)
+    return {briefing['group_key']: briefing for briefing in briefings}
+
+def count_briefings(include_archived=True):
+    return briefing_index.count_briefings(OUTPUT_DIR, include_archived=include_archived)
 
 def get_config_path():
-    return os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config.json')
+    return get_config_store().path
 
 def get_default_config_path():
-    return os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config_default.json')
+    return get_config_store().default_path
 
 def load_config():
-    path = get_config_path()
-    with open(path, 'r') as f:
-        return json.load(f)
+    """Current config.json contents (cached, re-read only when the file changes)."""
+    return dict(get_config_store().get())
 
 def save_config(config):
-    path = get_config_path()
-    with open(path, 'w') as f:
-        json.dump(config, f, indent=2)
+    """Validate and atomically write config.json. Raises config.ConfigError if invalid."""
+    return get_config_store().save(config)
 
 def reset_config():
-    default_path = get_default_config_path()
-    config_path = get_config_path()
-    with open(default_path, 'r') as src, open(config_path, 'w') as dst:
-        dst.write(src.read()) 
\ No newline at end of file
+    return get_config_store().reset()
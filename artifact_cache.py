@@ -0,0 +1,207 @@
+"""
+Content-addressed cache for rendered briefing artifacts (Markdown, HTML, PDF).
+
+Artifacts are written once to output/.artifacts/<hash>.<ext>, where the hash covers the
+normalised briefing plus the template version, and the user-facing files
+(briefing_YYYY-MM-DD.pdf, ...) are hard links to them. Rendering an identical briefing
+again (retries, a second click on "finish") just re-links the existing files instead of
+invoking Chromium. output/.artifacts/manifest.json records hash -> files and the output
+names linked to them; deleting or archiving a briefing releases its names (release()), and
+artifacts no output refers to any more are removed.
+
+HTML artifacts also get precompressed siblings (<hash>.html.gz, and <hash>.html.br when
+the optional brotli package is installed) so the web app can serve them without
+compressing on every request.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+try:
+    import brotli
+except ImportError:  # optional: only gzip siblings are written
+    brotli = None
+
+CACHE_DIRNAME = ".artifacts"
+MANIFEST_NAME = "manifest.json"
+FORMAT_EXTENSIONS = {"markdown": ".md", "html": ".html", "pdf": ".pdf"}
+EXTENSION_FORMATS = {ext.lstrip("."): fmt for fmt, ext in FORMAT_EXTENSIONS.items()}
+COMPRESSED_FORMATS = ("html",)
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}  # in order of preference
+
+_manifest_lock = threading.Lock()
+
+
+def briefing_hash(briefing: Dict, template_version: str = "", extra: Optional[Dict] = None) -> str:
+    """
+    SHA-256 over the normalised briefing (title, date, intro, articles, fund section),
+    the template version and any extra render inputs (e.g. logo).
+    """
+    normalised = {
+        "title": briefing.get("title"),
+        "date": briefing.get("date"),
+        "intro": briefing.get("intro"),
+        "articles": briefing.get("articles", []),
+        "fund_performance": briefing.get("fund_performance"),
+        "template_version": template_version,
+        "extra": extra or {},
+    }
+    payload = json.dumps(normalised, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cache_dir(output_dir: str) -> str:
+    return os.path.join(output_dir, CACHE_DIRNAME)
+
+
+def cached_path(output_dir: str, digest: str, fmt: str) -> str:
+    """Path of the content-addressed artifact for a hash and format ('markdown', 'html', 'pdf')."""
+    return os.path.join(cache_dir(output_dir), f"{digest}{FORMAT_EXTENSIONS[fmt]}")
+
+
+def load_manifest(output_dir: str) -> Dict[str, Dict]:
+    path = os.path.join(cache_dir(output_dir), MANIFEST_NAME)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_manifest(output_dir: str, manifest: Dict[str, Dict]) -> None:
+    directory = cache_dir(output_dir)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(directory, MANIFEST_NAME))
+
+
+def lookup(output_dir: str, digest: str, formats) -> Optional[Dict[str, str]]:
+    """Return {format: cached path} if every requested format is cached for the hash, else None."""
+    entry = load_manifest(output_dir).get(digest)
+    if not entry:
+        return None
+    paths = {}
+    for fmt in formats:
+        filename = entry.get("files", {}).get(fmt)
+        if not filename:
+            return None
+        path = os.path.join(cache_dir(output_dir), filename)
+        if not os.path.exists(path):
+            return None
+        paths[fmt] = path
+    return paths
+
+
+def record(output_dir: str, digest: str, files: Dict[str, str], outputs: Dict[str, str]) -> None:
+    """Record cached artifact files (format -> cached path) and the output names linked to them."""
+    with _manifest_lock:
+        manifest = load_manifest(output_dir)
+        entry = manifest.setdefault(digest, {"created": datetime.now().isoformat(timespec="seconds"), "files": {}, "outputs": []})
+        for fmt, path in files.items():
+            entry["files"][fmt] = os.path.basename(path)
+        for name in outputs.values():
+            name = os.path.basename(name)
+            if name not in entry["outputs"]:
+                entry["outputs"].append(name)
+        _save_manifest(output_dir, manifest)
+
+
+def release(output_dir: str, names) -> List[str]:
+    """
+    Forget output names (deleted or archived briefing files) in the manifest. Artifacts no
+    output refers to any more are removed with their compressed siblings, so deleting a
+    briefing frees its disk space. Returns the hashes removed.
+    """
+    names = {os.path.basename(name) for name in names}
+    removed = []
+    with _manifest_lock:
+        manifest = load_manifest(output_dir)
+        for digest, entry in list(manifest.items()):
+            if not names.intersection(entry.get("outputs", [])):
+                continue
+            entry["outputs"] = [name for name in entry["outputs"] if name not in names]
+            if entry["outputs"]:
+                continue
+            for filename in entry.get("files", {}).values():
+                path = os.path.join(cache_dir(output_dir), filename)
+                for suffix in ("",) + tuple(ENCODING_SUFFIXES.values()):
+                    try:
+                        os.remove(path + suffix)
+                    except FileNotFoundError:
+                        pass
+            del manifest[digest]
+            removed.append(digest)
+        _save_manifest(output_dir, manifest)
+    return removed
+
+
+def link_artifact(source: str, target: str) -> None:
+    """
+    Atomically point target at source: hard link when possible, copy otherwise.
+    The link is created under a temporary name and renamed over target, so an existing
+    file at target is replaced rather than truncated (which would corrupt the cached copy).
+    """
+    if os.path.exists(target) and os.path.samefile(source, target):
+        return
+    directory = os.path.dirname(os.path.abspath(target))
+    tmp_target = os.path.join(directory, f".{os.path.basename(target)}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        os.link(source, tmp_target)
+    except OSError:
+        shutil.copyfile(source, tmp_target)
+    os.replace(tmp_target, target)
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=11)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def write_compressed(path: str) -> Dict[str, str]:
+    """
+    Write precompressed siblings of an artifact (<path>.gz, <path>.br) if missing.
+    Returns {encoding: path} of the siblings that exist.
+    """
+    siblings = {}
+    data = None
+    for encoding, suffix in ENCODING_SUFFIXES.items():
+        if encoding == "br" and brotli is None:
+            continue
+        target = path + suffix
+        if not os.path.exists(target):
+            if data is None:
+                with open(path, "rb") as f:
+                    data = f.read()
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(_compress(data, encoding))
+            os.replace(tmp_path, target)
+        siblings[encoding] = target
+    return siblings
+
+
+def is_artifact(output_dir: str, digest: str, fmt: str, path: str) -> bool:
+    """True if path is (a hard link to) the cached artifact for the hash, i.e. its content is unchanged."""
+    try:
+        return os.path.samefile(path, cached_path(output_dir, digest, fmt))
+    except (OSError, KeyError):
+        return False
+
+
+def compressed_path(output_dir: str, digest: str, fmt: str, encoding: str) -> Optional[str]:
+    """Path of a precompressed sibling ('gzip' or 'br') of a cached artifact, or None if there is none."""
+    suffix = ENCODING_SUFFIXES.get(encoding)
+    if not suffix or fmt not in FORMAT_EXTENSIONS:
+        return None
+    path = cached_path(output_dir, digest, fmt) + suffix
+    return path if os.path.exists(path) else None
@@ -0,0 +1,221 @@
+"""
+Batch mode: several briefings (e.g. one per client, each with its own keywords, look-back
+window and funds) generated together, doing the work they share once.
+
+A batch is a JSON list of briefing specs:
+
+    [{"name": "client-a", "keywords": ["offshore wind", "green bonds"], "from_days_ago": 3},
+     {"name": "client-b", "keywords": ["green bonds", "solar"], "funds": ["AEET.L"]}]
+
+run_batch() then
+1. fetches once for the union of the keywords over the longest window (from the candidate
+   corpus when it can serve that, otherwise one NewsAPI request rather than one per
+   briefing), refreshing fund data alongside
+2. selects each briefing's articles from the pool: published within its window and
+   mentioning one of its keywords, then filtered and deduplicated as in a single run, up
+   to SUMMARY_LIMIT
+3. summarises every distinct selected article once (by URL), SUMMARY_WORKERS at a time
+4. writes each briefing's intro and renders it as briefing_YYYY-MM-DD_<name>.* in
+   output_dir, BATCH_WORKERS briefings at a time; "funds" (tickers or fund names) limits
+   its fund section to those funds
+
+Step 4 runs each briefing through generate_briefing_from_articles with its selection,
+summaries and fund section already checkpointed (see checkpoints), so one briefing failing
+does not stop the others and can be resumed on its own with python main.py --resume.
+
+The shared stages go in a batch run report (batch_YYYY-MM-DD_HHMMSS.run.json), and the
+result counts the NewsAPI and Gemini requests made against what separate runs would make.
+
+Usage:
+    python main.py --batch specs.json [output_dir]
+"""
+
+import contextvars
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import Dict, List, Optional
+
+import metrics
+from deduplicator import iter_unique
+
+BATCH_WORKERS = 4  # briefings written (intro + render) at once
+NAME_RE = re.compile(r"^[\w-]+$")
+DEFAULT_FROM_DAYS_AGO = 3
+
+
+def load_specs(path: str) -> List[Dict]:
+    """Read and validate a batch file (see the module docstring)."""
+    with open(path, "r", encoding="utf-8") as f:
+        return validate_specs(json.load(f))
+
+
+def validate_specs(specs: List[Dict]) -> List[Dict]:
+    """Specs with defaults filled in; ValueError for a missing or duplicate name or no keywords."""
+    if not isinstance(specs, list) or not specs:
+        raise ValueError("A batch is a non-empty list of briefing specs.")
+    validated, names = [], set()
+    for spec in specs:
+        name = spec.get("name", "")
+        if not NAME_RE.match(name):
+            raise ValueError(f"Briefing name must be letters, digits, '_' or '-': {name!r}")
+        if name in names:
+            raise ValueError(f"Duplicate briefing name: {name}")
+        if not spec.get("keywords"):
+            raise ValueError(f"Briefing {name} has no keywords.")
+        names.add(name)
+        validated.append({
+            "name": name,
+            "keywords": list(spec["keywords"]),
+            "from_days_ago": int(spec.get("from_days_ago", DEFAULT_FROM_DAYS_AGO)),
+            "funds": list(spec.get("funds") or []),
+        })
+    return validated
+
+
+def union_keywords(specs: List[Dict]) -> List[str]:
+    """Every spec's keywords, once each (case-insensitive), in order of first appearance."""
+    seen, keywords = set(), []
+    for spec in specs:
+        for keyword in spec["keywords"]:
+            if keyword.lower() not in seen:
+                seen.add(keyword.lower())
+                keywords.append(keyword)
+    return keywords
+
+
+def candidates_for(spec: Dict, pool: List[Dict]) -> List[Dict]:
+    """The pool articles this briefing's own fetch would have returned: in its window, matching its keywords."""
+    from scorer import contains_relevant_keywords
+
+    since = (date.today() - timedelta(days=spec["from_days_ago"])).isoformat()
+    candidates = []
+    for article in pool:
+        if (article.get("publishedAt") or since)[:10] < since:
+            continue
+        text = f"{article.get('title') or ''} {article.get('description') or ''} {article.get('content') or ''}"
+        if contains_relevant_keywords(text, spec["keywords"]):
+            candidates.append(article)
+    return candidates
+
+
+def select_articles(candidates: List[Dict]) -> List[Dict]:
+    """What a single run would summarise: filtered, deduplicated, the first SUMMARY_LIMIT."""
+    from main import SUMMARY_LIMIT, filter_articles
+
+    return list(islice(iter_unique(filter_articles(candidates)), SUMMARY_LIMIT))
+
+
+def fund_subset(fund_performance: Optional[Dict], funds: List[str]) -> Optional[Dict]:
+    """The fund section limited to the given tickers or fund names (all funds if none are given)."""
+    if not fund_performance or not funds:
+        return fund_performance
+    wanted = {fund.lower() for fund in funds}
+
+    def keep(row: Dict) -> bool:
+        return str(row.get("Ticker", "")).lower() in wanted or str(row.get("Fund Name", "")).lower() in wanted
+
+    return dict(fund_performance,
+                best_performers=[row for row in fund_performance.get("best_performers", []) if keep(row)],
+                worst_performers=[row for row in fund_performance.get("worst_performers", []) if keep(row)])
+
+
+def upstream_requests() -> Dict[str, float]:
+    """NewsAPI and Gemini requests made so far by this process."""
+    registry = metrics.get_registry()
+    return {
+        "newsapi": registry.total("upstream_request_seconds", service="newsapi"),
+        "gemini": registry.total("llm_requests_total"),
+    }
+
+
+def run_batch(specs: List[Dict], output_dir: str = "./output", pdf: bool = True, use_corpus: bool = True,
+              workers: int = BATCH_WORKERS) -> Dict:
+    """
+    Generate every briefing in the batch, sharing the fetch, fund refresh and summaries.
+    Returns per-briefing results (generate_briefing_from_articles' result, or the error and
+    run id of a briefing that failed) plus the shared work done and what separate runs would
+    have done: fetches, articles summarised and Gemini requests.
+    """
+    from checkpoints import RunCheckpoint, new_run_id
+    from main import (configure_summary_model, fetch_articles_for_briefing, fund_performance_section,
+                      generate_briefing_from_articles, summarise_articles)
+
+    specs = validate_specs(specs)
+    os.makedirs(output_dir, exist_ok=True)
+    before = upstream_requests()
+    started = datetime.now()
+
+    with metrics.run("batch") as run_report, \
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="fund-refresh") as branch:
+        run_report.path = os.path.join(output_dir, f"batch_{started.strftime('%Y-%m-%d_%H%M%S')}{metrics.RUN_REPORT_SUFFIX}")
+        fund_future = branch.submit(contextvars.copy_context().run, fund_performance_section)
+
+        keywords = union_keywords(specs)
+        from_days_ago = max(spec["from_days_ago"] for spec in specs)
+        print(f"Fetching once for {len(specs)} briefings: {len(keywords)} keywords, {from_days_ago} days")
+        pool = fetch_articles_for_briefing(keywords, from_days_ago=from_days_ago, use_corpus=use_corpus)
+
+        with metrics.stage("select", len(pool)) as stage:
+            candidates = {spec["name"]: candidates_for(spec, pool) for spec in specs}
+            selections = {name: select_articles(articles) for name, articles in candidates.items()}
+            distinct = list({article["url"]: article for selection in selections.values() for article in selection}.values())
+            stage.articles_out = len(distinct)
+
+        print(f"Summarising {len(distinct)} distinct articles "
+              f"(separate runs: {sum(map(len, selections.values()))})...")
+        model = configure_summary_model()
+        with metrics.stage("summarise", len(distinct)) as stage:
+            summaries = {article["url"]: article for article in summarise_articles(model, distinct)}
+            stage.articles_out = len(summaries)
+        fund_performance = fund_future.result()
+
+        def generate(spec: Dict) -> Dict:
+            # Seed the briefing's checkpoints with the shared work: it only writes the intro and renders
+            checkpoint = RunCheckpoint.create(output_dir, candidates[spec["name"]], new_run_id(), name=spec["name"])
+            checkpoint.save("unique", selections[spec["name"]])
+            for article in selections[spec["name"]]:
+                if article["url"] in summaries:
+                    checkpoint.save_summary(article["url"], summaries[article["url"]])
+            checkpoint.save("fund_performance", fund_subset(fund_performance, spec["funds"]))
+            try:
+                return dict(generate_briefing_from_articles(candidates[spec["name"]], output_dir=output_dir, pdf=pdf,
+                                                            run_id=checkpoint.run_id, name=spec["name"]),
+                            name=spec["name"])
+            except Exception as e:
+                return {"name": spec["name"], "error": str(e), "run_id": checkpoint.run_id}
+
+        with metrics.stage("briefings", len(specs)) as stage, \
+                ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch") as pool_executor:
+            # Each briefing gets its own run report (a fresh context, not this batch's)
+            results = list(pool_executor.map(generate, specs))
+            stage.articles_out = sum("error" not in result for result in results)
+
+    after = upstream_requests()
+    selected = sum(map(len, selections.values()))
+    result = {
+        "briefings": results,
+        "run_report": os.path.basename(run_report.path),
+        "wall_s": round((datetime.now() - started).total_seconds(), 2),
+        "shared": {
+            "fetches": 1,
+            "articles_summarised": len(distinct),
+            "newsapi_requests": after["newsapi"] - before["newsapi"],
+            "gemini_requests": after["gemini"] - before["gemini"],
+        },
+        "separate_runs": {
+            "fetches": len(specs),
+            "articles_summarised": selected,
+            "gemini_requests": selected + len(specs),  # a summary per selected article, an intro per briefing
+        },
+    }
+    failed = [r for r in results if "error" in r]
+    print(f"Batch done in {result['wall_s']} s: {len(results) - len(failed)} of {len(results)} briefings; "
+          f"{len(distinct)} articles summarised (separate runs: {selected}), "
+          f"{result['shared']['gemini_requests']:.0f} Gemini requests (separate runs: {selected + len(specs)})")
+    for r in failed:
+        print(f"- {r['name']} failed: {r['error']} (resume with: python main.py --resume {r['run_id']})")
+    return result
@@ -0,0 +1,128 @@
+"""
+Benchmark: a batch of client briefings (batch.run_batch) against the same briefings as
+separate runs, one after the other, fully offline.
+
+Each client has two keywords out of synthetic.KEYWORDS, overlapping with its neighbours.
+The cassette answers each client's NewsAPI query, and the batch's union query, with the
+articles of one synthetic pool that mention those keywords, as NewsAPI would. Reported for
+both modes: wall time, NewsAPI requests, Gemini requests and articles summarised. See
+benchmarks/offline.py for the workspace.
+
+Usage:
+    python benchmarks/bench_batch.py [clients] [--llm-latency-ms 300] [--http-latency-ms 150]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import offline
+from synthetic import KEYWORDS, SEED, make_articles
+
+POOL_SIZE = 100
+
+
+def client_specs(clients: int) -> List[Dict]:
+    return [{"name": f"client-{i}", "keywords": [KEYWORDS[i % len(KEYWORDS)], KEYWORDS[(i + 1) % len(KEYWORDS)]],
+             "from_days_ago": offline.FROM_DAYS_AGO} for i in range(clients)]
+
+
+def keyword_pool(size: int = POOL_SIZE) -> List[Dict]:
+    """Synthetic articles published in the last two days, each mentioning one of KEYWORDS."""
+    rng = random.Random(SEED)
+    articles = make_articles(size)
+    for i, article in enumerate(articles):
+        article["description"] += f" The update concerns {rng.choice(KEYWORDS)}."
+        article["publishedAt"] = (datetime.now() - timedelta(minutes=i * 20)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return articles
+
+
+def record_queries(cassette_path: str, specs: List[Dict], pool: List[Dict]) -> None:
+    import replay
+    from batch import union_keywords
+    from news_fetcher import everything_url
+    from scorer import contains_relevant_keywords
+
+    cassette = replay.Cassette(cassette_path, replay.RECORD)
+    for keywords in [spec["keywords"] for spec in specs] + [union_keywords(specs)]:
+        matching = [a for a in pool if contains_relevant_keywords(f"{a['title']} {a['description']} {a['content']}", keywords)]
+        cassette.add("GET", everything_url(keywords, offline.FROM_DAYS_AGO),
+                     {"status": "ok", "totalResults": len(matching), "articles": matching})
+    cassette.save()
+
+
+def summarised_in(run_report_path: str) -> int:
+    with open(run_report_path, encoding="utf-8") as f:
+        stages = json.load(f)["stages"]
+    return sum(stage["articles_out"] or 0 for stage in stages if stage["stage"] == "summarise")
+
+
+def measure(fn) -> Dict:
+    from batch import upstream_requests
+
+    before = upstream_requests()
+    start = time.perf_counter()
+    summarised = fn()
+    after = upstream_requests()
+    return {"wall": time.perf_counter() - start, "summarised": summarised,
+            **{name: after[name] - before[name] for name in after}}
+
+
+def main(argv: List[str]) -> None:
+    def option(name: str, default: float) -> float:
+        return float(argv[argv.index(name) + 1]) if name in argv else default
+
+    values = {i + 1 for i, arg in enumerate(argv) if arg in ("--llm-latency-ms", "--http-latency-ms")}
+    positional = [arg for i, arg in enumerate(argv) if i not in values and not arg.startswith("--")]
+    clients = int(positional[0]) if positional else 4
+    llm_latency_ms = option("--llm-latency-ms", 300)
+    http_latency_ms = option("--http-latency-ms", 150)
+    specs = client_specs(clients)
+
+    with tempfile.TemporaryDirectory(prefix="bench_batch_") as workspace:
+        env = offline.prepare(workspace, fetches=0, llm_latency_ms=llm_latency_ms, http_latency_ms=http_latency_ms)
+        record_queries(env["HTTP_CASSETTE"], specs, keyword_pool())
+        cwd = os.getcwd()
+        offline.activate(env, workspace)
+        try:
+            from batch import run_batch
+            from main import fetch_articles_for_briefing, generate_briefing_from_articles
+
+            def separate() -> int:
+                summarised = 0
+                for spec in specs:
+                    articles = fetch_articles_for_briefing(spec["keywords"], from_days_ago=spec["from_days_ago"],
+                                                           use_corpus=False)
+                    result = generate_briefing_from_articles(articles, output_dir=os.path.join(workspace, "separate"),
+                                                             pdf=False, name=spec["name"])
+                    report = os.path.join(workspace, "separate", result["run_report"])
+                    summarised += summarised_in(report)
+                return summarised
+
+            def batched() -> int:
+                return run_batch(specs, output_dir=os.path.join(workspace, "batch"), pdf=False,
+                                 use_corpus=False)["shared"]["articles_summarised"]
+
+            print(f"{clients} briefings as separate runs...", flush=True)
+            results = {"separate runs": measure(separate)}
+            print(f"{clients} briefings as one batch...", flush=True)
+            results["batch"] = measure(batched)
+        finally:
+            os.chdir(cwd)
+
+    print(f"\n{clients} client briefings, 2 keywords each; stub Gemini {llm_latency_ms:g} ms/call, "
+          f"replayed HTTP {http_latency_ms:g} ms/request, PDF off")
+    print(f"{'mode':<15}{'wall s':>8}{'NewsAPI':>9}{'Gemini':>8}{'summarised':>12}")
+    for mode, r in results.items():
+        print(f"{mode:<15}{r['wall']:8.2f}{r['newsapi']:9.0f}{r['gemini']:8.0f}{r['summarised']:12d}")
+    print(f"batch / separate wall time: {results['batch']['wall'] / results['separate runs']['wall']:.2f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,72 @@
+"""
+Benchmark: listing briefings by scanning the output directory vs. the briefing manifest index.
+
+Usage:
+    python benchmarks/bench_briefing_index.py [briefings]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import briefing_index
+
+
+def scan_output_dir(output_dir: str):
+    """The previous list_briefings: scan, parse and sort every file on each request."""
+    briefings = {}
+    for entry in os.scandir(output_dir):
+        if entry.is_file():
+            fields = briefing_index.parse_filename(entry.name)
+            if fields:
+                group = briefings.setdefault(fields["group_key"], {
+                    "name": fields["name"], "files": {},
+                    "datetime": datetime.strptime(fields["date"], "%Y-%m-%d"),
+                })
+                group["files"][fields["ext"]] = entry.name
+    return dict(sorted(briefings.items(), key=lambda x: (x[1]["datetime"], x[1]["name"]), reverse=True))
+
+
+def timed(fn, runs=10):
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    return (time.perf_counter() - start) / runs * 1000
+
+
+def main(n: int = 10_000) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for i in range(n):
+            day = date(2020, 1, 1) + timedelta(days=i // 3)
+            suffix = ("", "_energy", "_funds")[i % 3]
+            for ext in ("md", "html", "pdf"):
+                paths.append(os.path.join(directory, f"briefing_{day.isoformat()}{suffix}.{ext}"))
+        for path in paths:
+            open(path, "w").close()
+
+        start = time.perf_counter()
+        briefing_index.rebuild(directory)
+        rebuild_s = time.perf_counter() - start
+        start = time.perf_counter()
+        briefing_index.record_files(paths[:3], {"title": "Daily", "articles": 12})
+        record_ms = (time.perf_counter() - start) * 1000
+
+        results = {
+            "directory scan (all)": timed(lambda: scan_output_dir(directory)),
+            "index, home (top 5)": timed(lambda: briefing_index.list_briefings(directory, limit=5, include_archived=False)),
+            "index, page 1 (50)": timed(lambda: briefing_index.list_briefings(directory, limit=50)),
+            "index, page 100 (50)": timed(lambda: briefing_index.list_briefings(directory, limit=50, offset=4950)),
+            "index, count": timed(lambda: briefing_index.count_briefings(directory)),
+        }
+
+    print(f"{n:,} briefings / {len(paths):,} files (rebuild {rebuild_s:.2f} s, record one briefing {record_ms:.1f} ms)")
+    for name, ms in results.items():
+        print(f"- {name:<22} {ms:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
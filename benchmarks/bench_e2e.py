@@ -0,0 +1,124 @@
+"""
+Benchmark: end-to-end briefing throughput and latency, fully offline.
+
+Each job does what the web app does once screening is finished, plus the fetch: NewsAPI
+fetch (replayed from a cassette), filter, dedup, Gemini summaries and intro (stub model
+with a fixed latency per call), fund refresh (file market data provider) and rendering.
+Jobs run on jobs.JobRunner with N workers, for each N given; reported per N are
+briefings/hour, job latency from submission (p50/p95, so queueing is included) and, from
+the run reports, the mean start-end of each stage in ms since the run started (streamed
+and concurrent stages overlap). See benchmarks/offline.py for the workspace.
+
+Usage:
+    python benchmarks/bench_e2e.py [briefings] [concurrency,...] [--llm-latency-ms 300]
+                                   [--http-latency-ms 150] [--pdf]
+
+PDF rendering needs Chromium and is off unless --pdf is given.
+"""
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import offline
+from synthetic import KEYWORDS
+
+
+def briefing_job(output_dir: str, pdf: bool, progress=None):
+    import metrics
+    from main import fetch_articles_for_briefing, generate_briefing_from_articles
+
+    with metrics.run("briefing"):  # the generation run joins it, so the report includes the fetch
+        articles = fetch_articles_for_briefing(KEYWORDS, from_days_ago=offline.FROM_DAYS_AGO, use_corpus=False)
+        return generate_briefing_from_articles(articles, output_dir=output_dir, progress=progress, pdf=pdf)
+
+
+def percentile(values: List[float], q: float) -> float:
+    values = sorted(values)
+    return values[max(0, int(round(len(values) * q)) - 1)]
+
+
+def run_level(workspace: str, briefings: int, concurrency: int, pdf: bool) -> Dict:
+    from jobs import FAILED, SUCCEEDED, JobRunner
+
+    runner = JobRunner(db_path=os.path.join(workspace, f"jobs_{concurrency}.db"), max_workers=concurrency)
+    start = time.perf_counter()
+    job_ids = [
+        runner.submit("briefing", briefing_job, output_dir=os.path.join(workspace, f"output_{concurrency}_{i}"), pdf=pdf)
+        for i in range(briefings)
+    ]
+    runner.shutdown(wait=True)
+    wall = time.perf_counter() - start
+
+    latencies, stage_ms, articles, failed = [], defaultdict(list), [], []
+    for i, job_id in enumerate(job_ids):
+        job = runner.get(job_id)
+        if job["status"] != SUCCEEDED:
+            failed.append(job["error"] if job["status"] == FAILED else job["status"])
+            continue
+        elapsed = datetime.fromisoformat(job["updated_at"]) - datetime.fromisoformat(job["created_at"])
+        latencies.append(elapsed.total_seconds())
+        output_dir = os.path.join(workspace, f"output_{concurrency}_{i}")
+        with open(os.path.join(output_dir, job["result"]["run_report"]), encoding="utf-8") as f:
+            report = json.load(f)
+        for stage in report["stages"]:
+            stage_ms[stage["stage"]].append((stage["started_ms"], stage["finished_ms"]))
+            if stage["stage"] == "build":
+                articles.append(stage.get("articles_out") or 0)
+    return {
+        "wall": wall,
+        "per_hour": len(latencies) / wall * 3600,
+        "p50": percentile(latencies, 0.5) if latencies else float("nan"),
+        "p95": percentile(latencies, 0.95) if latencies else float("nan"),
+        "stages": {name: tuple(statistics.mean(column) for column in zip(*spans)) for name, spans in stage_ms.items()},
+        "articles": statistics.mean(articles) if articles else 0,
+        "failed": failed,
+    }
+
+
+def main(argv: List[str]) -> None:
+    def option(name: str, default: float) -> float:
+        return float(argv[argv.index(name) + 1]) if name in argv else default
+
+    values = {i + 1 for i, arg in enumerate(argv) if arg in ("--llm-latency-ms", "--http-latency-ms")}
+    positional = [arg for i, arg in enumerate(argv) if i not in values and not arg.startswith("--")]
+    briefings = int(positional[0]) if positional else 8
+    levels = [int(n) for n in positional[1].split(",")] if len(positional) > 1 else [1, 2, 4, 8]
+    llm_latency_ms = option("--llm-latency-ms", 300)
+    http_latency_ms = option("--http-latency-ms", 150)
+    pdf = "--pdf" in argv
+
+    with tempfile.TemporaryDirectory(prefix="bench_e2e_") as workspace:
+        env = offline.prepare(workspace, fetches=briefings * len(levels), llm_latency_ms=llm_latency_ms,
+                              http_latency_ms=http_latency_ms)
+        cwd = os.getcwd()
+        offline.activate(env, workspace)
+        try:
+            results = {}
+            for concurrency in levels:
+                print(f"Running {briefings} briefings on {concurrency} worker(s)...", flush=True)
+                results[concurrency] = run_level(workspace, briefings, concurrency, pdf)
+        finally:
+            os.chdir(cwd)
+
+    print(f"\n{briefings} briefings per level; stub Gemini {llm_latency_ms:g} ms/call, replayed HTTP "
+          f"{http_latency_ms:g} ms/request, PDF {'on' if pdf else 'off'}")
+    stages = list(next(iter(results.values()))["stages"])
+    print(f"{'workers':>7}{'briefings/h':>13}{'p50 s':>8}{'p95 s':>8}{'articles':>10}  " + "".join(f"{name[:12]:>13}" for name in stages))
+    for concurrency, r in results.items():
+        spans = (r["stages"].get(name, (float("nan"), float("nan"))) for name in stages)
+        print(f"{concurrency:>7}{r['per_hour']:13.0f}{r['p50']:8.2f}{r['p95']:8.2f}{r['articles']:10.1f}  "
+              + "".join(f"{f'{start:.0f}-{end:.0f}':>13}" for start, end in spans))
+        for error in r["failed"]:
+            print(f"        failed: {error}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,202 @@
+"""
+Benchmark: article extraction layers over a recorded corpus served from a local HTTP server.
+
+Each layer of news_scraper.extractor (plus extract_trafilatura, which is not in the default
+chain) is run on every page of benchmarks/extraction_corpus/, and so is the full chain
+(get_full_article). Reports per layer: latency, throughput, how many pages clear
+MIN_TEXT_CHARS, extracted length relative to the gold text, and similarity to the gold text
+(bag-of-words F1 and order-aware word sequence ratio), then a per-page F1 table.
+
+The corpus manifest (manifest.json) lists each page's HTML and its expected text. Pages are
+served from 127.0.0.1, so no publisher is contacted. The Playwright layer is skipped if
+Chromium is not installed (playwright install chromium).
+
+Usage:
+    python benchmarks/bench_extraction.py [repeats]
+    python benchmarks/bench_extraction.py --record PUBLISHER URL [URL ...]
+
+--record saves live pages into the corpus with a draft gold text (trafilatura's extraction,
+marked "gold_reviewed": false in the manifest); correct the .txt by hand before relying on it.
+"""
+import asyncio
+import json
+import os
+import re
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from difflib import SequenceMatcher
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from news_scraper import extractor, playwright_layer
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "extraction_corpus")
+MANIFEST_PATH = os.path.join(CORPUS_DIR, "manifest.json")
+WORD_RE = re.compile(r"\w+")
+
+CANDIDATES = {
+    "newspaper3k": extractor.extract_newspaper,
+    "readability-lxml": extractor.extract_readability,
+    "trafilatura": extractor.extract_trafilatura,
+    "playwright": extractor.extract_playwright,
+}
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(directory: str) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=directory))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def load_manifest() -> List[Dict]:
+    with open(MANIFEST_PATH, encoding="utf-8") as f:
+        pages = json.load(f)["pages"]
+    for page in pages:
+        with open(os.path.join(CORPUS_DIR, page["gold"]), encoding="utf-8") as f:
+            page["gold_text"] = f.read()
+    return pages
+
+
+def words(text: str) -> List[str]:
+    return WORD_RE.findall(text.lower())
+
+
+def similarity(text: str, gold: str) -> Dict[str, float]:
+    got, expected = words(text), words(gold)
+    if not got or not expected:
+        return {"f1": 0.0, "ratio": 0.0}
+    overlap = sum((Counter(got) & Counter(expected)).values())
+    precision, recall = overlap / len(got), overlap / len(expected)
+    f1 = 2 * precision * recall / (precision + recall) if overlap else 0.0
+    return {"f1": f1, "ratio": SequenceMatcher(None, got, expected, autojunk=False).ratio()}
+
+
+async def playwright_unavailable() -> Optional[str]:
+    from playwright.async_api import async_playwright
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            await browser.close()
+    except Exception as e:
+        return str(e).strip().splitlines()[0]
+    return None
+
+
+async def run_layer(name: str, extract, pages: List[Dict], base_url: str, repeats: int) -> Dict:
+    rows, latencies = [], []
+    start = time.perf_counter()
+    for page in pages:
+        url = f"{base_url}/{page['path']}"
+        text, error = "", None
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            try:
+                if name == "chain":
+                    result = await extract(url)
+                    text = result["text"] if result else ""
+                else:
+                    result = await extractor.run_layer(extract, url)
+                    text = result[1] if result else ""
+            except Exception as e:
+                text, error = "", f"{type(e).__name__}: {e}"
+            latencies.append((time.perf_counter() - t0) * 1000)
+        rows.append({"page": page["path"], "chars": len(text), "error": error,
+                     "gold_chars": len(page["gold_text"]), **similarity(text, page["gold_text"])})
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "rows": rows,
+        "p50": statistics.median(latencies),
+        "p95": latencies[max(0, int(len(latencies) * 0.95) - 1)],
+        "pages_per_s": len(pages) * repeats / elapsed,
+        "passed": sum(row["chars"] >= extractor.MIN_TEXT_CHARS for row in rows),
+        "length": statistics.mean(row["chars"] / row["gold_chars"] for row in rows),
+        "f1": statistics.mean(row["f1"] for row in rows),
+        "ratio": statistics.mean(row["ratio"] for row in rows),
+        "errors": sum(row["error"] is not None for row in rows),
+    }
+
+
+async def benchmark(repeats: int) -> None:
+    pages = load_manifest()
+    server = serve(CORPUS_DIR)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    candidates = dict(CANDIDATES)
+    reason = await playwright_unavailable()
+    if reason:
+        del candidates["playwright"]
+        # The default chain would retry Chromium with backoff on every page
+        extractor.LAYERS = [(name, fn) for name, fn in extractor.LAYERS if name != "playwright"]
+    candidates["chain"] = extractor.get_full_article
+
+    results = {}
+    with tempfile.TemporaryDirectory() as state_dir:
+        playwright_layer.STORAGE_STATE_DIR = state_dir  # keep consent state for 127.0.0.1 out of data/
+        for name, extract in candidates.items():
+            results[name] = await run_layer(name, extract, pages, base_url, repeats)
+    server.shutdown()
+
+    print(f"{len(pages)} pages x {repeats} from {base_url} (MIN_TEXT_CHARS {extractor.MIN_TEXT_CHARS})")
+    print(f"{'layer':<18}{'p50 ms':>8}{'p95 ms':>8}{'pages/s':>9}{'>=min':>7}{'length':>8}{'F1':>7}{'seq':>7}{'errors':>8}")
+    for name, r in results.items():
+        print(f"{name:<18}{r['p50']:8.1f}{r['p95']:8.1f}{r['pages_per_s']:9.1f}{r['passed']:>5}/{len(pages)}"
+              f"{r['length']:8.2f}{r['f1']:7.3f}{r['ratio']:7.3f}{r['errors']:>8}")
+    if reason:
+        print(f"{'playwright':<18}skipped: {reason}")
+        print("(chain = newspaper3k -> readability-lxml without Playwright)")
+
+    print("\nF1 per page (length / gold length):")
+    print(f"{'page':<52}" + "".join(f"{name[:14]:>16}" for name in results))
+    for i, page in enumerate(pages):
+        cells = "".join(f"{r['rows'][i]['f1']:8.2f} ({r['rows'][i]['chars'] / r['rows'][i]['gold_chars']:4.1f})" for r in results.values())
+        print(f"{page['path'][:51]:<52}{cells}")
+    print("\nLayouts: " + "; ".join(f"{page['path'].split('/')[0]}: {page['layout']}" for page in pages))
+
+
+def record(publisher: str, urls: List[str]) -> None:
+    """Save live pages into the corpus with draft gold text for review."""
+    import requests
+    import trafilatura
+
+    with open(MANIFEST_PATH, encoding="utf-8") as f:
+        manifest = json.load(f)
+    os.makedirs(os.path.join(CORPUS_DIR, publisher), exist_ok=True)
+    for url in urls:
+        resp = requests.get(url, headers={"User-Agent": extractor.USER_AGENT}, timeout=30)
+        resp.raise_for_status()
+        slug = re.sub(r"[^\w-]+", "-", urlparse(url).path.strip("/").split("/")[-1] or "index").strip("-")[:60]
+        html_path, gold_path = f"{publisher}/{slug}.html", f"{publisher}/{slug}.txt"
+        with open(os.path.join(CORPUS_DIR, html_path), "w", encoding="utf-8") as f:
+            f.write(resp.text)
+        draft = trafilatura.extract(resp.text, favor_precision=True) or ""
+        with open(os.path.join(CORPUS_DIR, gold_path), "w", encoding="utf-8") as f:
+            f.write(draft + "\n")
+        meta = trafilatura.extract_metadata(resp.text)
+        manifest["pages"] = [p for p in manifest["pages"] if p["path"] != html_path] + [{
+            "path": html_path, "gold": gold_path, "publisher": publisher,
+            "title": meta.title if meta else None, "layout": "recorded", "url": url, "gold_reviewed": False,
+        }]
+        print(f"Recorded {url} -> {html_path} (draft gold: {len(draft)} chars, review {gold_path})")
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--record":
+        record(sys.argv[2], sys.argv[3:])
+    else:
+        asyncio.run(benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 3))
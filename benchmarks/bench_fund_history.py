@@ -0,0 +1,60 @@
+"""
+Benchmark: fund history store load and discount analytics over a synthetic universe.
+
+Usage:
+    python benchmarks/bench_fund_history.py [funds] [years]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fund_history import FundHistoryStore, _cache
+
+
+def make_history(n_funds: int, years: int) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    dates = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=252 * years)
+    tickers = np.repeat([f"FUND{i:04d}.L" for i in range(n_funds)], len(dates))
+    nav = np.repeat(rng.uniform(50, 150, n_funds), len(dates))
+    discount = rng.normal(-15, 5, len(tickers))
+    return pd.DataFrame({
+        "Ticker": tickers,
+        "Date": np.tile(dates, n_funds),
+        "Close Price": nav * (1 + discount / 100),
+        "NAV": nav,
+    })
+
+
+def main(n_funds: int = 150, years: int = 5) -> None:
+    history = make_history(n_funds, years)
+    with tempfile.TemporaryDirectory() as directory:
+        store = FundHistoryStore(directory)
+        start = time.perf_counter()
+        store.append(history)
+        append_s = time.perf_counter() - start
+
+        _cache.clear()
+        start = time.perf_counter()
+        store.load()
+        load_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        runs = 50
+        for _ in range(runs):
+            store.discount_analytics()
+        analytics_ms = (time.perf_counter() - start) / runs * 1000
+
+    print(f"{n_funds} funds x {years} years ({len(history):,} rows)")
+    print(f"- append:             {append_s * 1000:.0f} ms")
+    print(f"- cold load + pivot:  {load_s * 1000:.0f} ms")
+    print(f"- analytics (cached): {analytics_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 150, int(sys.argv[2]) if len(sys.argv) > 2 else 5)
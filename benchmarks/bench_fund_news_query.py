@@ -0,0 +1,84 @@
+"""
+Benchmark: fund news page queries against the indexed news store, versus the previous
+approach of json.load-ing the whole MarketAux file and filtering in Python.
+
+Usage:
+    python benchmarks/bench_fund_news_query.py [articles]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from news_store import NewsStore
+
+FUNDS = [f"Fund {i:03d}" for i in range(120)]
+
+
+def make_articles(n: int):
+    rng = random.Random(7)
+    start = datetime(2023, 1, 1)
+    for i in range(n):
+        published = start + timedelta(minutes=rng.randrange(0, 60 * 24 * 900))
+        yield {
+            "uuid": f"{i:08d}-bench",
+            "title": f"Article {i} on renewable infrastructure",
+            "description": rng.choice(["Dividend declared", "NAV update", "Wind output below budget", "Acquisition"]),
+            "url": f"https://example.com/{i}",
+            "source": "example.com",
+            "published_at": published.strftime("%Y-%m-%dT%H:%M:%S.000000Z"),
+            "entities": [{"symbol": "X.L", "sentiment_score": rng.uniform(-1, 1)}],
+            "funds": rng.sample(FUNDS, rng.choice([1, 1, 2])),
+        }
+
+
+def timed(fn, runs=20):
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    return (time.perf_counter() - start) / runs * 1000
+
+
+def main(n: int = 100_000) -> None:
+    articles = list(make_articles(n))
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "news.json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(articles, f)
+        store = NewsStore(os.path.join(directory, "news.db"))
+        start = time.perf_counter()
+        store.upsert(articles)
+        ingest_s = time.perf_counter() - start
+
+        def legacy():
+            with open(json_path, "r", encoding="utf-8") as f:
+                news = json.load(f)
+            for art in news:
+                art["published_at_readable"] = datetime.fromisoformat(art["published_at"].replace("Z", "+00:00")).strftime("%d %b %Y, %H:%M")
+            sorted({fund for art in news for fund in art["funds"]})
+            return [art for art in news if "Fund 007" in art["funds"]]
+
+        first_page = store.query()
+        results = {
+            "legacy json.load + filter": timed(legacy, runs=3),
+            "first page": timed(lambda: store.query()),
+            "page 3 (cursor)": timed(lambda: store.query(cursor=store.query(cursor=first_page["next_cursor"])["next_cursor"])),
+            "fund filter": timed(lambda: store.query(fund="Fund 007")),
+            "fund + date range": timed(lambda: store.query(fund="Fund 007", start="2024-01-01", end="2024-06-30")),
+            "sentiment filter": timed(lambda: store.query(sentiment="Negative")),
+            "fund facet list": timed(store.funds),
+            "get 20 selected": timed(lambda: store.get_many(a["uuid"] for a in articles[:20])),
+        }
+
+    print(f"{n:,} articles (store ingest {ingest_s:.1f} s)")
+    for name, ms in results.items():
+        print(f"- {name:<26} {ms:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
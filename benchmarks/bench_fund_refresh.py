@@ -0,0 +1,82 @@
+"""
+Benchmark: refresh fund data offline through FileMarketDataProvider.
+
+Compares the legacy access pattern (two history calls per ticker: price, then NAV)
+with the batched provider call, adding a simulated per-call upstream latency.
+
+Usage:
+    python benchmarks/bench_fund_refresh.py [tickers] [latency_ms]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fund_info import refresh_fund_data
+from fund_history import FundHistoryStore
+from market_data import FileMarketDataProvider
+
+
+class SlowFileProvider(FileMarketDataProvider):
+    """File provider that sleeps per call to stand in for upstream latency."""
+
+    def __init__(self, path: str, latency_ms: float):
+        super().__init__(path)
+        self.latency_ms = latency_ms
+
+    def get_history(self, tickers, fields, start, end):
+        time.sleep(self.latency_ms / 1000)
+        return super().get_history(tickers, fields, start, end)
+
+
+def write_corpus(directory: str, n_tickers: int, days: int = 10):
+    rng = np.random.default_rng(42)
+    tickers = [f"FUND{i:04d}.L" for i in range(n_tickers)]
+    dates = pd.bdate_range(end=datetime.now(), periods=days)
+    rows = []
+    for ticker in tickers:
+        nav = rng.uniform(50, 150)
+        for day in dates:
+            rows.append({"Ticker": ticker, "Date": day.strftime("%Y-%m-%d"),
+                         "Close Price": round(nav * rng.uniform(0.5, 1.05), 2), "NAV": round(nav, 2)})
+    history_path = os.path.join(directory, "history.csv")
+    pd.DataFrame(rows).to_csv(history_path, index=False)
+    tickers_path = os.path.join(directory, "tickers.csv")
+    pd.DataFrame({"Investment trust name": [f"Fund {t}" for t in tickers], "Ticker": tickers}).to_csv(tickers_path, index=False)
+    return tickers, history_path, tickers_path
+
+
+def main(n_tickers: int = 100, latency_ms: float = 50) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        tickers, history_path, tickers_path = write_corpus(directory, n_tickers)
+        end = datetime.now()
+        start = end - timedelta(days=7)
+
+        legacy = SlowFileProvider(history_path, latency_ms)
+        t0 = time.perf_counter()
+        with legacy:
+            for ticker in tickers:
+                legacy.get_history([ticker], ["NAV"], start, end)
+                legacy.get_history([ticker], ["Close Price"], start, end)
+        legacy_s = time.perf_counter() - t0
+
+        batched = SlowFileProvider(history_path, latency_ms)
+        output_path = os.path.join(directory, "fund_analysis_results.csv")
+        t0 = time.perf_counter()
+        refresh_fund_data(force=True, provider=batched, tickers_path=tickers_path, output_path=output_path,
+                          history_store=FundHistoryStore(os.path.join(directory, "history")))
+        batched_s = time.perf_counter() - t0
+
+    print(f"{n_tickers} tickers, {latency_ms:.0f} ms simulated latency per call")
+    print(f"- legacy per-ticker: {legacy.calls} calls, {legacy_s:.2f} s")
+    print(f"- batched refresh:   {batched.calls} calls, {batched_s:.2f} s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100, float(sys.argv[2]) if len(sys.argv) > 2 else 50)
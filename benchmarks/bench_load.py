@@ -0,0 +1,196 @@
+"""
+Load test: the Flask app under concurrent readers and briefing generations, fully offline.
+
+Starts the app on a local threaded server in an offline workspace (benchmarks/offline.py:
+NewsAPI replayed from a cassette, stub Gemini, file market data) with one briefing already
+generated, then for the given duration:
+
+- readers loop over the dashboard, briefing list, search, fund news API, /metrics and the
+  latest briefing's HTML
+- generators go through the whole web flow: POST /generate (NewsAPI fetch), screen
+  (accept ACCEPTED articles, finish), then poll /jobs/<id>/status until the job is done
+
+Reports per route: requests, errors, p50/p95 latency; overall requests/s; and completed
+briefings with their end-to-end latency (form post to job finished).
+
+Usage:
+    python benchmarks/bench_load.py [readers] [generators] [duration_s] [--workers 2]
+                                    [--llm-latency-ms 300] [--http-latency-ms 150] [--pdf]
+"""
+import http.client
+import logging
+import os
+import re
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import offline
+from synthetic import KEYWORDS
+
+ACCEPTED = 10
+POLL_INTERVAL = 0.2
+JOB_RE = re.compile(r"/jobs/([0-9a-f]{32})/status")
+
+
+class Client:
+    """One browser: keeps the session cookie, records latency per route label."""
+
+    def __init__(self, port: int, results: Dict[str, List], lock: threading.Lock):
+        self.port = port
+        self.cookie: Optional[str] = None
+        self.results = results
+        self.lock = lock
+
+    def request(self, label: str, method: str, path: str, form: Optional[Dict] = None) -> Tuple[int, str]:
+        headers = {"Cookie": self.cookie} if self.cookie else {}
+        body = None
+        if form is not None:
+            body = urlencode(form)
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=120)
+        start = time.perf_counter()
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            text = response.read().decode("utf-8", errors="replace")
+            status = response.status
+            set_cookie = response.getheader("Set-Cookie")
+        except OSError:
+            status, text, set_cookie = 0, "", None
+        finally:
+            conn.close()
+        elapsed = (time.perf_counter() - start) * 1000
+        if set_cookie:
+            self.cookie = set_cookie.split(";", 1)[0]
+        with self.lock:
+            self.results[label].append((elapsed, status))
+        return status, text
+
+
+def reader(client: Client, stop: threading.Event, html_name: str) -> None:
+    routes = [
+        ("GET /", "/"),
+        ("GET /briefings", "/briefings"),
+        ("GET /search", "/search?q=wind"),
+        ("GET /api/fund_news", "/api/fund_news"),
+        ("GET /metrics", "/metrics"),
+        ("GET /view/<html>", f"/view/{html_name}"),
+    ]
+    while not stop.is_set():
+        for label, path in routes:
+            client.request(label, "GET", path)
+
+
+def generator(client: Client, stop: threading.Event, briefings: List, lock: threading.Lock) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        status, _ = client.request("POST /generate", "POST", "/generate",
+                                   {"days_ago": offline.FROM_DAYS_AGO, "custom_keywords": ", ".join(KEYWORDS)})
+        if status != 302:
+            continue
+        client.request("GET /human_screen", "GET", "/human_screen")
+        for _ in range(ACCEPTED):
+            client.request("POST /human_screen", "POST", "/human_screen", {"action": "accept"})
+        _, page = client.request("POST /human_screen", "POST", "/human_screen", {"action": "finish"})
+        match = JOB_RE.search(page)
+        if not match:
+            continue
+        job_status = "queued"
+        while job_status in ("queued", "running"):
+            time.sleep(POLL_INTERVAL)
+            _, body = client.request("GET /jobs/<id>/status", "GET", f"/jobs/{match.group(1)}/status")
+            found = re.search(r'"status":\s*"(\w+)"', body)
+            job_status = found.group(1) if found else "failed"
+        with lock:
+            briefings.append((time.perf_counter() - start, job_status))
+
+
+def main(argv: List[str]) -> None:
+    value_options = ("--workers", "--llm-latency-ms", "--http-latency-ms")
+
+    def option(name: str, default: float) -> float:
+        return float(argv[argv.index(name) + 1]) if name in argv else default
+
+    values = {i + 1 for i, arg in enumerate(argv) if arg in value_options}
+    positional = [int(arg) for i, arg in enumerate(argv) if i not in values and not arg.startswith("--")]
+    readers, generators, duration = (positional + [8, 2, 20][len(positional):])[:3]
+    workers = int(option("--workers", 2))
+    llm_latency_ms = option("--llm-latency-ms", 300)
+    http_latency_ms = option("--http-latency-ms", 150)
+    pdf = "--pdf" in argv
+
+    with tempfile.TemporaryDirectory(prefix="bench_load_") as workspace:
+        env = offline.prepare(workspace, fetches=200, llm_latency_ms=llm_latency_ms, http_latency_ms=http_latency_ms)
+        cwd = os.getcwd()
+        offline.activate(env, workspace)
+        try:
+            from werkzeug.serving import make_server
+
+            import app.routes
+            import app.utils
+            import jobs
+            import main as pipeline
+            from app import create_app
+
+            output_dir = os.path.join(workspace, "output")
+            app.utils.OUTPUT_DIR = app.routes.OUTPUT_DIR = output_dir
+            if not pdf:
+                # Chromium may be missing; jobs started by the web flow skip the PDF too
+                app.routes.resume_briefing = partial(pipeline.resume_briefing, pdf=False)
+            jobs._runner = jobs.JobRunner(max_workers=workers)
+            articles = pipeline.fetch_articles_for_briefing(KEYWORDS, from_days_ago=offline.FROM_DAYS_AGO, use_corpus=False)
+            html_name = pipeline.generate_briefing_from_articles(articles, output_dir=output_dir, pdf=pdf)["html"]
+
+            flask_app = create_app()
+            flask_app.config["WTF_CSRF_ENABLED"] = False
+            logging.getLogger("werkzeug").setLevel(logging.ERROR)
+            server = make_server("127.0.0.1", 0, flask_app, threaded=True)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+
+            results: Dict[str, List] = defaultdict(list)
+            briefings: List = []
+            lock, stop = threading.Lock(), threading.Event()
+            threads = [threading.Thread(target=reader, args=(Client(server.server_port, results, lock), stop, html_name))
+                       for _ in range(readers)]
+            threads += [threading.Thread(target=generator, args=(Client(server.server_port, results, lock), stop, briefings, lock))
+                        for _ in range(generators)]
+            print(f"{readers} readers, {generators} generators for {duration} s...", flush=True)
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            time.sleep(duration)
+            stop.set()
+            for thread in threads:
+                thread.join()
+            wall = time.perf_counter() - start
+            server.shutdown()
+            jobs._runner.shutdown()
+        finally:
+            os.chdir(cwd)
+
+    total = sum(len(samples) for samples in results.values())
+    print(f"\n{readers} readers + {generators} generators, {wall:.1f} s, {workers} job workers; stub Gemini "
+          f"{llm_latency_ms:g} ms/call, replayed HTTP {http_latency_ms:g} ms/request, PDF {'on' if pdf else 'off'}")
+    print(f"{'route':<26}{'requests':>9}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}")
+    for label, samples in sorted(results.items()):
+        latencies = sorted(elapsed for elapsed, _ in samples)
+        errors = sum(status == 0 or status >= 400 for _, status in samples)
+        print(f"{label:<26}{len(samples):>9}{errors:>8}{latencies[len(latencies) // 2]:9.1f}"
+              f"{latencies[max(0, int(len(latencies) * 0.95) - 1)]:9.1f}")
+    print(f"{total / wall:.0f} requests/s overall")
+    done = [elapsed for elapsed, status in briefings if status == "succeeded"]
+    print(f"Briefings: {len(done)} succeeded, {len(briefings) - len(done)} failed"
+          + (f", end to end p50 {statistics.median(done):.1f} s, max {max(done):.1f} s" if done else ""))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,211 @@
+"""
+Micro-benchmarks for the pipeline's hot functions, with a baseline and a comparison mode.
+
+Each function runs over deterministic synthetic corpora (benchmarks/synthetic.py) at the
+sizes listed in BENCHMARKS; the fastest time per call over several samples is reported
+(the least noisy estimate on a shared machine). Times are also divided
+by a fixed pure-Python calibration workload, so a baseline recorded on one machine can be
+compared on another.
+
+Usage:
+    python benchmarks/bench_micro.py                     # run and print
+    python benchmarks/bench_micro.py --save              # run and write the baseline
+    python benchmarks/bench_micro.py --compare           # exit 1 on regressions beyond the tolerance
+    python benchmarks/bench_micro.py --compare --quick   # sizes up to 1k only (run_tests.py --bench)
+Options: --tolerance 0.5, --filter <substring>, --baseline <path>
+
+Runs offline. score_article is skipped if the VADER lexicon is not installed, rather than
+letting nltk download it. Benchmarks time CPU work only: disk and network time do not scale
+with the calibration workload, so they would make --compare flaky.
+"""
+import json
+import os
+import platform
+import sys
+import timeit
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from synthetic import KEYWORDS, make_articles, make_briefing, make_enriched
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline_micro.json")
+DEFAULT_TOLERANCE = 0.5  # run-to-run noise on a shared machine reached ~40% for single benchmarks
+QUICK_MAX_SIZE = 1_000
+REPEATS = 5
+QUICK_REPEATS = 3
+CONFIRM_RUNS = 2  # re-measurements of a suspected regression before it is reported
+
+
+class Skip(Exception):
+    pass
+
+
+def bench_deduplicate(n: int) -> Callable[[], object]:
+    from deduplicator import deduplicate_articles
+    articles = make_articles(n)
+    return lambda: deduplicate_articles(articles)
+
+
+def bench_score(n: int) -> Callable[[], object]:
+    import nltk
+    try:
+        nltk.data.find("sentiment/vader_lexicon.zip")
+    except LookupError:
+        raise Skip("VADER lexicon not installed (nltk.download('vader_lexicon'))")
+    from scorer import score_article
+    articles = make_articles(n)
+    score_article(articles[0])  # build the analyser outside the timing
+    return lambda: [score_article(article) for article in articles]
+
+
+def bench_keywords(n: int) -> Callable[[], object]:
+    from scorer import contains_relevant_keywords
+    texts = [article["content"] for article in make_articles(n)]
+    return lambda: [contains_relevant_keywords(text, KEYWORDS) for text in texts]
+
+
+def bench_build_briefing(n: int) -> Callable[[], object]:
+    from reporter import build_briefing
+    enriched = make_enriched(n)
+    return lambda: build_briefing(enriched)
+
+
+def bench_generate_html(n: int) -> Callable[[], object]:
+    from formatter import generate_html
+    briefing = make_briefing(n)
+    generate_html(briefing, "")  # template compilation is not what we measure
+    return lambda: generate_html(briefing, "")
+
+
+def bench_render_markdown(n: int) -> Callable[[], object]:
+    # The rendering generate_markdown does, without its file write: disk time does not scale with
+    # the calibration workload, so timing it made --compare flaky
+    from formatter import render_markdown
+    briefing = make_briefing(n)
+    render_markdown(briefing)
+    return lambda: render_markdown(briefing)
+
+
+# name: (setup(n) -> timed callable, sizes)
+BENCHMARKS: Dict[str, Tuple[Callable[[int], Callable[[], object]], Tuple[int, ...]]] = {
+    # Pairwise SequenceMatcher: quadratic, 1k articles take ~40 s per call
+    "deduplicate_articles": (bench_deduplicate, (10, 100)),
+    "score_article": (bench_score, (10, 1_000)),
+    "contains_relevant_keywords": (bench_keywords, (10, 1_000, 100_000)),
+    "build_briefing": (bench_build_briefing, (10, 1_000, 100_000)),
+    # Briefings hold ~10 articles; 1k is already far beyond real use
+    "generate_html": (bench_generate_html, (10, 1_000)),
+    "render_markdown": (bench_render_markdown, (10, 1_000)),
+}
+
+
+def calibrate(repeats: int = REPEATS) -> float:
+    """Seconds for a fixed pure-Python workload (string handling, dicts, sorting)."""
+    words = [f"word{i % 997}" for i in range(20_000)]
+
+    def workload():
+        counts = {}
+        for word in words:
+            key = word.lower()
+            counts[key] = counts.get(key, 0) + 1
+        return sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+
+    return min(timeit.repeat(workload, number=10, repeat=repeats)) / 10
+
+
+def measure(fn: Callable[[], object], repeats: int) -> float:
+    """Fastest seconds per call, with the loop count chosen so each sample takes >= 0.2 s."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeats, number=number)) / number
+
+
+def run(quick: bool = False, name_filter: Optional[str] = None, only: Optional[List[str]] = None) -> Dict:
+    repeats = QUICK_REPEATS if quick else REPEATS
+    calibrations = [calibrate()]
+    results, skipped = {}, {}
+    for name, (setup, sizes) in BENCHMARKS.items():
+        if name_filter and name_filter not in name:
+            continue
+        for n in sizes:
+            key = f"{name}[{n}]"
+            if (quick and n > QUICK_MAX_SIZE) or (only is not None and key not in only):
+                continue
+            try:
+                fn = setup(n)
+            except Skip as e:
+                skipped[name] = str(e)
+                break
+            results[key] = measure(fn, repeats)
+            calibrations.append(calibrate())
+            print(f"- {key:<36} {results[key] * 1000:10.3f} ms/call", flush=True)
+    for name, reason in skipped.items():
+        print(f"- {name:<36} skipped: {reason}")
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        # Fastest of the calibrations run between benchmarks, so a noisy moment does not skew every ratio
+        "calibration_s": min(calibrations),
+        "results": results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float, verbose: bool = True) -> List[str]:
+    """Compare with the baseline (optionally printing every ratio); returns the regressed keys."""
+    scale = current["calibration_s"] / baseline["calibration_s"]  # > 1: this machine is slower
+    if verbose:
+        print(f"\nCompared with baseline (Python {baseline['python']}, machine speed factor {scale:.2f}, "
+              f"tolerance {tolerance:.0%}):")
+    regressed = []
+    for key, seconds in current["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            if verbose:
+                print(f"- {key:<36} no baseline")
+            continue
+        ratio = seconds / (base * scale)
+        flag = "REGRESSION" if ratio > 1 + tolerance else ("improved" if ratio < 1 - tolerance else "ok")
+        if flag == "REGRESSION":
+            regressed.append(key)
+        if verbose:
+            print(f"- {key:<36} {ratio:6.2f}x baseline  {flag}")
+    return regressed
+
+
+def main(argv) -> int:
+    def option(name: str, default=None):
+        return argv[argv.index(name) + 1] if name in argv else default
+
+    baseline_path = option("--baseline", BASELINE_PATH)
+    if "--save" in argv and ("--quick" in argv or "--filter" in argv):
+        print("--save records every benchmark at every size; drop --quick / --filter")
+        return 2
+    current = run(quick="--quick" in argv, name_filter=option("--filter"))
+    if "--save" in argv:
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nBaseline written to {baseline_path}")
+    if "--compare" in argv:
+        with open(baseline_path, encoding="utf-8") as f:
+            baseline = json.load(f)
+        tolerance = float(option("--tolerance", DEFAULT_TOLERANCE))
+        for _ in range(CONFIRM_RUNS):
+            # A one-off slow sample on a busy machine is not a regression: measure again, keep the best
+            suspects = compare(current, baseline, tolerance, verbose=False)
+            if not suspects:
+                break
+            print(f"\nRe-measuring {', '.join(suspects)}")
+            again = run(quick="--quick" in argv, only=suspects)
+            for key, seconds in again["results"].items():
+                current["results"][key] = min(current["results"][key], seconds)
+        regressed = compare(current, baseline, tolerance)
+        if regressed:
+            print(f"\n{len(regressed)} benchmark(s) regressed beyond the tolerance")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
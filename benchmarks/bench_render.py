@@ -0,0 +1,58 @@
+"""
+Benchmark: render N briefings to HTML and Markdown with the formatter.
+
+Usage:
+    python benchmarks/bench_render.py [count]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from formatter import generate_html, render_markdown
+
+
+def make_briefing(n_articles: int = 10) -> dict:
+    return {
+        "title": "SAFL End of Week Briefing",
+        "date": "2025-06-18",
+        "intro": "Weekly summary of sustainable finance news for institutional investors.",
+        "articles": [
+            {
+                "title": f"Article {i}: green bonds and offshore wind",
+                "summary": "- Investors are piling into ESG assets.\n- Issuance hit a record.\n\nTopic: Market Trends",
+                "url": f"https://example.com/{i}",
+                "date": "2025-06-17",
+                "source": "ESG Newswire",
+                "sentiment": ["Positive", "Negative", "Neutral"][i % 3],
+            }
+            for i in range(n_articles)
+        ],
+        "fund_performance": {
+            "best_performers": [{"Fund Name": f"Fund {i}", "Close Price": 1.0 + i, "NAV": 1.2 + i, "Discount (%)": -10.0 - i} for i in range(5)],
+            "worst_performers": [{"Fund Name": f"Fund {i}", "Close Price": 0.5, "NAV": 1.0, "Discount (%)": -50.0} for i in range(5)],
+            "last_updated": "2025-06-18 09:00:00",
+        },
+    }
+
+
+def main(count: int = 1000) -> None:
+    briefing = make_briefing()
+    start = time.perf_counter()
+    for _ in range(count):
+        generate_html(briefing, "")
+    html_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(count):
+        render_markdown(briefing)
+    md_s = time.perf_counter() - start
+
+    print(f"Rendered {count} briefings")
+    print(f"- HTML:     {html_s:.2f} s total, {html_s / count * 1000:.2f} ms/briefing")
+    print(f"- Markdown: {md_s:.2f} s total, {md_s / count * 1000:.2f} ms/briefing")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,85 @@
+"""
+Benchmark: full-text search (FTS5, BM25 + snippets) over a synthetic article corpus.
+
+Usage:
+    python benchmarks/bench_search.py [articles]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from news_store import NewsStore
+
+DOMAIN_WORDS = ("wind solar hydrogen dividend discount nav portfolio acquisition battery storage grid "
+                "tariff subsidy auction offshore onshore turbine merchant power price inflation rate "
+                "refinancing debt equity placing share buyback board manager review strategic").split()
+FUNDS = ["Greencoat UK Wind", "Bluefield Solar", "Foresight Solar", "Gore Street Energy", "NextEnergy Solar"]
+
+
+def make_vocabulary(rng: random.Random, size: int = 20_000):
+    """Synthetic words with Zipf-like weights, so query terms have realistic selectivity."""
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = ["".join(rng.choices(letters, k=rng.randint(4, 10))) for _ in range(size)]
+    words[200:200] = DOMAIN_WORDS  # frequent, but not in every article
+    weights = [1.0 / (rank + 1) for rank in range(len(words))]
+    return words, weights
+
+
+def make_articles(n: int):
+    rng = random.Random(11)
+    words, weights = make_vocabulary(rng)
+    for i in range(n):
+        fund = rng.choice(FUNDS)
+        body = rng.choices(words, weights=weights, k=300)
+        yield {
+            "uuid": f"{i:08d}",
+            "title": f"{fund} " + " ".join(body[:6]),
+            "description": " ".join(body[6:31]),
+            "content": " ".join(body),
+            "url": f"https://example.com/{i}",
+            "source": "example.com",
+            "published_at": f"20{rng.randint(22, 25)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T09:00:00Z",
+            "funds": [fund],
+        }
+
+
+def timed(fn, runs=10):
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    return (time.perf_counter() - start) / runs * 1000
+
+
+def main(n: int = 100_000) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        store = NewsStore(os.path.join(directory, "news.db"))
+        articles = list(make_articles(n))
+        start = time.perf_counter()
+        store.upsert(articles)
+        ingest_s = time.perf_counter() - start
+        start = time.perf_counter()
+        store.upsert(articles[:200])
+        incremental_ms = (time.perf_counter() - start) * 1000
+
+        queries = {
+            "single term (dividend)": lambda: store.search("dividend"),
+            "fund name (greencoat)": lambda: store.search("greencoat"),
+            "two terms": lambda: store.search("battery refinancing"),
+            "prefix (hydro*)": lambda: store.search("hydro"),
+            "term + fund filter": lambda: store.search("dividend", fund="Bluefield Solar"),
+            "term + date range": lambda: store.search("tariff", start="2024-01-01", end="2024-03-31"),
+            "page 5": lambda: store.search("dividend", offset=80),
+        }
+        results = {name: (timed(fn), fn()["total"]) for name, fn in queries.items()}
+
+    print(f"{n:,} articles (index build {ingest_s:.1f} s, re-ingest 200 articles {incremental_ms:.0f} ms)")
+    for name, (ms, total) in results.items():
+        print(f"- {name:<26} {ms:8.2f} ms  ({total:,} matches)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,113 @@
+"""
+Load test: serving briefing files from the Flask app over HTTP on localhost.
+
+Renders a briefing (Markdown + HTML, no PDF) into a temporary output directory, starts the
+app on a local threaded server and fires concurrent requests at /view and /preview:
+plain, gzip-accepting, and conditional (If-None-Match) requests. Reports bytes transferred
+and latency per scenario.
+
+Usage:
+    python benchmarks/bench_serving.py [requests] [concurrency]
+"""
+import http.client
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from werkzeug.serving import make_server
+
+import app.routes
+import app.utils
+from app import create_app
+from formatter import write_briefing_outputs
+
+LOGO_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "app", "static", "images", "logo_SAFL.png"))
+
+
+def make_briefing(n_articles: int = 15):
+    return {
+        "title": "SAFL Daily Briefing",
+        "date": "2025-06-18",
+        "intro": "Renewables and infrastructure news for the day. " * 5,
+        "articles": [
+            {
+                "title": f"Offshore wind developer {i} secures financing",
+                "summary": "- " + "The developer closed a refinancing of its portfolio at a lower rate. " * 6,
+                "url": f"https://example.com/{i}",
+                "date": "2025-06-17",
+                "source": "Example Wire",
+                "sentiment": 0.3,
+            }
+            for i in range(n_articles)
+        ],
+    }
+
+
+def request(port: int, path: str, headers: dict):
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    start = time.perf_counter()
+    conn.request("GET", path, headers=headers)
+    response = conn.getresponse()
+    body = response.read()
+    elapsed = (time.perf_counter() - start) * 1000
+    conn.close()
+    return response.status, len(body), elapsed, response.getheader("ETag")
+
+
+def run(port: int, path: str, headers: dict, n: int, concurrency: int):
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        start = time.perf_counter()
+        results = list(pool.map(lambda _: request(port, path, headers), range(n)))
+        wall = time.perf_counter() - start
+    latencies = sorted(r[2] for r in results)
+    return {
+        "status": results[0][0],
+        "bytes": statistics.mean(r[1] for r in results),
+        "p50": latencies[len(latencies) // 2],
+        "p95": latencies[int(len(latencies) * 0.95) - 1],
+        "rps": n / wall,
+    }
+
+
+def main(n: int = 500, concurrency: int = 8) -> None:
+    with tempfile.TemporaryDirectory() as output_dir:
+        app.utils.OUTPUT_DIR = app.routes.OUTPUT_DIR = output_dir
+        md_name, html_name = "briefing_2025-06-18.md", "briefing_2025-06-18.html"
+        logo = LOGO_PATH if os.path.exists(LOGO_PATH) else None
+        write_briefing_outputs(make_briefing(), os.path.join(output_dir, md_name),
+                               os.path.join(output_dir, html_name), None, logo)
+        time.sleep(1.1)  # let the index settle so per-file info is memoised, as in steady state
+
+        logging.getLogger("werkzeug").setLevel(logging.ERROR)  # no per-request access log
+        server = make_server("127.0.0.1", 0, create_app(), threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        port = server.server_port
+        etag = request(port, f"/view/{html_name}", {})[3]
+        gzip_etag = request(port, f"/view/{html_name}", {"Accept-Encoding": "gzip"})[3]
+
+        scenarios = {
+            "view html, identity": (f"/view/{html_name}", {}),
+            "view html, gzip": (f"/view/{html_name}", {"Accept-Encoding": "gzip"}),
+            "view html, revalidate": (f"/view/{html_name}", {"Accept-Encoding": "gzip", "If-None-Match": gzip_etag}),
+            "view html, range 0-1023": (f"/view/{html_name}", {"Range": "bytes=0-1023", "If-Range": etag}),
+            "preview md (excerpt)": (f"/preview/{md_name}", {}),
+            "preview html (excerpt)": (f"/preview/{html_name}", {}),
+        }
+        results = {name: run(port, path, headers, n, concurrency) for name, (path, headers) in scenarios.items()}
+        server.shutdown()
+
+    print(f"{n} requests per scenario, {concurrency} concurrent clients")
+    for name, r in results.items():
+        print(f"- {name:<24} {r['status']}  {r['bytes']:>9,.0f} B/req  p50 {r['p50']:6.2f} ms  "
+              f"p95 {r['p95']:6.2f} ms  {r['rps']:6.0f} req/s")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
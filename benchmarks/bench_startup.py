@@ -0,0 +1,67 @@
+"""
+Benchmark and budget check: cold-start import time of the CLI and the web app.
+
+Each target is imported in a fresh interpreter under `python -X importtime`; the time
+attributed to the target's own imports (interpreter start-up excluded) is compared with
+its budget, and heavy dependencies that must stay lazy are checked for. Exits with status
+1 if any target is over budget or loads a deferred dependency, so it can gate CI.
+
+Usage:
+    python benchmarks/bench_startup.py [runs]
+"""
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+TARGETS = {
+    "cli (import main)": "import main",
+    "web app (create_app)": "from app import create_app; create_app()",
+}
+BUDGETS_MS = {
+    "cli (import main)": 200,
+    "web app (create_app)": 500,
+}
+# Only the code paths that use these may import them
+DEFERRED_MODULES = ("google.generativeai", "playwright", "nltk", "textblob", "pandas")
+
+LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+
+def importtime(statement: str):
+    """({top-level module: cumulative us}, {all imported module names}) for one cold run."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    top_level, modules = {}, set()
+    for line in result.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            _, cumulative, indent, name = match.groups()
+            modules.add(name)
+            if not indent:
+                top_level[name] = int(cumulative)
+    return top_level, modules
+
+
+def main(runs: int = 5) -> int:
+    interpreter, _ = importtime("pass")  # site, encodings, ...: not ours
+    failed = False
+    for name, statement in TARGETS.items():
+        times, loaded = [], set()
+        for _ in range(runs):
+            top_level, modules = importtime(statement)
+            times.append(sum(us for module, us in top_level.items() if module not in interpreter) / 1000)
+            loaded |= modules
+        best = min(times)
+        deferred = sorted(m for m in loaded if m in DEFERRED_MODULES)
+        ok = best <= BUDGETS_MS[name] and not deferred
+        failed |= not ok
+        print(f"- {name:<22} {best:7.1f} ms (median {sorted(times)[len(times) // 2]:.1f}, budget {BUDGETS_MS[name]} ms)"
+              f"{'  deferred modules loaded: ' + ', '.join(deferred) if deferred else ''}  {'OK' if ok else 'FAIL'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5))
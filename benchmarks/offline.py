@@ -0,0 +1,92 @@
+"""
+Offline workspace for end-to-end benchmarks: everything run_pipeline talks to, served locally.
+
+prepare(directory) fills a working directory (the pipeline's data/ and output paths are
+relative to the current directory) with:
+
+- an HTTP cassette (see replay) answering the NewsAPI query for KEYWORDS with a different
+  synthetic page of articles each time it is asked (benchmarks/synthetic.py)
+- a market history CSV for the fund tickers, served by FileMarketDataProvider
+- the fund ticker list, fund news and logo from the repository
+
+and returns the environment to run in: MARKET_DATA_PROVIDER=file:<csv> and
+LLM_BACKEND=stub:<latency_ms> (summariser.StubModel). Use activate() to apply it.
+
+Sentiment needs NLTK's VADER lexicon, which is a download; without it every article fails
+scoring and the briefing is empty, so activate() falls back to a neutral sentiment and says so.
+"""
+import os
+import shutil
+from datetime import datetime
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from synthetic import KEYWORDS, SEED, make_articles
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+FROM_DAYS_AGO = 3
+
+
+def write_market_history(path: str, tickers_path: str, days: int = 10) -> None:
+    rng = np.random.default_rng(SEED)
+    rows = []
+    for ticker in pd.read_csv(tickers_path)["Ticker"]:
+        nav = rng.uniform(50, 150)
+        for day in pd.bdate_range(end=datetime.now(), periods=days):
+            rows.append({"Ticker": ticker, "Date": day.strftime("%Y-%m-%d"),
+                         "Close Price": round(nav * rng.uniform(0.5, 1.05), 2), "NAV": round(nav, 2)})
+    pd.DataFrame(rows).to_csv(path, index=False)
+
+
+def prepare(directory: str, fetches: int = 8, articles_per_fetch: int = 30, llm_latency_ms: float = 0,
+            http_latency_ms: float = 0) -> Dict[str, str]:
+    """Build the workspace in directory; returns the environment variables to run with."""
+    import replay
+    from news_fetcher import everything_url
+
+    data_dir = os.path.join(directory, "data")
+    os.makedirs(data_dir, exist_ok=True)
+    tickers_path = os.path.join(data_dir, "listed_funds_tickers.csv")
+    shutil.copy(os.path.join(REPO_DIR, "data", "listed_funds_tickers.csv"), tickers_path)
+    fund_news_path = os.path.join(REPO_DIR, "data", "marketaux_news_results.json")
+    if os.path.exists(fund_news_path):
+        shutil.copy(fund_news_path, data_dir)  # read by the web app's fund news pages
+    history_path = os.path.join(directory, "market_history.csv")
+    write_market_history(history_path, tickers_path)
+    if not os.path.exists(os.path.join(directory, "images")):
+        os.symlink(os.path.join(REPO_DIR, "images"), os.path.join(directory, "images"))
+
+    cassette_path = os.path.join(directory, "cassette.json")
+    cassette = replay.Cassette(cassette_path, replay.RECORD)
+    url = everything_url(KEYWORDS, FROM_DAYS_AGO)
+    for i in range(fetches):
+        articles = make_articles(articles_per_fetch, seed=SEED + i)
+        cassette.add("GET", url, {"status": "ok", "totalResults": len(articles), "articles": articles})
+    cassette.save()
+
+    env = {
+        "HTTP_CASSETTE": cassette_path,
+        "MARKET_DATA_PROVIDER": f"file:{history_path}",
+        "LLM_BACKEND": f"stub:{llm_latency_ms:g}",
+    }
+    if http_latency_ms:
+        env["HTTP_REPLAY_LATENCY_MS"] = f"{http_latency_ms:g}"
+    return env
+
+
+def activate(env: Dict[str, str], directory: str) -> None:
+    """Apply the workspace in this process: environment, working directory, HTTP replay."""
+    import replay
+
+    os.environ.update(env)
+    os.chdir(directory)
+    replay.install_from_env()
+    try:
+        import nltk
+        nltk.data.find("sentiment/vader_lexicon.zip")
+    except LookupError:
+        import scorer
+        print("VADER lexicon not installed: articles are scored 'Neutral' (nltk.download('vader_lexicon'))")
+        scorer.score_article = lambda article: "Neutral"
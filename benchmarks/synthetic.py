@@ -0,0 +1,106 @@
+"""
+Deterministic synthetic corpora for the benchmarks.
+
+make_articles(n) returns NewsAPI-shaped candidate articles (title, description, content,
+url, publishedAt, source) built from fixed vocabularies with a seeded RNG, so every run
+and every machine sees the same corpus. About DUPLICATE_RATE of the articles re-use an
+earlier headline with small edits, as syndicated stories do, so deduplication has work to do.
+make_enriched(n) and make_briefing(n) give the summarised articles and the briefing dict
+the formatter consumes.
+"""
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+SEED = 20250618
+DUPLICATE_RATE = 0.2
+
+SUBJECTS = [
+    "Offshore wind developer", "Green hydrogen start-up", "Solar fund", "Battery storage operator",
+    "Infrastructure trust", "Blue economy fund", "Utility", "Carbon capture project", "EV charging network",
+    "Tidal energy firm", "Sustainable forestry REIT", "Grid operator", "Biomethane producer", "Pension fund",
+]
+ACTIONS = [
+    "secures financing for", "announces acquisition of", "raises capital for", "warns on delays to",
+    "completes refinancing of", "wins auction for", "cuts guidance on", "doubles investment in",
+    "faces regulatory probe over", "signs offtake agreement for",
+]
+OBJECTS = [
+    "North Sea portfolio", "1GW pipeline", "Iberian solar assets", "grid-scale batteries", "ammonia export terminal",
+    "floating wind demonstrator", "Nordic hydro plants", "UK rooftop solar book", "green bond programme",
+    "coastal restoration scheme", "Baltic interconnector", "heat network",
+]
+SOURCES = ["Reuters", "Bloomberg", "Financial Times", "ESG Newswire", "Recharge", "edie", "Energy Voice"]
+SENTENCES = [
+    "The transaction values the portfolio at a premium to its latest published net asset value.",
+    "Analysts said the move reflected growing institutional demand for contracted renewable cash flows.",
+    "Higher interest rates have weighed on listed infrastructure funds, widening discounts to NAV.",
+    "The company expects the project to reach financial close before the end of the year.",
+    "Regulators are consulting on changes to the contracts-for-difference regime.",
+    "Investors welcomed the update, although some questioned the pace of capital recycling.",
+    "The board said dividend cover remained comfortable despite lower power price assumptions.",
+    "Supply chain constraints continue to push turbine costs higher across the sector.",
+    "The deal is subject to shareholder approval and customary regulatory clearances.",
+    "Management reiterated its target of net zero operational emissions by 2030.",
+]
+KEYWORDS = ["green bonds", "offshore wind", "renewable infrastructure", "sustainable finance", "energy transition"]
+
+
+def _headline(rng: random.Random) -> str:
+    return f"{rng.choice(SUBJECTS)} {rng.choice(ACTIONS)} {rng.choice(OBJECTS)}"
+
+
+def make_articles(n: int, seed: int = SEED) -> List[Dict]:
+    rng = random.Random(seed)
+    start = datetime(2025, 6, 1)
+    articles = []
+    for i in range(n):
+        if articles and rng.random() < DUPLICATE_RATE:
+            # Syndicated copy: same story, lightly edited headline
+            title = rng.choice(articles)["title"].replace(" for ", " for the ", 1) + rng.choice(["", " - report", " (update)"])
+        else:
+            title = f"{_headline(rng)} {i}"
+        body = " ".join(rng.choice(SENTENCES) for _ in range(rng.randint(6, 14)))
+        articles.append({
+            "title": title,
+            "description": rng.choice(SENTENCES),
+            "content": f"{title}. {body}",
+            "url": f"https://news.example.com/{i:06d}",
+            "publishedAt": (start + timedelta(minutes=rng.randrange(0, 60 * 24 * 14))).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "source": {"name": rng.choice(SOURCES)},
+        })
+    return articles
+
+
+def make_enriched(n: int, seed: int = SEED) -> List[Dict]:
+    """Articles as generate_briefing_from_articles passes them to build_briefing."""
+    rng = random.Random(seed + 1)
+    topics = ["Regulatory & Policy", "Corporate Action", "Market Trends", "New Technology", "General News"]
+    return [
+        {
+            "title": article["title"],
+            "url": article["url"],
+            "date": article["publishedAt"],
+            "source": article["source"]["name"],
+            "summary": "\n".join(f"- {rng.choice(SENTENCES)}" for _ in range(3))
+                       + f"\nTopic: {rng.choice(topics)}\nMentioned Companies: {rng.choice(['None', 'Orsted, SSE', 'Iberdrola'])}",
+            "sentiment": rng.choice(["Positive", "Negative", "Neutral"]),
+        }
+        for article in make_articles(n, seed)
+    ]
+
+
+def make_briefing(n: int, seed: int = SEED) -> Dict:
+    """Briefing dict as the formatter receives it (built by reporter.build_briefing)."""
+    from reporter import build_briefing
+
+    briefing = build_briefing(make_enriched(n, seed))
+    briefing["date"] = "2025-06-18"
+    briefing["title"] = "SAFL Daily Briefing"
+    briefing["intro"] = " ".join(SENTENCES[:4])
+    briefing["fund_performance"] = {
+        "best_performers": [{"Fund Name": f"Fund {i}", "Close Price": 1.0 + i, "NAV": 1.2 + i, "Discount (%)": -10.0 - i} for i in range(5)],
+        "worst_performers": [{"Fund Name": f"Fund {i}", "Close Price": 0.5, "NAV": 1.0, "Discount (%)": -50.0} for i in range(5)],
+        "last_updated": "2025-06-18 09:00:00",
+    }
+    return briefing
@@ -0,0 +1,355 @@
+"""
+Manifest index of generated briefings (<output_dir>/.briefings.db).
+
+Briefing files are named briefing_YYYY-MM-DD[_custom].{md,html,pdf}; files sharing a date and
+custom name form one briefing group. The index is updated in a single SQLite transaction
+whenever write_briefing_outputs writes a briefing or the web app deletes files, so listing
+pages query it (paginated) instead of scanning the output directory on every request.
+
+    python briefing_index.py --rebuild [output_dir]                 # re-index from disk
+    python briefing_index.py --archive DAYS [output_dir]            # bundle older briefings
+
+Each file's entry also keeps the artifact digest it was rendered from (its ETag when served)
+and, for Markdown and HTML, a short excerpt used for previews without reading the file.
+
+Archiving moves the files of briefings older than DAYS into monthly zip bundles
+(<output_dir>/archive/briefings_YYYY-MM.zip); the index keeps the entry, marked archived.
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from itertools import islice
+import re
+import sqlite3
+import sys
+import threading
+import time
+import zipfile
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import artifact_cache
+
+INDEX_NAME = ".briefings.db"
+ARCHIVE_DIRNAME = "archive"
+FILENAME_RE = re.compile(r'^briefing_(\d{4}-\d{2}-\d{2})(?:_([\w-]+))?\.(pdf|html|md)$')
+ARCHIVE_RE = re.compile(r'^briefings_\d{4}-\d{2}\.zip$')
+EXCERPT_EXTENSIONS = {"md", "html"}
+EXCERPT_LINES = 20
+EXCERPT_CHARS = 2000
+
+_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS briefings (
+        group_key TEXT PRIMARY KEY,
+        date TEXT NOT NULL,
+        custom_name TEXT,
+        name TEXT NOT NULL,
+        files TEXT NOT NULL DEFAULT '{}',
+        title TEXT,
+        articles INTEGER,
+        digest TEXT,
+        archive TEXT,
+        etags TEXT NOT NULL DEFAULT '{}',
+        excerpts TEXT NOT NULL DEFAULT '{}',
+        updated_at TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_briefings_date ON briefings (date, name)",
+]
+
+_lock = threading.Lock()
+_initialized = set()  # index paths already created/migrated in this process
+_file_info_cache: Dict[tuple, tuple] = {}  # (index path, filename) -> (index file stamp, info)
+
+
+def index_path(output_dir: str) -> str:
+    return os.path.join(output_dir, INDEX_NAME)
+
+
+def parse_filename(filename: str) -> Optional[Dict[str, str]]:
+    """Group fields for a briefing filename, or None if it isn't one."""
+    match = FILENAME_RE.match(filename)
+    if not match:
+        return None
+    date_str, custom_name, ext = match.groups()
+    return {
+        "group_key": f"{date_str}_{custom_name or 'daily'}",
+        "date": date_str,
+        "custom_name": custom_name,
+        "name": f"Briefing for {date_str}" + (f" ({custom_name.replace('_', ' ').title()})" if custom_name else ""),
+        "ext": ext.lower(),
+    }
+
+
+def _connect(output_dir: str) -> sqlite3.Connection:
+    path = index_path(output_dir)
+    conn = sqlite3.connect(path, timeout=30) if path in _initialized and os.path.exists(path) else _initialize(output_dir)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+@contextmanager
+def _open(output_dir: str) -> Iterator[sqlite3.Connection]:
+    """
+    Connection that commits on success and is always closed: an unclosed connection keeps
+    its file lock until garbage-collected, which stalls concurrent readers.
+    """
+    conn = _connect(output_dir)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _initialize(output_dir: str) -> sqlite3.Connection:
+    """Create or migrate the index once per process (and build it from disk if new)."""
+    os.makedirs(output_dir, exist_ok=True)
+    path = index_path(output_dir)
+    created = not os.path.exists(path)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    for statement in _SCHEMA:
+        conn.execute(statement)
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(briefings)")}
+    for column in ("etags", "excerpts"):
+        if column not in columns:  # indexes created before per-file metadata
+            conn.execute(f"ALTER TABLE briefings ADD COLUMN {column} TEXT NOT NULL DEFAULT '{{}}'")
+    if created:
+        _rebuild(conn, output_dir)  # first use on an existing output directory
+    conn.commit()
+    _initialized.add(path)
+    return conn
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def read_excerpt(path: str) -> str:
+    """The first EXCERPT_LINES lines of a text file, capped at EXCERPT_CHARS."""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        excerpt = "".join(islice(f, EXCERPT_LINES))
+    if len(excerpt) > EXCERPT_CHARS:
+        excerpt = excerpt[:EXCERPT_CHARS] + "\n..."
+    return excerpt
+
+
+def _add_file(conn: sqlite3.Connection, output_dir: str, filename: str, meta: Optional[Dict] = None) -> bool:
+    fields = parse_filename(filename)
+    if not fields:
+        return False
+    meta = meta or {}
+    ext = fields["ext"]
+    row = conn.execute("SELECT files, etags, excerpts FROM briefings WHERE group_key = ?", (fields["group_key"],)).fetchone()
+    files, etags, excerpts = (json.loads(row[key]) for key in ("files", "etags", "excerpts")) if row else ({}, {}, {})
+    files[ext] = filename
+    if meta.get("digest"):
+        etags[ext] = meta["digest"]
+    else:
+        etags.pop(ext, None)
+    if ext in EXCERPT_EXTENSIONS:
+        try:
+            excerpts[ext] = read_excerpt(os.path.join(output_dir, filename))
+        except OSError:
+            excerpts.pop(ext, None)
+    conn.execute(
+        """
+        INSERT INTO briefings (group_key, date, custom_name, name, files, title, articles, digest, archive, etags, excerpts, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, NULL, ?, ?, ?)
+        ON CONFLICT (group_key) DO UPDATE SET
+            files = excluded.files,
+            title = COALESCE(excluded.title, briefings.title),
+            articles = COALESCE(excluded.articles, briefings.articles),
+            digest = COALESCE(excluded.digest, briefings.digest),
+            archive = NULL,
+            etags = excluded.etags,
+            excerpts = excluded.excerpts,
+            updated_at = excluded.updated_at
+        """,
+        (fields["group_key"], fields["date"], fields["custom_name"], fields["name"], json.dumps(files),
+         meta.get("title"), meta.get("articles"), meta.get("digest"), json.dumps(etags),
+         json.dumps(excerpts, ensure_ascii=False), _now()),
+    )
+    return True
+
+
+def record_files(paths: Iterable[str], meta: Optional[Dict] = None) -> int:
+    """
+    Record written briefing files (any mix of formats, same output directory) in one transaction.
+    meta may carry 'title', 'articles' (count) and 'digest'. Returns the number of files indexed.
+    """
+    paths = [os.path.abspath(p) for p in paths if p]
+    if not paths:
+        return 0
+    output_dir = os.path.dirname(paths[0])
+    with _lock, _open(output_dir) as conn:
+        return sum(_add_file(conn, output_dir, os.path.basename(path), meta) for path in paths)
+
+
+def remove_files(output_dir: str, filenames: Iterable[str]) -> None:
+    """Drop deleted files from their briefing groups; groups left with no files are removed."""
+    with _lock, _open(output_dir) as conn:
+        for filename in filenames:
+            fields = parse_filename(filename)
+            if not fields:
+                continue
+            row = conn.execute("SELECT files, etags, excerpts FROM briefings WHERE group_key = ?",
+                               (fields["group_key"],)).fetchone()
+            if not row:
+                continue
+            files, etags, excerpts = (json.loads(row[key]) for key in ("files", "etags", "excerpts"))
+            for entries in (files, etags, excerpts):
+                entries.pop(fields["ext"], None)
+            if files:
+                conn.execute("UPDATE briefings SET files = ?, etags = ?, excerpts = ?, updated_at = ? WHERE group_key = ?",
+                             (json.dumps(files), json.dumps(etags), json.dumps(excerpts, ensure_ascii=False), _now(),
+                              fields["group_key"]))
+            else:
+                conn.execute("DELETE FROM briefings WHERE group_key = ?", (fields["group_key"],))
+
+
+def _row_to_briefing(row: sqlite3.Row) -> Dict:
+    briefing = dict(row)
+    for key in ("files", "etags", "excerpts"):
+        briefing[key] = json.loads(briefing[key])
+    briefing["datetime"] = datetime.strptime(briefing["date"], "%Y-%m-%d")
+    return briefing
+
+
+def list_briefings(output_dir: str, limit: Optional[int] = None, offset: int = 0,
+                   include_archived: bool = True) -> List[Dict]:
+    """Briefing groups, newest date first (then name descending, as the directory listing was)."""
+    sql = "SELECT * FROM briefings"
+    if not include_archived:
+        sql += " WHERE archive IS NULL"
+    sql += " ORDER BY date DESC, name DESC LIMIT ? OFFSET ?"
+    with _open(output_dir) as conn:
+        rows = conn.execute(sql, (-1 if limit is None else limit, offset)).fetchall()
+    return [_row_to_briefing(row) for row in rows]
+
+
+def count_briefings(output_dir: str, include_archived: bool = True) -> int:
+    sql = "SELECT COUNT(*) FROM briefings" + ("" if include_archived else " WHERE archive IS NULL")
+    with _open(output_dir) as conn:
+        return conn.execute(sql).fetchone()[0]
+
+
+def get_briefing(output_dir: str, group_key: str) -> Optional[Dict]:
+    with _open(output_dir) as conn:
+        row = conn.execute("SELECT * FROM briefings WHERE group_key = ?", (group_key,)).fetchone()
+    return _row_to_briefing(row) if row else None
+
+
+def _stamp(path: str) -> Optional[tuple]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def get_file_info(output_dir: str, filename: str) -> Optional[Dict]:
+    """
+    {'digest', 'excerpt'} recorded for one briefing file (either may be None), or None if not
+    indexed. Called on every file request, so results are memoised until the index file changes.
+    """
+    path = index_path(output_dir)
+    stamp = _stamp(path)
+    cached = _file_info_cache.get((path, filename))
+    if stamp and cached and cached[0] == stamp:
+        return cached[1]
+    fields = parse_filename(filename)
+    briefing = get_briefing(output_dir, fields["group_key"]) if fields else None
+    if not briefing or briefing["files"].get(fields["ext"]) != filename:
+        info = None
+    else:
+        info = {"digest": briefing["etags"].get(fields["ext"]), "excerpt": briefing["excerpts"].get(fields["ext"])}
+    # A write in the same timestamp tick could leave the stamp unchanged: only memoise settled files
+    if stamp and time.time_ns() - stamp[0] > 1_000_000_000:
+        _file_info_cache[(path, filename)] = (stamp, info)
+    return info
+
+
+def _rebuild(conn: sqlite3.Connection, output_dir: str) -> int:
+    # Archived entries have no files on disk and are kept; files restored from a bundle
+    # un-archive their group when re-added.
+    conn.execute("DELETE FROM briefings WHERE archive IS NULL")
+    count = 0
+    for entry in os.scandir(output_dir):
+        if entry.is_file() and _add_file(conn, output_dir, entry.name):
+            count += 1
+    return count
+
+
+def rebuild(output_dir: str) -> int:
+    """Re-index the briefing files on disk (archived entries are kept). Returns the file count."""
+    with _lock, _open(output_dir) as conn:
+        return _rebuild(conn, output_dir)
+
+
+def _bundle_arcname(zf: zipfile.ZipFile, output_dir: str, filename: str) -> Optional[str]:
+    """
+    Name to write a file under in a bundle: its own name, or None if the bundle already has
+    an identical copy. A different file of the same name (a regenerated briefing) is kept
+    alongside as name_2.ext, name_3.ext, ...
+    """
+    names = set(zf.namelist())
+    if filename not in names:
+        return filename
+    with open(os.path.join(output_dir, filename), "rb") as f:
+        content = f.read()
+    stem, ext = os.path.splitext(filename)
+    candidates = [filename] + [f"{stem}_{n}{ext}" for n in range(2, len(names) + 2)]
+    for arcname in candidates:
+        if arcname not in names:
+            return arcname
+        if zf.read(arcname) == content:
+            return None
+    return None  # unreachable: there are more candidates than names
+
+
+def archive_older_than(output_dir: str, days: int, today: Optional[datetime] = None) -> List[str]:
+    """
+    Move the files of briefings dated more than `days` ago into monthly zip bundles and mark
+    them archived. Files are removed only once the bundle holds them: written now, or an
+    identical copy already there; a changed file of the same name is added under a new name
+    (see _bundle_arcname). Returns archived group keys.
+    """
+    cutoff = ((today or datetime.now()) - timedelta(days=days)).strftime("%Y-%m-%d")
+    archive_dir = os.path.join(output_dir, ARCHIVE_DIRNAME)
+    archived = []
+    with _lock, _open(output_dir) as conn:
+        rows = conn.execute("SELECT * FROM briefings WHERE archive IS NULL AND date < ? ORDER BY date", (cutoff,)).fetchall()
+        for row in rows:
+            bundle = f"briefings_{row['date'][:7]}.zip"
+            os.makedirs(archive_dir, exist_ok=True)
+            files = [f for f in json.loads(row["files"]).values() if os.path.exists(os.path.join(output_dir, f))]
+            with zipfile.ZipFile(os.path.join(archive_dir, bundle), "a", compression=zipfile.ZIP_DEFLATED) as zf:
+                for filename in files:
+                    arcname = _bundle_arcname(zf, output_dir, filename)
+                    if arcname is not None:
+                        zf.write(os.path.join(output_dir, filename), arcname=arcname)
+            # Every file is now in the bundle, written above or already there byte for byte
+            for filename in files:
+                os.remove(os.path.join(output_dir, filename))
+            artifact_cache.release(output_dir, files)
+            conn.execute("UPDATE briefings SET archive = ?, updated_at = ? WHERE group_key = ?",
+                         (bundle, _now(), row["group_key"]))
+            archived.append(row["group_key"])
+    return archived
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args and args[0] == "--rebuild":
+        directory = args[1] if len(args) > 1 else "./output"
+        print(f"Indexed {rebuild(directory)} briefing files in {directory}")
+    elif len(args) >= 2 and args[0] == "--archive":
+        directory = args[2] if len(args) > 2 else "./output"
+        keys = archive_older_than(directory, int(args[1]))
+        print(f"Archived {len(keys)} briefings older than {args[1]} days")
+    else:
+        print(__doc__)
@@ -0,0 +1,223 @@
+"""
+Checkpoints for briefing runs, so a run that fails part way can be resumed instead of redone.
+
+generate_briefing_from_articles gives every run a run id and writes the output of each
+stage to <output_dir>/.runs/<run_id>/ as soon as it is complete:
+
+    run.json               status (running, failed), stages completed, error, briefing name
+    articles.json          the accepted articles the run started from
+    unique.json            the deduplicated articles selected for summarising
+    summaries.json         enriched articles by URL, saved as each summary comes back
+    fund_performance.json  the fund performance section
+    briefing.json          the briefing (articles, intro, fund section), ready to render
+
+Resuming a run (python main.py --resume <run-id>, or Resume on the failed job's page)
+reuses what is there and redoes only the rest: a run that failed on its eighth summary
+redoes that summary onwards, one that failed in Chromium only renders. A run where any
+summary failed (raised, or came back as "[Error ...]") fails after summarising instead of
+building a briefing with gaps; failed summaries are not saved, so a resume retries only
+those. The directory is removed once the run succeeds.
+
+While a run is being generated it holds run.lock (created exclusively, holding the owning
+process, see jobs.process_owner), so a second resume of the same run is refused rather than
+writing the same files; a lock left by a process that has exited is taken over. Directories
+of failed runs older than RUN_RETENTION_DAYS are removed by prune_runs().
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+RUNS_DIRNAME = ".runs"
+LOCK_FILE = "run.lock"
+RUN_RETENTION_DAYS = 14
+RUN_ID_CHARS = set("0123456789abcdef-")
+
+RUNNING = "running"
+FAILED = "failed"
+
+
+class CheckpointError(Exception):
+    """Raised when a run to resume has no checkpoints."""
+
+
+class RunInProgress(CheckpointError):
+    """Raised when a run is already being generated by another job or process."""
+
+
+def new_run_id() -> str:
+    """Sortable, unique run id: YYYYmmdd-HHMMSS-<6 hex digits>."""
+    return f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+def runs_dir(output_dir: str) -> str:
+    return os.path.join(output_dir, RUNS_DIRNAME)
+
+
+class RunCheckpoint:
+    """The checkpoint directory of one run; each stage output is a JSON file written atomically."""
+
+    def __init__(self, output_dir: str, run_id: str):
+        if not run_id or not set(run_id) <= RUN_ID_CHARS:
+            raise CheckpointError(f"Invalid run id: {run_id!r}")
+        self.run_id = run_id
+        self.directory = os.path.join(runs_dir(output_dir), run_id)
+        self._lock = threading.Lock()
+        self._summaries: Optional[Dict[str, Dict]] = None
+
+    @classmethod
+    def create(cls, output_dir: str, articles: List[Dict], run_id: Optional[str] = None,
+               name: Optional[str] = None) -> "RunCheckpoint":
+        """
+        Start checkpointing a run (a new run id unless one is given) from its input articles.
+        name is the briefing's file name suffix, kept for resuming.
+        """
+        checkpoint = cls(output_dir, run_id or new_run_id())
+        os.makedirs(checkpoint.directory, exist_ok=True)
+        if not checkpoint.has("articles"):
+            checkpoint.save("articles", articles)
+        checkpoint.mark(RUNNING, **({"name": name} if name else {}))
+        return checkpoint
+
+    @classmethod
+    def open(cls, output_dir: str, run_id: str) -> "RunCheckpoint":
+        """
+        Checkpoints of an earlier run; raises CheckpointError if there are none, and
+        RunInProgress if the run is being generated right now.
+        """
+        checkpoint = cls(output_dir, run_id)
+        if not checkpoint.has("articles"):
+            raise CheckpointError(f"No checkpoints for run {run_id} in {runs_dir(output_dir)}")
+        if checkpoint.in_progress():
+            raise RunInProgress(f"Run {run_id} is already running")
+        return checkpoint
+
+    def _lock_owner(self) -> Optional[str]:
+        try:
+            with open(os.path.join(self.directory, LOCK_FILE), "r", encoding="utf-8") as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            return None
+
+    def in_progress(self) -> bool:
+        """True if a live process holds the run's lock."""
+        from jobs import owner_exited
+
+        owner = self._lock_owner()
+        return owner is not None and not owner_exited(owner)
+
+    def acquire(self) -> None:
+        """Take the run's lock before generating; raises RunInProgress if a live process holds it."""
+        from jobs import owner_exited, process_owner
+
+        path = os.path.join(self.directory, LOCK_FILE)
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                owner = self._lock_owner()
+                if owner is not None and not owner_exited(owner):
+                    raise RunInProgress(f"Run {self.run_id} is already running ({owner})")
+                try:
+                    os.remove(path)  # left by a process that exited
+                except FileNotFoundError:
+                    pass
+                continue
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(process_owner())
+            self.mark(RUNNING)
+            return
+        raise RunInProgress(f"Run {self.run_id} is already running")
+
+    def release(self) -> None:
+        try:
+            os.remove(os.path.join(self.directory, LOCK_FILE))
+        except FileNotFoundError:
+            pass
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.json")
+
+    def has(self, name: str) -> bool:
+        return os.path.exists(self._path(name))
+
+    def load(self, name: str) -> Any:
+        with open(self._path(name), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, name: str, data: Any) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, default=str, ensure_ascii=False)
+        os.replace(tmp_path, self._path(name))
+
+    def summaries(self) -> Dict[str, Dict]:
+        """Enriched articles saved so far, by URL."""
+        with self._lock:
+            if self._summaries is None:
+                self._summaries = self.load("summaries") if self.has("summaries") else {}
+            return dict(self._summaries)
+
+    def save_summary(self, url: str, enriched: Dict) -> None:
+        """Save one enriched article (called from the summary workers as each one completes)."""
+        if str(enriched.get("summary", "")).startswith("[Error"):
+            return
+        self.summaries()
+        with self._lock:
+            self._summaries[url] = enriched
+            self.save("summaries", self._summaries)
+
+    def info(self) -> Dict[str, Any]:
+        return self.load("run") if self.has("run") else {}
+
+    def mark(self, status: str, **fields) -> None:
+        """Record the run's status (and e.g. error, stage) in run.json."""
+        info = self.info()
+        info.setdefault("run_id", self.run_id)
+        info.setdefault("created_at", datetime.now().isoformat(timespec="seconds"))
+        info.update(fields, status=status, updated_at=datetime.now().isoformat(timespec="seconds"))
+        info["completed"] = [name for name in ("unique", "summaries", "fund_performance", "briefing") if self.has(name)]
+        self.save("run", info)
+
+    def remove(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def list_runs(output_dir: str) -> List[Dict[str, Any]]:
+    """run.json of every checkpointed (i.e. unfinished) run, newest first."""
+    directory = runs_dir(output_dir)
+    if not os.path.isdir(directory):
+        return []
+    runs = []
+    for run_id in sorted(os.listdir(directory), reverse=True):
+        try:
+            info = RunCheckpoint(output_dir, run_id).info()
+        except (CheckpointError, json.JSONDecodeError):
+            continue
+        if info:
+            runs.append(info)
+    return runs
+
+
+def prune_runs(output_dir: str, max_age_days: float = RUN_RETENTION_DAYS) -> List[str]:
+    """Remove the checkpoints of runs not touched for max_age_days (unless running); returns their ids."""
+    cutoff = (datetime.now() - timedelta(days=max_age_days)).isoformat(timespec="seconds")
+    pruned = []
+    for info in list_runs(output_dir):
+        checkpoint = RunCheckpoint(output_dir, info["run_id"])
+        if info.get("updated_at", "") < cutoff and not checkpoint.in_progress():
+            checkpoint.remove()
+            pruned.append(info["run_id"])
+    return pruned
+
+
+def run_exists(output_dir: str, run_id: str) -> bool:
+    try:
+        return RunCheckpoint(output_dir, run_id).has("articles")
+    except CheckpointError:
+        return False
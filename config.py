@@ -1,9 +1,25 @@
+"""
+Configuration: API keys (environment first, then config.json), keywords and funds.
+
+config.json is read through a ConfigStore that parses it once and re-reads it only when the
+file changes on disk (mtime/size), validates every load and save against CONFIG_SCHEMA, and
+writes atomically (temp file + rename). Subscribers are notified with the set of changed
+keys; the module-level values (KEYWORDS, FUNDS, API keys) are refreshed that way.
+"""
+
 import os
 import json
+import tempfile
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
 from dotenv import load_dotenv
 
 load_dotenv()
 
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config_default.json")
+API_KEY_NAMES = ("NEWS_API_KEY", "GOOGLE_API_KEY", "MARKETAUX_API_TOKEN")
+
 # Try to load from environment variables first
 NEWS_API_KEY = os.getenv("NEWS_API_KEY")
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
@@ -134,21 +150,178 @@ _DEFAULT_FUNDS = [
     "WS Montanaro Better World Fund"
 ]
 
-# Load KEYWORDS and FUNDS from config.json if present, otherwise use defaults
-KEYWORDS = _DEFAULT_KEYWORDS
-FUNDS = _DEFAULT_FUNDS
-try:
-    with open("config.json", "r") as f:
-        config_data = json.load(f)
-    NEWS_API_KEY = NEWS_API_KEY or config_data.get("NEWS_API_KEY")
-    GOOGLE_API_KEY = GOOGLE_API_KEY or config_data.get("GOOGLE_API_KEY")
-    MARKETAUX_API_TOKEN = MARKETAUX_API_TOKEN or config_data.get("MARKETAUX_API_TOKEN")
-    if "KEYWORDS" in config_data and isinstance(config_data["KEYWORDS"], list):
-        KEYWORDS = config_data["KEYWORDS"]
-    if "FUNDS" in config_data and isinstance(config_data["FUNDS"], list):
-        FUNDS = config_data["FUNDS"]
-except Exception:
-    pass
+
+class ConfigError(ValueError):
+    """Raised when configuration data does not match CONFIG_SCHEMA."""
+
+
+# Known keys and their types; unknown keys are kept as they are
+CONFIG_SCHEMA = {
+    "NEWS_API_KEY": str,
+    "GOOGLE_API_KEY": str,
+    "MARKETAUX_API_TOKEN": str,
+    "KEYWORDS": List[str],
+    "KEYWORDS2": List[str],
+    "RELEVANT_KEYWORDS": List[str],
+    "FUNDS": List[str],
+}
+
+
+def validate_config(data: Any) -> Dict[str, Any]:
+    """
+    Check configuration data against CONFIG_SCHEMA and return a normalised copy
+    (string lists stripped, empty entries dropped). Raises ConfigError listing every problem.
+    """
+    if not isinstance(data, dict):
+        raise ConfigError("Configuration must be a JSON object.")
+    errors = []
+    config = dict(data)
+    for key, expected in CONFIG_SCHEMA.items():
+        if key not in config or config[key] is None:
+            continue
+        value = config[key]
+        if expected is str:
+            if not isinstance(value, str):
+                errors.append(f"{key} must be a string.")
+        elif not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+            errors.append(f"{key} must be a list of strings.")
+        else:
+            config[key] = [item.strip() for item in value if item.strip()]
+    if errors:
+        raise ConfigError(" ".join(errors))
+    return config
+
+
+def _file_stamp(path: str) -> Optional[tuple]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class ConfigStore:
+    """Cached, validated view of a JSON config file."""
+
+    def __init__(self, path: str = CONFIG_PATH, default_path: str = DEFAULT_CONFIG_PATH):
+        self.path = path
+        self.default_path = default_path
+        self._lock = threading.RLock()
+        self._stamp = None
+        self._config: Dict[str, Any] = {}
+        self._subscribers: List[tuple] = []
+        self._loaded = False
+
+    def get(self) -> Dict[str, Any]:
+        """
+        The current configuration (do not mutate; use save/update). The file is re-read only if
+        its mtime or size changed; an unreadable or invalid file keeps the last good configuration.
+        """
+        stamp = _file_stamp(self.path)
+        if stamp != self._stamp:
+            with self._lock:
+                if stamp != self._stamp:
+                    self._reload(stamp)
+        return self._config
+
+    def _reload(self, stamp: Optional[tuple]) -> None:
+        if stamp is None:
+            config = {}
+        else:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    config = validate_config(json.load(f))
+            except (OSError, ValueError) as e:
+                print(f"Ignoring invalid config file {self.path}: {e}")
+                self._stamp = stamp
+                return
+        self._stamp = stamp
+        self._apply(config)
+
+    def _apply(self, config: Dict[str, Any]) -> None:
+        changed = {key for key in set(config) | set(self._config) if config.get(key) != self._config.get(key)}
+        self._config = config
+        initial, self._loaded = not self._loaded, True
+        if not changed or initial:  # the first load is not a change
+            return
+        for keys, callback in list(self._subscribers):
+            if keys is None or changed & keys:
+                try:
+                    callback(config, changed)
+                except Exception as e:
+                    print(f"Config subscriber {getattr(callback, '__name__', callback)} failed: {e}")
+
+    def save(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate and atomically replace the whole configuration. Returns the saved config."""
+        config = validate_config(data)
+        with self._lock:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(config, f, indent=2)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            self._stamp = _file_stamp(self.path)
+            self._apply(config)
+        return config
+
+    def update(self, changes: Dict[str, Any]) -> Dict[str, Any]:
+        """Save the current configuration with some keys replaced."""
+        with self._lock:
+            return self.save(dict(self.get(), **changes))
+
+    def reset(self) -> Dict[str, Any]:
+        """Replace the configuration with the defaults file."""
+        with open(self.default_path, "r", encoding="utf-8") as f:
+            return self.save(json.load(f))
+
+    def subscribe(self, callback: Callable[[Dict[str, Any], Set[str]], None], keys: Optional[Iterable[str]] = None) -> None:
+        """Call callback(config, changed_keys) whenever one of keys (default: any key) changes."""
+        with self._lock:
+            self._subscribers.append((set(keys) if keys is not None else None, callback))
+
+
+_store: Optional[ConfigStore] = None
+_store_lock = threading.Lock()
+
+
+def get_config_store() -> ConfigStore:
+    """Process-wide ConfigStore for config.json, created on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ConfigStore()
+        return _store
+
+
+def get_api_key(name: str) -> Optional[str]:
+    """API key from the environment, else from config.json (so keys saved in the web app apply at once)."""
+    return os.getenv(name) or get_config_store().get().get(name) or None
+
+
+# Module-level values as of import; prefer the accessors below for values that can change
+_config_data = get_config_store().get()
+NEWS_API_KEY = NEWS_API_KEY or _config_data.get("NEWS_API_KEY")
+GOOGLE_API_KEY = GOOGLE_API_KEY or _config_data.get("GOOGLE_API_KEY")
+MARKETAUX_API_TOKEN = MARKETAUX_API_TOKEN or _config_data.get("MARKETAUX_API_TOKEN")
+KEYWORDS = _config_data.get("KEYWORDS") or _DEFAULT_KEYWORDS
+FUNDS = _config_data.get("FUNDS") or _DEFAULT_FUNDS
+
+
+def _refresh_module_values(config: Dict[str, Any], changed: Set[str]) -> None:
+    """Keep the module-level values above in step with config.json for code that reads them."""
+    global KEYWORDS, FUNDS
+    for name in changed & set(API_KEY_NAMES):
+        globals()[name] = get_api_key(name)
+    KEYWORDS = config.get("KEYWORDS") or _DEFAULT_KEYWORDS
+    FUNDS = config.get("FUNDS") or _DEFAULT_FUNDS
+
+
+get_config_store().subscribe(_refresh_module_values, keys=API_KEY_NAMES + ("KEYWORDS", "FUNDS"))
 
 KEYWORDS2 = ["green bonds", "green economy", "blue economy", "sustainable finance", "investment trust", "traded investment trust", 
             "trust discount", "board of directors", "income paying trust", "trust dividend", "trust NAV"]
@@ -197,22 +370,7 @@ ARTICLE_LOOKBACK_DAYS = 3
 # Dynamic config accessors for real-time updates
 
 def get_keywords():
-    try:
-        with open("config.json", "r") as f:
-            config_data = json.load(f)
-        if "KEYWORDS" in config_data and isinstance(config_data["KEYWORDS"], list):
-            return config_data["KEYWORDS"]
-    except Exception:
-        pass
-    return _DEFAULT_KEYWORDS
+    return get_config_store().get().get("KEYWORDS") or _DEFAULT_KEYWORDS
 
 def get_funds():
-    try:
-        with open("config.json", "r") as f:
-            config_data = json.load(f)
-        if "FUNDS" in config_data and isinstance(config_data["FUNDS"], list):
-            return config_data["FUNDS"]
-    except Exception:
-        pass
-    return _DEFAULT_FUNDS
-
+    return get_config_store().get().get("FUNDS") or _DEFAULT_FUNDS
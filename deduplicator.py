@@ -1,18 +1,23 @@
 from difflib import SequenceMatcher
-from typing import List, Dict
+from typing import Dict, Iterable, Iterator, List
 
 def is_similar(a, b, threshold=0.85):
     """Checks if two strings are similar above a certain threshold."""
     return SequenceMatcher(None, a.lower(), b.lower()).ratio() > threshold
 
-def deduplicate_articles(articles: List[Dict]) -> List[Dict]:
+def iter_unique(articles: Iterable[Dict]) -> Iterator[Dict]:
+    """
+    Yield each article whose title is not similar to an earlier one, as it arrives,
+    so a consumer that needs only the first few unique articles stops the comparisons early.
+    """
     seen_titles = []
-    deduplicated = []
     for article in articles:
         if not article.get('title'):
             continue
 
         if all(not is_similar(article['title'], seen_title) for seen_title in seen_titles):
-            deduplicated.append(article)
             seen_titles.append(article['title'])
-    return deduplicated
+            yield article
+
+def deduplicate_articles(articles: List[Dict]) -> List[Dict]:
+    return list(iter_unique(articles))
@@ -1,70 +1,151 @@
 import os
-from typing import Dict, Any, Optional
-import markdown2
+import atexit
+import base64
+import hashlib
+import importlib.util
+import mimetypes
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 import markdown
-from playwright.sync_api import sync_playwright
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from markupsafe import Markup
 import tempfile
-from datetime import datetime
+import artifact_cache
+import briefing_index
+import metrics
 
 
 def generate_markdown(briefing: Dict, output_path: str) -> None:
     """Converts a structured briefing dict to a Markdown (.md) file."""
-    lines = []
-    lines.append(f"# COMPANY End of Week Briefing – {str(briefing.get('date', ''))}")
-    lines.append("")
-    lines.append(f"_{str(briefing.get('intro', ''))}_")
-    lines.append("\n---\n")
-
-    # Fund Performance Section
-    if briefing.get("fund_performance"):
-        fund_data = briefing["fund_performance"]
-        lines.append("## Listed Fund Performance Summary")
-        if fund_data.get("last_updated"):
-            lines.append(f"_(Fund data last updated: {fund_data['last_updated']})_")
-        lines.append("")
-
-        if fund_data.get("best_performers"):
-            lines.append("### Smallest Discounts")
-            lines.append("| Fund | Price | NAV | Discount |")
-            lines.append("|------|-------|-----|----------|")
-            for fund in fund_data["best_performers"][:5]:
-                lines.append(f"| {fund['Fund Name']} | £{fund['Close Price']:.2f} | £{fund['NAV']:.2f} | {fund['Discount (%)']:.1f}% |")
-            lines.append("")
-
-        if fund_data.get("worst_performers"):
-            lines.append("### Largest Discounts")
-            lines.append("| Fund | Price | NAV | Discount |")
-            lines.append("|------|-------|-----|----------|")
-            for fund in fund_data["worst_performers"][:5]:
-                lines.append(f"| {fund['Fund Name']} | £{fund['Close Price']:.2f} | £{fund['NAV']:.2f} | {fund['Discount (%)']:.1f}% |")
-            lines.append("")
-        lines.append("\n---\n")
-
-    lines.append("## Article Highlights\n")
-    for i, article in enumerate(briefing["articles"], 1):
-        lines.append(f"### {i}. {str(article.get('title', ''))}")
-        lines.append(f"**Source:** {str(article.get('source', ''))} | **Date:** {str(article.get('date', ''))}")
-        lines.append(f"[Read full article]({str(article.get('url', ''))})\n")
-
-        lines.append(f"**Sentiment:** {str(article.get('sentiment', '')).capitalize()}")
-        lines.append("")
-        lines.append(str(article.get("summary", "")))
-        lines.append("\n---\n")
-
-    # Write Markdown to file
     with open(output_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(lines))
+        f.write(render_markdown(briefing))
 
 
-def generate_pdf(briefing: Dict, output_path: str, logo_path) -> None:
+class PdfRenderer:
     """
-    Renders briefing as a PDF using a headless Chromium browser via Playwright.
+    Long-lived headless Chromium used to print briefings to PDF.
+    Playwright's sync API is bound to the thread that started it, so the browser lives on a
+    dedicated worker thread and callers (CLI, Flask request threads) submit jobs through a queue.
+    The browser is launched on first use and relaunched if it disconnects.
+    """
+
+    def __init__(self):
+        self._jobs: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> None:
+        # Callers hold self._lock
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="pdf-renderer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        job = None
+        try:
+            from playwright.sync_api import sync_playwright  # imported on the worker thread, on first PDF
+
+            with sync_playwright() as p:
+                browser = None
+                while True:
+                    job = self._jobs.get()
+                    if job is None:
+                        break
+                    html_file_path, output_path, future = job
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        if browser is None or not browser.is_connected():
+                            browser = p.chromium.launch()
+                        page = browser.new_page()
+                        page.route("**/*", _block_remote_requests)
+                        try:
+                            page.goto(f"file://{html_file_path}", wait_until="load")
+                            page.pdf(path=output_path, format="A4", print_background=True)
+                        finally:
+                            page.close()
+                        future.set_result(output_path)
+                    except Exception as e:
+                        future.set_exception(e)
+                    job = None
+                if browser is not None:
+                    browser.close()
+        except BaseException as e:
+            # Playwright failed to import or start: fail the current and queued jobs with the real
+            # error instead of leaving callers to time out; the next render starts a new worker
+            self._fail_pending(job, e)
+
+    def _fail_pending(self, job, error: BaseException) -> None:
+        with self._lock:
+            self._thread = None
+            jobs = [job] if job is not None else []
+            while True:
+                try:
+                    jobs.append(self._jobs.get_nowait())
+                except queue.Empty:
+                    break
+        for queued in jobs:
+            if queued is not None and not queued[2].done():
+                queued[2].set_exception(error)
+
+    def render(self, html_file_path: str, output_path: str, timeout: float = 120) -> str:
+        """Print a local HTML file to an A4 PDF and block until it is written."""
+        future: Future = Future()
+        with self._lock:
+            # Queued under the lock, so a worker that dies either fails this job or is replaced first
+            self._ensure_started()
+            self._jobs.put((html_file_path, output_path, future))
+        return future.result(timeout=timeout)
+
+    def close(self) -> None:
+        """Stop the worker thread and close the browser."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is not None and thread.is_alive():
+                self._jobs.put(None)
+        if thread is not None:
+            thread.join(timeout=30)
+
+
+def _block_remote_requests(route) -> None:
+    """Playwright route handler: only local (file:/data:) resources may load while printing."""
+    if route.request.url.startswith(("file:", "data:")):
+        route.continue_()
+    else:
+        route.abort()
+
+
+_pdf_renderer: Optional[PdfRenderer] = None
+_pdf_renderer_lock = threading.Lock()
+
+
+def get_pdf_renderer() -> PdfRenderer:
+    """
+    Return the process-wide PdfRenderer, creating it on first use.
+    Raises ImportError here, on the caller's thread, if Playwright is not installed.
+    """
+    global _pdf_renderer
+    if importlib.util.find_spec("playwright") is None:  # finds the package without importing it
+        raise ImportError("PDF output needs Playwright: pip install playwright && playwright install chromium")
+    with _pdf_renderer_lock:
+        if _pdf_renderer is None:
+            _pdf_renderer = PdfRenderer()
+            atexit.register(_pdf_renderer.close)
+        return _pdf_renderer
+
+
+def html_to_pdf(html_content: str, output_path: str, logo_path=None) -> None:
+    """
+    Prints already rendered briefing HTML to PDF through the shared browser.
     Args:
-        briefing (Dict): The structured briefing data.
+        html_content (str): HTML produced by generate_html.
         output_path (str): Destination path for the generated PDF.
-        logo_path (str): Optional path to a local logo image used in the HTML.
+        logo_path (str): Optional logo path used in the HTML; rewritten to an absolute file:// URL.
     """
-    html_content = generate_html(briefing, logo_path or "")
     with tempfile.TemporaryDirectory() as temp_dir:
         html_file_path = os.path.join(temp_dir, "briefing.html")
 
@@ -76,52 +157,135 @@ def generate_pdf(briefing: Dict, output_path: str, logo_path) -> None:
         with open(html_file_path, "w", encoding="utf-8") as f:
             f.write(html_content)
 
-        with sync_playwright() as p:
-            browser = p.chromium.launch()
-            page = browser.new_page()
-            page.goto(f"file://{html_file_path}", wait_until="load")
-            page.pdf(path=output_path, format="A4", print_background=True)
-            browser.close()
+        get_pdf_renderer().render(html_file_path, os.path.abspath(output_path))
+
+
+def generate_pdf(briefing: Dict, output_path: str, logo_path, html_content: Optional[str] = None) -> None:
+    """
+    Renders briefing as a PDF using a headless Chromium browser via Playwright.
+    Args:
+        briefing (Dict): The structured briefing data.
+        output_path (str): Destination path for the generated PDF.
+        logo_path (str): Optional path to a local logo image used in the HTML.
+        html_content (str): Optional pre-rendered HTML; avoids rendering the briefing twice.
+    """
+    if html_content is None:
+        html_content = generate_html(briefing, logo_path or "")
+    html_to_pdf(html_content, output_path, logo_path)
+
+
+def template_version() -> str:
+    """Hash of everything that shapes rendered output (templates, CSS, fonts); changes invalidate cached artifacts."""
+    return _template_version_cached()
+
+
+@lru_cache(maxsize=1)
+def _template_version_cached() -> str:
+    digest = hashlib.sha256(get_briefing_style().encode("utf-8"))
+    for name in sorted(os.listdir(TEMPLATES_DIR)):
+        with open(os.path.join(TEMPLATES_DIR, name), "rb") as f:
+            digest.update(name.encode("utf-8") + f.read())
+    return digest.hexdigest()[:16]
+
+
+def _write_compressed(files: Dict[str, str]) -> None:
+    for fmt in artifact_cache.COMPRESSED_FORMATS:
+        if fmt in files:
+            artifact_cache.write_compressed(files[fmt])
+
+
+def _record_metrics(timings: Dict[str, float], cache_result: str) -> None:
+    metrics.inc("cache_requests_total", cache="artifact", result=cache_result)
+    for fmt, ms in timings.items():
+        metrics.observe("briefing_render_seconds", ms / 1000, format=fmt, cache=cache_result)
+
+
+def write_briefing_outputs(
+    briefing: Dict,
+    markdown_path: Optional[str],
+    html_path: Optional[str],
+    pdf_path: Optional[str],
+    logo_path=None,
+    use_cache: bool = True
+) -> Dict[str, float]:
+    """
+    Output stage: renders the HTML once and writes Markdown, HTML and PDF from it.
+    Any path may be None to skip that format. Artifacts are content-addressed (see
+    artifact_cache): if this exact briefing was already rendered into the same output
+    directory, the existing files are linked into place instead of rendering again.
+    HTML also gets precompressed .gz/.br siblings in the cache, and the written files
+    are recorded in the output directory's briefing index (briefing_index). Timings and
+    the cache result are recorded in metrics.
+    Returns:
+        Dict[str, float]: Elapsed milliseconds per format ('markdown', 'html', 'pdf').
+    """
+    targets = {fmt: path for fmt, path in (("markdown", markdown_path), ("html", html_path), ("pdf", pdf_path)) if path}
+    if not targets:
+        return {}
+    output_dir = os.path.dirname(os.path.abspath(next(iter(targets.values()))))
+    logo_mtime = os.path.getmtime(logo_path) if logo_path and os.path.isfile(logo_path) else None
+    digest = artifact_cache.briefing_hash(briefing, template_version(), {"logo_path": str(logo_path or ""), "logo_mtime": logo_mtime})
+
+    timings = {}
+    cached = artifact_cache.lookup(output_dir, digest, targets) if use_cache else None
+    if cached:
+        print(f"Reusing cached artifacts for briefing {digest[:12]}")
+        for fmt, target in targets.items():
+            start = time.perf_counter()
+            artifact_cache.link_artifact(cached[fmt], target)
+            timings[fmt] = (time.perf_counter() - start) * 1000
+        artifact_cache.record(output_dir, digest, cached, targets)
+        _write_compressed(cached)
+        briefing_index.record_files(targets.values(), {"title": briefing.get("title"), "articles": len(briefing.get("articles", [])), "digest": digest})
+        _record_metrics(timings, "hit")
+        return timings
+
+    os.makedirs(artifact_cache.cache_dir(output_dir), exist_ok=True)
+    files = {fmt: artifact_cache.cached_path(output_dir, digest, fmt) for fmt in targets}
+    if "markdown" in files:
+        start = time.perf_counter()
+        generate_markdown(briefing, files["markdown"])
+        timings["markdown"] = (time.perf_counter() - start) * 1000
+
+    if "html" in files or "pdf" in files:
+        start = time.perf_counter()
+        html_content = generate_html(briefing, logo_path or "")
+        if "html" in files:
+            with open(files["html"], "w", encoding="utf-8") as html_file:
+                html_file.write(html_content)
+        timings["html"] = (time.perf_counter() - start) * 1000
+
+    if "pdf" in files:
+        start = time.perf_counter()
+        html_to_pdf(html_content, files["pdf"], logo_path)
+        timings["pdf"] = (time.perf_counter() - start) * 1000
+
+    for fmt, target in targets.items():
+        artifact_cache.link_artifact(files[fmt], target)
+    artifact_cache.record(output_dir, digest, files, targets)
+    _write_compressed(files)
+    briefing_index.record_files(targets.values(), {"title": briefing.get("title"), "articles": len(briefing.get("articles", [])), "digest": digest})
+    _record_metrics(timings, "miss")
+    return timings
 
 
 def generate_fund_performance_section(fund_data_path: str) -> Optional[Dict[str, Any]]:
     """Generate HTML/Markdown for fund performance data"""
     try:
-        import pandas as pd
-        df = pd.read_csv(fund_data_path)
-        
-        # Sort by discount % (best to worst performing)
-        df_sorted = df.sort_values('Discount (%)', ascending=False)
-        
-        # Categorize funds by discount levels
-        best_performers = df_sorted[df_sorted['Discount (%)'] > -30]  # Less than 15% discount
-        worst_performers = df_sorted[df_sorted['Discount (%)'] < -30]  # More than 30% discount
-        
-        # Get last modified time of the data file
-        last_modified_timestamp = os.path.getmtime(fund_data_path)
-        last_modified_dt = datetime.fromtimestamp(last_modified_timestamp)
-        last_modified_str = last_modified_dt.strftime('%Y-%m-%d %H:%M:%S')
-
-        return {
-            'best_performers': best_performers.to_dict('records'), # type: ignore
-            'worst_performers': worst_performers.to_dict('records'), # type: ignore
-            'last_updated': last_modified_str,
-        }
+        from fund_info import get_fund_performance
+        return get_fund_performance(fund_data_path)
     except Exception as e:
         print(f"Error processing fund data: {e}")
         return None
 
 
+# Vendored assets: briefings are rendered without touching the network (no web fonts / remote images)
+FONTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts")
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+FONT_WEIGHTS = {"Light": 300, "Regular": 400, "Medium": 500, "SemiBold": 600, "Bold": 700}
+FONT_MIME_TYPES = {".woff2": "font/woff2", ".woff": "font/woff", ".ttf": "font/ttf"}
 
-
-
-def generate_html(briefing: Dict, logo_path) -> str:
-    """Converts a structured briefing dict to a modern, professional HTML string for PDF output."""
-    logo_path = logo_path or ""
-    style = '''
-    <style>
-        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-        
+BRIEFING_CSS = '''
         * {
             margin: 0;
             padding: 0;
@@ -129,7 +293,7 @@ def generate_html(briefing: Dict, logo_path) -> str:
         }
         
         body {
-            font-family: 'Inter', 'Segoe UI', system-ui, sans-serif;
+            font-family: 'Inter', 'OpenSans', 'Segoe UI', system-ui, sans-serif;
             background: #ffffff;
             color: #1f2937;
             line-height: 1.6;
@@ -506,114 +670,102 @@ def generate_html(briefing: Dict, logo_path) -> str:
 
         .discount-positive { color: #059669; font-weight: 600; }
         .discount-negative { color: #dc2626; font-weight: 600; }
-    </style>
-    '''
-    
-    lines = []
-    lines.append(f"<html><head><title>{str(briefing.get('title', ''))}</title>{style}</head><body>")
-    lines.append('<div class="document-container">')
-    lines.append('<div class="watermark">DRAFT</div>')
-    
-    # Header
-    lines.append('<div class="header">')
-    lines.append('<div class="header-content">')
-    lines.append('<div class="logo-section">')
-    if logo_path:
-        lines.append(f'<img src="{str(logo_path)}" alt="Logo" />')
-    lines.append('</div>')
-    lines.append('<div class="document-info">')
-    lines.append(f'<div>Report Date: {str(briefing.get("date", ""))}</div>')
-    lines.append('</div>')
-    lines.append('</div>')
-    lines.append(f'<div class="briefing-title">{str(briefing.get("title", "Weekly Market Briefing"))}</div>')
-    lines.append(f'<div class="briefing-date">Week Ending {str(briefing.get("date", ""))}</div>')
-    lines.append('</div>')
-    
-    # Executive Summary
-    lines.append('<div class="executive-summary">')
-    lines.append('<h2>Weekly Summary</h2>')
-    lines.append(f'<p>{str(briefing.get("intro", ""))}</p>')
-    lines.append('</div>')
-
-    # Fund Data
-    if briefing.get("fund_performance"):
-        fund_data = briefing["fund_performance"]
-        
-        lines.append('<div class="fund-performance-section">')
-        lines.append('<h2 class="section-header">Listed Fund Performance Summary</h2>')
-        if fund_data.get("last_updated"):
-            lines.append(f'<p style="text-align:center; font-size: 12px; color: #6b7280; margin-bottom: 20px;">Fund data last updated: {fund_data["last_updated"]}</p>')
-
-        # Top/Bottom performers tables
-        if fund_data.get("best_performers"):
-            lines.append('<div class="fund-tables">')
-            lines.append('<div class="fund-table-container">')
-            lines.append('<h3>Smallest Discounts</h3>')
-            lines.append('<table class="fund-table">')
-            lines.append('<tr><th>Fund</th><th>Price</th><th>NAV</th><th>Discount</th></tr>')
-            for fund in fund_data["best_performers"][:5]:  # Top 5
-                lines.append(f'<tr><td>{fund["Fund Name"]}</td><td>£{fund["Close Price"]:.2f}</td><td>£{fund["NAV"]:.2f}</td><td class="discount-positive">{fund["Discount (%)"]:.1f}%</td></tr>')
-            lines.append('</table>')
-            lines.append('</div>')
-        
-        if fund_data.get("worst_performers"):
-            lines.append('<div class="fund-table-container">')
-            lines.append('<h3>Largest Discounts</h3>')
-            lines.append('<table class="fund-table">')
-            lines.append('<tr><th>Fund</th><th>Price</th><th>NAV</th><th>Discount</th></tr>')
-            for fund in fund_data["worst_performers"][:5]:  # Bottom 5
-                lines.append(f'<tr><td>{fund["Fund Name"]}</td><td>£{fund["Close Price"]:.2f}</td><td>£{fund["NAV"]:.2f}</td><td class="discount-negative">{fund["Discount (%)"]:.1f}%</td></tr>')
-            lines.append('</table>')
-            lines.append('</div>')
-            lines.append('</div>')
-    
-    # Articles Section
-    lines.append('<div class="articles-section">')
-    lines.append('<h2 class="section-header">COMPANY Intelligence</h2>')
-    
-    for i, article in enumerate(briefing["articles"], 1):
-        sentiment = str(article.get('sentiment', '')).lower()
-        sentiment_label = 'Neutral'
-        sentiment_class = 'sentiment-neutral'
-        
-        if sentiment in ['pos', 'positive']:
-            sentiment_class = 'sentiment-positive'
-            sentiment_label = 'Positive'
-        elif sentiment in ['neg', 'negative']:
-            sentiment_class = 'sentiment-negative'
-            sentiment_label = 'Negative'
-        
-        lines.append('<div class="article-card">')
-        lines.append('<div class="article-header">')
-        lines.append(f'<div class="article-number">{i}</div>')
-        lines.append(f'<h3 class="article-title">{str(article.get("title", ""))}</h3>')
-        lines.append('</div>')
-        
-        lines.append('<div class="article-meta">')
-        lines.append('<div class="meta-row">')
-        lines.append(f'<div class="meta-item"><span class="meta-label">Source:</span><span class="meta-value">{str(article.get("source", ""))}</span></div>')
-        lines.append(f'<div class="meta-item"><span class="meta-label">Published:</span><span class="meta-value">{str(article.get("date", ""))}</span></div>')
-        lines.append('</div>')
-        lines.append('</div>')
-        
-        lines.append(f'<div class="sentiment-indicator {sentiment_class}">{sentiment_label} Impact</div>')
-        lines.append(f'<div class="article-summary">{markdown.markdown(str(article.get("summary", "")))}</div>')  
-        lines.append(f'<a class="article-link" href="{str(article.get("url", ""))}" target="_blank">Read Full Article</a>')
-        lines.append('</div>')
-    
-    lines.append('</div>')
-    
-    # Footer
-    lines.append('<div class="footer">')
-    lines.append('<div class="footer-content">')
-    lines.append('<div>COMPANY</div>')
-    lines.append(f'<div>Generated on {str(briefing.get("date", ""))}</div>')
-    lines.append('</div>')
-    lines.append('<div class="footer-copyright">&copy; COMPANY</div>')
-    lines.append('</div>')
-    
-    lines.append('</div>')
-    lines.append('</body></html>')
-    return "\n".join(lines)
+'''
+
+
+def _font_face_css(fonts_dir: str = FONTS_DIR) -> str:
+    """
+    Builds @font-face rules for the font files in fonts/ (<Family>-<Weight>.woff2, e.g. the
+    vendored OpenSans-SemiBold.woff2, or Inter-SemiBold.woff2 if added, which is preferred),
+    inlined as base64 data URIs. Returns an empty string if no font files are present,
+    in which case the CSS falls back to system fonts.
+    """
+    rules = []
+    if not os.path.isdir(fonts_dir):
+        return ""
+    for filename in sorted(os.listdir(fonts_dir)):
+        stem, ext = os.path.splitext(filename)
+        family, _, weight_name = stem.partition("-")
+        if ext.lower() not in FONT_MIME_TYPES or weight_name not in FONT_WEIGHTS:
+            continue
+        with open(os.path.join(fonts_dir, filename), "rb") as f:
+            encoded = base64.b64encode(f.read()).decode("ascii")
+        rules.append(
+            f"@font-face {{ font-family: '{family}'; font-style: normal; font-weight: {FONT_WEIGHTS[weight_name]}; "
+            f"font-display: swap; src: url(data:{FONT_MIME_TYPES[ext.lower()]};base64,{encoded}); }}"
+        )
+    return "\n".join(rules)
+
+
+@lru_cache(maxsize=1)
+def get_briefing_style() -> str:
+    """Returns the briefing <style> block (fonts inlined), built once per process."""
+    return f"\n    <style>\n{_font_face_css()}\n{BRIEFING_CSS}    </style>\n    "
+
+
+@lru_cache(maxsize=16)
+def _inline_image_cached(abs_path: str, mtime: float) -> str:
+    mime_type = mimetypes.guess_type(abs_path)[0] or "image/png"
+    with open(abs_path, "rb") as f:
+        return f"data:{mime_type};base64,{base64.b64encode(f.read()).decode('ascii')}"
+
+
+def inline_image(path) -> str:
+    """Returns a data URI for a local image, or the path unchanged if the file does not exist."""
+    path = str(path or "")
+    if not path or not os.path.isfile(path):
+        return path
+    abs_path = os.path.abspath(path)
+    return _inline_image_cached(abs_path, os.path.getmtime(abs_path))
+
+
+def sentiment_badge(sentiment) -> Tuple[str, str]:
+    """Maps an article sentiment to its (CSS class, label) pair."""
+    sentiment = str(sentiment).lower()
+    if sentiment in ['pos', 'positive']:
+        return 'sentiment-positive', 'Positive'
+    if sentiment in ['neg', 'negative']:
+        return 'sentiment-negative', 'Negative'
+    return 'sentiment-neutral', 'Neutral'
+
+
+_markdown_local = threading.local()
+
+
+def render_summary(summary) -> Markup:
+    """
+    Converts an article summary from Markdown to HTML with a reusable, per-thread converter
+    (markdown.Markdown instances are not thread-safe, but are cheap to reset).
+    """
+    converter = getattr(_markdown_local, "converter", None)
+    if converter is None:
+        converter = _markdown_local.converter = markdown.Markdown()
+    return Markup(converter.reset().convert(str(summary)))
 
 
+@lru_cache(maxsize=1)
+def get_template_env() -> Environment:
+    """Jinja2 environment for the briefing templates; templates are compiled once and cached."""
+    env = Environment(
+        loader=FileSystemLoader(TEMPLATES_DIR),
+        autoescape=select_autoescape(["html"]),
+        trim_blocks=True,
+        lstrip_blocks=True,
+        auto_reload=False,
+    )
+    env.globals.update(sentiment_badge=sentiment_badge, render_summary=render_summary)
+    return env
+
+
+def render_markdown(briefing: Dict) -> str:
+    """Renders a structured briefing dict to a Markdown string."""
+    return get_template_env().get_template("briefing.md").render(briefing=briefing)
+
+
+def generate_html(briefing: Dict, logo_path) -> str:
+    """Converts a structured briefing dict to a modern, professional HTML string for PDF output."""
+    return get_template_env().get_template("briefing.html").render(
+        briefing=briefing,
+        style=Markup(get_briefing_style()),
+        logo_src=inline_image(logo_path) if logo_path else "",
+    )
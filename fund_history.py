@@ -0,0 +1,186 @@
+"""
+Append-only columnar history of fund close price / NAV, keyed by ticker and date.
+
+Layout: data/fund_history/segment-<ns>.npz, each segment holding parallel NumPy arrays
+(ticker, date, close, nav). Appends write a new segment; compact() merges them into one.
+Reads concatenate the segments once per change (cached per process), keep the last value per
+(ticker, date) and pivot to business-day x ticker matrices, so discount analytics run
+vectorised over the whole universe.
+"""
+
+import os
+import tempfile
+import threading
+import time
+import warnings
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+HISTORY_DIR = os.path.join("data", "fund_history")
+SEGMENT_PREFIX = "segment-"
+FFILL_LIMIT = 5  # business days a missing print is carried forward
+WEEK = 5
+MONTH = 21
+YEAR = 252
+
+_cache: Dict[str, Dict[str, Any]] = {}
+_cache_lock = threading.Lock()
+
+
+class FundHistoryStore:
+    """Append-only store of daily (ticker, date, close, nav) rows."""
+
+    def __init__(self, directory: str = HISTORY_DIR):
+        self.directory = directory
+
+    def segments(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(".npz")
+        )
+
+    def _signature(self, segments: List[str]):
+        return tuple((path, os.stat(path).st_mtime_ns, os.stat(path).st_size) for path in segments)
+
+    def _write_segment(self, tickers, dates, close, nav, name: Optional[str] = None) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        name = name or f"{SEGMENT_PREFIX}{time.time_ns()}.npz"
+        path = os.path.join(self.directory, name)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, ticker=np.asarray(tickers, dtype=str), date=np.asarray(dates, dtype="datetime64[D]"),
+                     close=np.asarray(close, dtype="f8"), nav=np.asarray(nav, dtype="f8"))
+        os.replace(tmp_path, path)
+        return path
+
+    def append(self, history: pd.DataFrame) -> int:
+        """
+        Append long-format rows (Ticker, Date, Close Price, NAV) as a new segment.
+        Later appends win for the same (ticker, date). Returns the number of rows written.
+        """
+        if history is None or history.empty:
+            return 0
+        df = history.dropna(subset=["Ticker", "Date"])
+        if df.empty:
+            return 0
+        self._write_segment(
+            df["Ticker"].astype(str).to_numpy(),
+            pd.to_datetime(df["Date"]).to_numpy().astype("datetime64[D]"),
+            pd.to_numeric(df["Close Price"], errors="coerce").to_numpy(),
+            pd.to_numeric(df["NAV"], errors="coerce").to_numpy(),
+        )
+        return len(df)
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Load and cache the store: long-format rows plus wide close/nav/discount matrices
+        (business-day index x ticker, gaps forward-filled up to FFILL_LIMIT days).
+        """
+        segments = self.segments()
+        signature = self._signature(segments)
+        key = os.path.abspath(self.directory)
+        with _cache_lock:
+            cached = _cache.get(key)
+            if cached and cached["signature"] == signature:
+                return cached
+
+            parts = {"ticker": [], "date": [], "close": [], "nav": []}
+            for path in segments:
+                with np.load(path, allow_pickle=False) as data:
+                    for column in parts:
+                        parts[column].append(data[column])
+            if segments:
+                rows = pd.DataFrame({
+                    "Ticker": np.concatenate(parts["ticker"]),
+                    "Date": np.concatenate(parts["date"]).astype("datetime64[ns]"),
+                    "Close Price": np.concatenate(parts["close"]),
+                    "NAV": np.concatenate(parts["nav"]),
+                })
+                rows = rows.drop_duplicates(subset=["Ticker", "Date"], keep="last").sort_values(["Date", "Ticker"])
+            else:
+                rows = pd.DataFrame(columns=["Ticker", "Date", "Close Price", "NAV"])
+
+            loaded = {"signature": signature, "rows": rows.reset_index(drop=True)}
+            loaded.update(_pivot(loaded["rows"]))
+            _cache[key] = loaded
+            return loaded
+
+    def compact(self) -> None:
+        """Merge all segments into a single segment."""
+        segments = self.segments()
+        if len(segments) < 2:
+            return
+        rows = self.load()["rows"]
+        self._write_segment(
+            rows["Ticker"].to_numpy(), rows["Date"].to_numpy().astype("datetime64[D]"),
+            rows["Close Price"].to_numpy(), rows["NAV"].to_numpy(),
+            name=f"{SEGMENT_PREFIX}{time.time_ns()}.npz",
+        )
+        for path in segments:
+            os.remove(path)
+
+    def discount_analytics(self, window: int = MONTH, lookback: int = YEAR) -> pd.DataFrame:
+        """
+        Per-ticker discount analytics as of the latest date in the store:
+        'Discount (%)', rolling 'Discount Mean', 'Discount Z-Score' (vs the rolling window),
+        '1w Change' / '1m Change' (percentage points) and 'Percentile Rank' (0-100) of the
+        current discount within the ticker's own last `lookback` days.
+        """
+        discount = self.load()["discount"]
+        columns = ["Discount (%)", "Discount Mean", "Discount Z-Score", "1w Change", "1m Change", "Percentile Rank"]
+        if discount.empty:
+            return pd.DataFrame(columns=columns)
+
+        values = discount.to_numpy()
+        current = values[-1]
+        tail = values[-window:]
+        with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+            warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN columns (tickers with no recent prints)
+            mean = np.nanmean(tail, axis=0)
+            std = np.nanstd(tail, axis=0, ddof=1)
+            zscore = np.where(std > 0, (current - mean) / std, np.nan)
+        week_ago = values[-1 - WEEK] if len(values) > WEEK else np.full(values.shape[1], np.nan)
+        month_ago = values[-1 - MONTH] if len(values) > MONTH else np.full(values.shape[1], np.nan)
+        history = values[-lookback:]
+        valid = ~np.isnan(history)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rank = np.where(valid.sum(axis=0) > 0,
+                            ((history <= current) & valid).sum(axis=0) / valid.sum(axis=0) * 100, np.nan)
+
+        result = pd.DataFrame({
+            "Discount (%)": current,
+            "Discount Mean": mean,
+            "Discount Z-Score": zscore,
+            "1w Change": current - week_ago,
+            "1m Change": current - month_ago,
+            "Percentile Rank": np.where(np.isnan(current), np.nan, rank),
+        }, index=discount.columns)
+        result.index.name = "Ticker"
+        return result[columns]
+
+
+def _pivot(rows: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """Wide business-day x ticker matrices for close, nav and discount (%)."""
+    if rows.empty:
+        empty = pd.DataFrame()
+        return {"close": empty, "nav": empty, "discount": empty}
+    index = pd.bdate_range(rows["Date"].min(), rows["Date"].max())
+    close = rows.pivot(index="Date", columns="Ticker", values="Close Price").reindex(index).ffill(limit=FFILL_LIMIT)
+    nav = rows.pivot(index="Date", columns="Ticker", values="NAV").reindex(index).ffill(limit=FFILL_LIMIT)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        discount = (close - nav) / nav.where(nav != 0) * 100
+    return {"close": close, "nav": nav, "discount": discount}
+
+
+def get_discount_analytics(directory: str = HISTORY_DIR) -> Dict[str, Dict[str, float]]:
+    """Discount analytics keyed by ticker ({} when there is no history yet)."""
+    store = FundHistoryStore(directory)
+    if not store.segments():
+        return {}
+    analytics = store.discount_analytics()
+    return analytics.astype(object).where(analytics.notna(), None).to_dict("index")
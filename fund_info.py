@@ -1,9 +1,150 @@
-#import refinitiv.data as rd
 import pandas as pd
+import json
 import os
-from datetime import datetime, timedelta
+import threading
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional
+from market_data import DEFAULT_FIELDS, MarketDataProvider, get_provider, latest_discounts
+from fund_history import FundHistoryStore, get_discount_analytics
 
-def is_fund_data_current(file_path: str = "data/fund_analysis_results.csv", max_age_hours: int = 6) -> bool:
+FUND_DATA_PATH = "data/fund_analysis_results.csv"
+FUND_TICKERS_PATH = "data/listed_funds_tickers.csv"
+DISCOUNT_THRESHOLD = -30  # Funds trading above this discount (%) are "best", below it "worst"
+
+# Process-wide cache of parsed fund data, keyed by path and invalidated on mtime/size change
+_fund_data_cache: Dict[str, Dict[str, Any]] = {}
+_fund_data_lock = threading.Lock()
+
+
+def _file_signature(file_path: str):
+    stat = os.stat(file_path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def metadata_path(file_path: str = FUND_DATA_PATH) -> str:
+    """Path of the freshness sidecar written next to the fund data CSV."""
+    return f"{file_path}.meta.json"
+
+
+def write_fund_metadata(df: pd.DataFrame, file_path: str = FUND_DATA_PATH) -> Dict[str, Any]:
+    """
+    Write the freshness sidecar (latest data date, row count) for a fund data CSV,
+    stamped with the CSV's mtime/size so stale sidecars are detected.
+    """
+    mtime_ns, size = _file_signature(file_path)
+    latest = pd.to_datetime(df['Date']).max() if not df.empty else None
+    meta = {
+        "latest_date": latest.strftime("%Y-%m-%d") if latest is not None and not pd.isna(latest) else None,
+        "rows": int(len(df)),
+        "mtime_ns": mtime_ns,
+        "size": size,
+    }
+    tmp_path = f"{metadata_path(file_path)}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, metadata_path(file_path))
+    return meta
+
+
+def read_fund_metadata(file_path: str = FUND_DATA_PATH) -> Optional[Dict[str, Any]]:
+    """
+    Return freshness metadata for the fund data CSV without parsing it when the sidecar
+    is up to date; otherwise parse once (via the cache) and rewrite the sidecar.
+    """
+    if not os.path.exists(file_path):
+        return None
+    try:
+        with open(metadata_path(file_path), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if (meta.get("mtime_ns"), meta.get("size")) == _file_signature(file_path):
+            return meta
+    except (OSError, ValueError):
+        pass
+    fund_data = load_fund_data(file_path)
+    if fund_data is None:
+        return None
+    try:
+        return write_fund_metadata(fund_data["df"], file_path)
+    except OSError:
+        return {"latest_date": fund_data["latest_date"], "rows": len(fund_data["df"])}
+
+
+def load_fund_data(file_path: str = FUND_DATA_PATH) -> Optional[Dict[str, Any]]:
+    """
+    Parse the fund data CSV once per change and cache the derived tables.
+    Returns None if the file does not exist. The returned frames/records are shared
+    across callers and must be treated as read-only.
+
+    Returns:
+        dict: 'df' (sorted by discount, best first), 'best_performers' / 'worst_performers'
+        (lists of records), 'latest_date' (YYYY-MM-DD or None), 'last_updated' (file mtime).
+    """
+    if not os.path.exists(file_path):
+        return None
+    key = os.path.abspath(file_path)
+    signature = _file_signature(file_path)
+    with _fund_data_lock:
+        cached = _fund_data_cache.get(key)
+        if cached and cached["signature"] == signature:
+            return cached
+
+        df = pd.read_csv(file_path)
+        df_sorted = df.sort_values('Discount (%)', ascending=False) if not df.empty else df
+        latest = pd.to_datetime(df['Date']).max() if not df.empty else None
+        fund_data = {
+            "signature": signature,
+            "df": df_sorted,
+            "records": df_sorted.to_dict('records'),
+            "best_performers": df_sorted[df_sorted['Discount (%)'] > DISCOUNT_THRESHOLD].to_dict('records') if not df.empty else [],
+            "worst_performers": df_sorted[df_sorted['Discount (%)'] < DISCOUNT_THRESHOLD].to_dict('records') if not df.empty else [],
+            "latest_date": latest.strftime("%Y-%m-%d") if latest is not None and not pd.isna(latest) else None,
+            "last_updated": datetime.fromtimestamp(signature[0] / 1e9).strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        _fund_data_cache[key] = fund_data
+        return fund_data
+
+
+ANALYTICS_FIELDS = ["Discount Z-Score", "1w Change", "1m Change", "Percentile Rank"]
+
+
+def with_discount_analytics(records: list, analytics: Dict[str, Dict[str, Any]]) -> list:
+    """Copies of fund records with history-based discount analytics (see fund_history) added by ticker."""
+    if not analytics:
+        return list(records)
+    merged = []
+    for record in records:
+        metrics = analytics.get(record.get('Ticker'), {})
+        merged.append({**record, **{field: metrics.get(field) for field in ANALYTICS_FIELDS}})
+    return merged
+
+
+def get_fund_performance(file_path: str = FUND_DATA_PATH) -> Optional[Dict[str, Any]]:
+    """Fund performance section for briefings: best/worst performers and last update time."""
+    fund_data = load_fund_data(file_path)
+    if fund_data is None:
+        return None
+    analytics = get_discount_analytics()
+    return {
+        'best_performers': with_discount_analytics(fund_data['best_performers'], analytics),
+        'worst_performers': with_discount_analytics(fund_data['worst_performers'], analytics),
+        'last_updated': fund_data['last_updated'],
+    }
+
+
+def acceptable_data_date(today: Optional[date] = None) -> date:
+    """Oldest data date still considered current: the previous business day (Friday over weekends)."""
+    today = today or datetime.now().date()
+    # If it's weekend, accept Friday data; if Monday, accept Friday data
+    weekday = today.weekday()
+    if weekday == 0:  # Monday
+        return today - timedelta(days=3)  # Friday
+    elif weekday == 6:  # Sunday
+        return today - timedelta(days=2)  # Friday
+    elif weekday == 5:  # Saturday
+        return today - timedelta(days=1)  # Friday
+    return today - timedelta(days=1)  # Tue-Fri: previous day
+
+def is_fund_data_current(file_path: str = FUND_DATA_PATH, max_age_hours: int = 6) -> bool:
     """
     Check if fund data file exists and is recent enough.
     
@@ -27,29 +168,15 @@ def is_fund_data_current(file_path: str = "data/fund_analysis_results.csv", max_
             print(f"Fund data is {time_diff.total_seconds()/3600:.1f} hours old - refresh needed")
             return False
         
-        # Check if data contains today's or recent business day's data
-        df = pd.read_csv(file_path)
-        if df.empty:
+        # Check if data contains today's or recent business day's data (sidecar, no CSV parse)
+        meta = read_fund_metadata(file_path)
+        if not meta or not meta.get("rows") or not meta.get("latest_date"):
             print("Fund data file is empty - refresh needed")
             return False
         
-        # Get the most recent date in the data
-        latest_data_date = pd.to_datetime(df['Date']).max()
-        
         # Check if data is from today or last business day
-        today = datetime.now().date()
-        data_date = latest_data_date.date()
-        
-        # If it's weekend, accept Friday data; if Monday, accept Friday data
-        weekday = today.weekday()
-        if weekday == 0:  # Monday
-            acceptable_date = today - timedelta(days=3)  # Friday
-        elif weekday == 6:  # Sunday
-            acceptable_date = today - timedelta(days=2)  # Friday
-        elif weekday == 5:  # Saturday
-            acceptable_date = today - timedelta(days=1)  # Friday
-        else:  # Tue-Fri
-            acceptable_date = today - timedelta(days=1)  # Previous day
+        data_date = datetime.strptime(meta["latest_date"], "%Y-%m-%d").date()
+        acceptable_date = acceptable_data_date()
         
         if data_date >= acceptable_date:
             print(f"Fund data is current (from {data_date}) - no refresh needed")
@@ -62,98 +189,85 @@ def is_fund_data_current(file_path: str = "data/fund_analysis_results.csv", max_
         print(f"Error checking fund data currency: {e} - refresh needed")
         return False
 
-def refresh_fund_data(force: bool = False): 
+def stale_tickers(tickers, file_path: str = FUND_DATA_PATH) -> list:
+    """Tickers with no row in the fund data file, or whose latest row is older than acceptable_data_date()."""
+    fund_data = load_fund_data(file_path)
+    if fund_data is None or fund_data["df"].empty:
+        return list(tickers)
+    latest = pd.to_datetime(fund_data["df"].set_index("Ticker")["Date"]).dt.date.to_dict()
+    cutoff = acceptable_data_date()
+    return [ticker for ticker in tickers if ticker not in latest or latest[ticker] < cutoff]
+
+def refresh_fund_data(force: bool = False, provider: Optional[MarketDataProvider] = None,
+                      tickers_path: str = FUND_TICKERS_PATH, output_path: str = FUND_DATA_PATH,
+                      history_store: Optional[FundHistoryStore] = None):
     """
     Refresh fund data only if needed or forced.
+    Only stale tickers are requested, with price and NAV fetched together in batched
+    provider calls; fresh rows from the existing file are kept.
     
     Args:
-        force: If True, refresh regardless of current data age
+        force: If True, refresh every ticker regardless of current data age
+        provider: Market data provider (default: get_provider(), i.e. Refinitiv or MARKET_DATA_PROVIDER)
+        tickers_path: CSV of 'Investment trust name', 'Ticker'
+        output_path: Fund analysis results CSV to update
+        history_store: Store the fetched daily history is appended to (default: data/fund_history)
     """
     # Check if refresh is needed
-    if not force and is_fund_data_current():
+    if not force and is_fund_data_current(output_path):
         print("✓ Fund data is already current")
         return True
     
     print("Refreshing fund data...")
+    provider = provider or get_provider()
     
     try:
-        rd.open_session()
-
         # Read the CSV file
-        funds_df = pd.read_csv("data/listed_funds_tickers.csv")
-
-        fields_nav   = "TR.NETASSETVAL"
-        fields_price = "TR.CLOSEPRICE"
+        funds_df = pd.read_csv(tickers_path)
+        names = dict(zip(funds_df['Ticker'], funds_df['Investment trust name']))
+        tickers = list(names)
+        to_refresh = tickers if force else stale_tickers(tickers, output_path)
+        if not to_refresh:
+            print("✓ All tickers are current")
+            return True
+        print(f"Requesting {len(to_refresh)} of {len(tickers)} tickers from {provider.name}")
 
         # Get data from last 5 business days to ensure we get the most recent available
         end_date = datetime.now()
         start_date = end_date - timedelta(days=7)
 
-        results = []
-
-        for index, row in funds_df.iterrows():
-            fund_name = row['Investment trust name']
-            ticker = row['Ticker']
-            
-            try:
-                # Get recent NAV and price data
-                nav = rd.get_history(ticker, fields=fields_nav, interval="daily", 
-                                start=start_date.strftime("%Y-%m-%d"), 
-                                end=end_date.strftime("%Y-%m-%d"))
-                px = rd.get_history(ticker, fields=fields_price, interval="daily", 
-                                start=start_date.strftime("%Y-%m-%d"), 
-                                end=end_date.strftime("%Y-%m-%d"))
-                
-                if px is not None and nav is not None and not px.empty and not nav.empty:
-                    data = px.join(nav, how="inner")
-                    
-                    if not data.empty:
-                        price_col = px.columns[0]
-                        nav_col = nav.columns[0]
-                        
-                        # Get latest available values and their date
-                        latest_price = data[price_col].iloc[-1]
-                        latest_nav = data[nav_col].iloc[-1]
-                        latest_date = data.index[-1]
-                        discount_pct = (latest_price - latest_nav) / latest_nav * 100
-                        
-                        results.append({
-                            'Fund Name': fund_name,
-                            'Ticker': ticker,
-                            'Date': pd.to_datetime(latest_date).strftime("%Y-%m-%d"),
-                            'Close Price': latest_price,
-                            'NAV': latest_nav,
-                            'Discount (%)': discount_pct
-                        })
-                    
-            except Exception as e:
-                print(f"✗ {fund_name}: Error - {str(e)}")
-
-        # Create results DataFrame
-        results_df = pd.DataFrame(results)
+        with provider:
+            history = provider.get_history(to_refresh, DEFAULT_FIELDS, start_date, end_date)
+        try:
+            (history_store or FundHistoryStore()).append(history)
+        except Exception as e:
+            print(f"✗ Could not append fund history: {e}")
+        results_df = latest_discounts(history, names)
+        for ticker in sorted(set(to_refresh) - set(results_df['Ticker'])):
+            print(f"✗ {names[ticker]}: No price/NAV data returned")
 
         # Save to CSV only if we have new data
         if not results_df.empty:
+            existing = load_fund_data(output_path)
+            if existing is not None and not existing["df"].empty:
+                kept = existing["df"][~existing["df"]['Ticker'].isin(results_df['Ticker'])]
+                results_df = pd.concat([kept, results_df], ignore_index=True)
             # Ensure directory exists
-            os.makedirs("data", exist_ok=True)
-            results_df.to_csv("data/fund_analysis_results.csv", index=False)
-            print(f"✓ Fund data refreshed successfully - {len(results)} funds updated")
+            os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+            results_df.to_csv(output_path, index=False)
+            write_fund_metadata(results_df, output_path)
+            print(f"✓ Fund data refreshed successfully - {len(results_df)} funds, {provider.calls} provider calls")
         else:
             print("✗ No new fund data was fetched. Existing data has been preserved.")
-        
-        rd.close_session()
         return True
         
     except Exception as e:
         print(f"✗ Error refreshing fund data: {e}")
-        try:
-            rd.close_session()
-        except:
-            pass
         return False
 
 if __name__ == "__main__":
     # Allow forcing refresh via command line argument
     import sys
     force_refresh = "--force" in sys.argv
-    refresh_fund_data(force=force_refresh)
\ No newline at end of file
+    provider_spec = sys.argv[sys.argv.index("--provider") + 1] if "--provider" in sys.argv else None
+    refresh_fund_data(force=force_refresh, provider=get_provider(provider_spec))
\ No newline at end of file
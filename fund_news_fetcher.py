@@ -2,21 +2,25 @@ import requests
 import datetime
 import pandas as pd
 import json
+import os
 from time import sleep
-from config import MARKETAUX_API_TOKEN
+from typing import Optional
+import metrics
+from config import get_api_key
+from news_store import FUND_NEWS_PATH, NewsStore, get_news_store
 
 
-API_TOKEN = MARKETAUX_API_TOKEN
 BASE_URL = "https://api.marketaux.com/v1/entity/search"
 
 def symbol_exists(symbol: str) -> bool:
     """
     Return True if *symbol* is recognised by MarketAux, else False.
     """
-    if not API_TOKEN:
+    api_token = get_api_key("MARKETAUX_API_TOKEN")
+    if not api_token:
         raise RuntimeError("Set MARKETAUX_TOKEN env-var or hard-code your token")
     params = {
-        "api_token": API_TOKEN,
+        "api_token": api_token,
         "symbols": symbol.upper(),
         "limit": 1
     }
@@ -75,7 +79,8 @@ def save_results_to_csv(results: dict, output_path: str = "data/marketaux_check_
     except Exception as e:
         print(f"Error saving results: {e}")
 
-def fetch_news_for_funds(csv_path: str = "data/listed_funds_symbols_news.csv", output_path: str = "data/marketaux_news_results.json", batch_size: int = 3, delay: float = 1.0):
+def fetch_news_for_funds(csv_path: str = "data/listed_funds_symbols_news.csv", output_path: str = FUND_NEWS_PATH, batch_size: int = 3, delay: float = 1.0,
+                         store: Optional[NewsStore] = None):
     """
     Fetch news for all tickers in the CSV using the MarketAux API and save to a JSON file.
     Only new articles (by uuid or url) are added if the file already exists.
@@ -85,6 +90,7 @@ def fetch_news_for_funds(csv_path: str = "data/listed_funds_symbols_news.csv", o
         output_path: Path to save the news results JSON
         batch_size: Number of tickers per API request (default 50)
         delay: Seconds to wait between requests to avoid rate limits
+        store: News store the new articles are indexed into (default: the app store, when writing the default output_path)
     """
     try:
         # Load existing news if present
@@ -112,18 +118,20 @@ def fetch_news_for_funds(csv_path: str = "data/listed_funds_symbols_news.csv", o
                 fund_map[ticker.upper()] = fund_name
 
         tickers = list(fund_map.keys())
+        api_token = get_api_key("MARKETAUX_API_TOKEN")
         print(f"Fetching news for {len(tickers)} tickers in batches of {batch_size}...")
         new_articles = []
         for i in range(0, len(tickers), batch_size):
             batch = tickers[i:i+batch_size]
             params = {
-                "api_token": API_TOKEN,
+                "api_token": api_token,
                 "symbols": ','.join(batch),
                 "filter_entities": "true",
                 "limit": 50
             }
             try:
-                resp = requests.get("https://api.marketaux.com/v1/news/all", params=params, timeout=15)
+                with metrics.timer("upstream_request_seconds", service="marketaux"):
+                    resp = requests.get("https://api.marketaux.com/v1/news/all", params=params, timeout=15)
                 resp.raise_for_status()
                 news_batch = resp.json().get("data", [])
                 print(f"Batch {i//batch_size+1}: {len(news_batch)} articles fetched.")
@@ -159,6 +167,12 @@ def fetch_news_for_funds(csv_path: str = "data/listed_funds_symbols_news.csv", o
         with open(output_path, "w", encoding="utf-8") as f:
             json.dump(all_news, f, ensure_ascii=False, indent=2)
         print(f"All news saved to {output_path}")
+        # Index the new articles so the web UI can query them without re-reading the file
+        if store is None and os.path.abspath(output_path) == os.path.abspath(FUND_NEWS_PATH):
+            store = get_news_store()
+        if store is not None:
+            store.upsert(new_articles)
+            store.mark_synced(output_path)
         return len(new_articles)
     except Exception as e:
         print(f"Error fetching news: {e}")
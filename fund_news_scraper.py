@@ -5,6 +5,7 @@ from time import sleep
 import requests
 from bs4 import BeautifulSoup
 from readability import Document
+from news_store import get_news_store
 
 INPUT_PATH = 'data/marketaux_news_results.json'
 OUTPUT_PATH = 'data/marketaux_news_with_content.json'
@@ -70,6 +71,7 @@ def main():
     with open(OUTPUT_PATH, 'w', encoding='utf-8') as f:
         json.dump(enriched, f, ensure_ascii=False, indent=2)
     print(f"Saved {len(enriched)} articles with content to {OUTPUT_PATH}")
+    get_news_store().sync_file(OUTPUT_PATH)  # the web UI reads the store, not this file
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,167 @@
+"""
+Pre-ingested local corpus of NewsAPI candidate articles.
+
+The scheduler (scheduler.py) periodically fetches NewsAPI articles for the configured
+keywords, enriches truncated content with the extraction pipeline, scores sentiment and
+deduplicates, and stores the result in data/candidates.json. /generate and the CLI then
+read candidates from this corpus instead of calling NewsAPI, falling back to a live fetch
+when the corpus is missing, stale or was not ingested for the requested keywords.
+"""
+
+import asyncio
+import json
+import os
+import re
+import tempfile
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from deduplicator import deduplicate_articles
+from news_store import NEWSAPI, NewsStore, get_news_store
+from scorer import contains_relevant_keywords, score_article
+
+CANDIDATES_PATH = "data/candidates.json"
+INGEST_DAYS = 7  # look-back window fetched on each ingestion
+RETENTION_DAYS = 14  # candidates older than this are dropped from the corpus
+MAX_CORPUS_AGE_HOURS = 2  # older corpora are considered stale and bypassed
+MAX_ENRICH_PER_RUN = 25
+TRUNCATED_RE = re.compile(r"\[\+\d+ chars\]\s*$")
+
+
+def load_corpus(path: str = CANDIDATES_PATH) -> Optional[Dict]:
+    """Corpus dict (ingested_at, keywords, articles) or None if not ingested yet."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def save_corpus(corpus: Dict, path: str = CANDIDATES_PATH) -> None:
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(corpus, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _published(article: Dict) -> Optional[datetime]:
+    value = article.get("publishedAt") or article.get("published_at")
+    if not value:
+        return None
+    try:
+        published = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return published if published.tzinfo else published.replace(tzinfo=timezone.utc)
+
+
+def is_truncated(article: Dict) -> bool:
+    """NewsAPI truncates content to ~200 chars and appends '[+N chars]'."""
+    content = article.get("content") or ""
+    return not content or bool(TRUNCATED_RE.search(content))
+
+
+def enrich_articles(articles: List[Dict], limit: int = MAX_ENRICH_PER_RUN) -> int:
+    """
+    Replace truncated content with the full text from the extraction pipeline, for at
+    most `limit` articles. Returns the number enriched.
+    """
+    pending = [a for a in articles if a.get("url") and is_truncated(a) and not a.get("enrich_failed")][:limit]
+    if not pending:
+        return 0
+    from news_scraper.extractor import get_full_article
+
+    async def run() -> int:
+        enriched = 0
+        for article in pending:
+            try:
+                extracted = await get_full_article(article["url"])
+            except Exception as e:
+                print(f"Error extracting {article['url']}: {e}")
+                extracted = None
+            if extracted and extracted.get("text"):
+                article["content"] = extracted["text"]
+                article["content_layer"] = extracted.get("layer")
+                enriched += 1
+            else:
+                article["enrich_failed"] = True  # don't retry on every run
+        return enriched
+
+    return asyncio.run(run())
+
+
+def ingest_news(keywords: Optional[List[str]] = None, from_days_ago: int = INGEST_DAYS,
+                path: str = CANDIDATES_PATH, enrich: bool = True, store: Optional[NewsStore] = None) -> int:
+    """
+    Fetch NewsAPI articles for the keywords, merge them into the corpus (by URL), enrich,
+    score and deduplicate. The new articles that survive deduplication (and retention) are
+    also added to the news store's search index (default: the app store, when writing the
+    default corpus path). Returns the number of those new candidates.
+    """
+    from config import get_keywords
+    from news_fetcher import fetch_articles
+
+    keywords = keywords or get_keywords()
+    fetched = fetch_articles(keywords, from_days_ago=from_days_ago)
+
+    corpus = load_corpus(path) or {}
+    existing = corpus.get("articles", []) if corpus.get("keywords") == keywords else []
+    known_urls = {a.get("url") for a in existing}
+    new_articles = [a for a in fetched if a.get("url") and a.get("url") not in known_urls]
+
+    cutoff = datetime.now(timezone.utc) - timedelta(days=RETENTION_DAYS)
+    articles = [a for a in existing + new_articles if (_published(a) or cutoff) >= cutoff]
+    if enrich:
+        enriched = enrich_articles(new_articles)
+        print(f"Enriched {enriched} of {len(new_articles)} new articles")
+    for article in new_articles:
+        article["sentiment"] = score_article(article)
+    articles = deduplicate_articles(articles)
+    kept_urls = {a.get("url") for a in articles}
+    new_articles = [a for a in new_articles if a["url"] in kept_urls]
+    articles.sort(key=lambda a: a.get("publishedAt") or "", reverse=True)
+
+    save_corpus({
+        "ingested_at": datetime.now().isoformat(timespec="seconds"),
+        "keywords": keywords,
+        "articles": articles,
+    }, path)
+    print(f"Candidate corpus: {len(articles)} articles ({len(new_articles)} new)")
+    if store is None and os.path.abspath(path) == os.path.abspath(CANDIDATES_PATH):
+        store = get_news_store()
+    if store is not None:
+        store.upsert(new_articles, kind=NEWSAPI)
+    return len(new_articles)
+
+
+def load_candidates(keywords: Optional[List[str]] = None, from_days_ago: int = 3,
+                    path: str = CANDIDATES_PATH, max_age_hours: float = MAX_CORPUS_AGE_HOURS) -> Optional[List[Dict]]:
+    """
+    Candidates from the corpus published within from_days_ago (and, for custom keywords,
+    mentioning one of them). None if the corpus cannot answer the request: missing, older
+    than max_age_hours, or custom keywords that were not part of the ingestion.
+    """
+    corpus = load_corpus(path)
+    if not corpus or not corpus.get("ingested_at"):
+        return None
+    if datetime.now() - datetime.fromisoformat(corpus["ingested_at"]) > timedelta(hours=max_age_hours):
+        return None
+    if keywords and not {k.lower() for k in keywords} <= {k.lower() for k in corpus.get("keywords", [])}:
+        return None
+    if from_days_ago > INGEST_DAYS:
+        return None
+
+    since = datetime.combine(datetime.now().date() - timedelta(days=from_days_ago), datetime.min.time(), timezone.utc)
+    candidates = []
+    for article in corpus.get("articles", []):
+        published = _published(article)
+        if published is not None and published < since:
+            continue
+        if keywords:
+            text = f"{article.get('title') or ''} {article.get('description') or ''} {article.get('content') or ''}"
+            if not contains_relevant_keywords(text, keywords):
+                continue
+        candidates.append(article)
+    return candidates
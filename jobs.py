@@ -0,0 +1,177 @@
+"""
+Local background job runner for briefing generation.
+
+Jobs run on a thread pool and are persisted in a SQLite job table (data/jobs.db), so the
+web app can accept a generation request, return a job id immediately and let the browser
+poll /jobs/<id>/status for per-stage progress. Each job records its owner (host and pid of
+the process running it); a runner starting up marks failed ("interrupted") only the queued
+or running jobs whose owner process on this host has exited, so several processes (e.g.
+gunicorn workers) can share the job table. Params are stored for display and resuming, so
+jobs take ids (screening run, news article ids) rather than full article lists.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+JOBS_DB_PATH = "data/jobs.db"
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    stage TEXT,
+    stages TEXT NOT NULL DEFAULT '[]',
+    params TEXT NOT NULL DEFAULT '{}',
+    result TEXT,
+    error TEXT,
+    owner TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+)
+"""
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="milliseconds")
+
+
+def process_owner() -> str:
+    """This process as an owner id: <host>:<pid>."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def owner_exited(owner: Optional[str]) -> bool:
+    """True if the owner's process has exited (or there is no owner, e.g. a job from before owners)."""
+    if not owner:
+        return True
+    host, _, pid = owner.rpartition(":")
+    if host != socket.gethostname():
+        return False  # another machine's process: cannot tell, leave its jobs alone
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except (PermissionError, ValueError):
+        return False
+    return False
+
+
+class JobRunner:
+    """
+    Thread-pool job runner backed by a SQLite job table.
+    Job functions are called as fn(progress=progress, **params), where progress(stage) records
+    the stage the job has reached; their (JSON-serialisable) return value is stored as the result.
+    """
+
+    def __init__(self, db_path: str = JOBS_DB_PATH, max_workers: int = 2):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="briefing-job")
+        self._lock = threading.Lock()
+        self.owner = process_owner()
+        with self._connect() as conn:
+            conn.execute(_SCHEMA)
+            if "owner" not in {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}:
+                conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+            unfinished = conn.execute("SELECT id, owner FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)).fetchall()
+            interrupted = [row["id"] for row in unfinished if owner_exited(row["owner"])]
+            conn.executemany(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+                [(FAILED, "interrupted", _now(), job_id) for job_id in interrupted],
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _update(self, job_id: str, **fields) -> None:
+        fields["updated_at"] = _now()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def submit(self, kind: str, fn: Callable[..., Any], **params) -> str:
+        """Record a queued job and schedule it. Returns the job id."""
+        job_id = uuid.uuid4().hex
+        now = _now()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, params, owner, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, QUEUED, json.dumps(params, default=str), self.owner, now, now),
+            )
+        self._executor.submit(self._run, job_id, fn, params)
+        return job_id
+
+    def _run(self, job_id: str, fn: Callable[..., Any], params: Dict[str, Any]) -> None:
+        stages: List[Dict[str, str]] = []
+
+        def progress(stage: str) -> None:
+            stages.append({"stage": stage, "at": _now()})
+            self._update(job_id, stage=stage, stages=json.dumps(stages))
+
+        self._update(job_id, status=RUNNING)
+        try:
+            result = fn(progress=progress, **params)
+            self._update(job_id, status=SUCCEEDED, result=json.dumps(result, default=str))
+        except Exception as e:
+            traceback.print_exc()
+            self._update(job_id, status=FAILED, error=str(e))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job record as a dict (stages/result decoded), or None if unknown. Params are omitted."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, kind, status, stage, stages, result, error, created_at, updated_at FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["stages"] = json.loads(job["stages"] or "[]")
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def params(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """The params a job was submitted with (as stored, JSON-decoded), or None if unknown."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT params FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row["params"]) if row else None
+
+    def recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, kind, status, stage, error, created_at, updated_at FROM jobs ORDER BY created_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+_runner: Optional[JobRunner] = None
+_runner_lock = threading.Lock()
+
+
+def get_job_runner() -> JobRunner:
+    """Process-wide JobRunner, created on first use."""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = JobRunner()
+        return _runner
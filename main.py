@@ -1,125 +1,328 @@
+import contextvars
 import os
 import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime, timedelta
-from typing import List, Optional
+from functools import partial
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional
 
-from config import NEWS_API_KEY, GOOGLE_API_KEY, GEMINI_MODEL, RELEVANT_KEYWORDS, get_keywords, get_funds
-from news_fetcher import fetch_articles
+import metrics
+from config import get_api_key, get_keywords
 from human_screen import human_screen_articles
-from scorer import contains_relevant_keywords, score_article
-from deduplicator import deduplicate_articles
-from summariser import configure_model, generate_summary, generate_intro
+from deduplicator import iter_unique
 from reporter import build_briefing
-from formatter import generate_markdown, generate_html, generate_pdf, generate_fund_performance_section
-from flask import send_from_directory
-from fund_info import refresh_fund_data
-from fund_news_fetcher import fetch_news_for_funds
+from ingest import load_candidates
+
+# Heavy dependencies (google.generativeai, playwright, nltk, pandas) are imported in the
+# functions that use them, so CLI commands and the web app start without loading them.
+
+SUMMARY_LIMIT = 10  # articles summarised per briefing
+SUMMARY_WORKERS = 4  # Gemini summary requests in flight at once
 
 
 def fetch_articles_for_briefing(
     keywords: Optional[List[str]] = None,
-    from_days_ago: int = 3
+    from_days_ago: int = 3,
+    use_corpus: bool = True
 ) -> List[dict]:
     """
     Fetch articles for briefing, without human screening or further processing.
+    Reads the pre-ingested candidate corpus when it can serve the request,
+    otherwise fetches from NewsAPI.
     """
-    search_keywords = keywords if keywords else get_keywords()
-    articles = fetch_articles(search_keywords, from_days_ago=from_days_ago)
-    return articles
+    with metrics.stage("fetch") as stage:
+        if use_corpus:
+            candidates = load_candidates(keywords, from_days_ago=from_days_ago)
+            metrics.inc("cache_requests_total", cache="corpus", result="miss" if candidates is None else "hit")
+            if candidates is not None:
+                print(f"Using {len(candidates)} pre-ingested candidates")
+                stage.articles_out = len(candidates)
+                return candidates
+        from news_fetcher import fetch_articles
 
+        search_keywords = keywords if keywords else get_keywords()
+        articles = fetch_articles(search_keywords, from_days_ago=from_days_ago)
+        stage.articles_out = len(articles)
+        return articles
 
-def generate_briefing_from_articles(
-    articles: List[dict],
-    output_dir: str = "./output"
-):
-    """
-    Generate the briefing from a list of accepted articles.
-    """
-    os.makedirs(output_dir, exist_ok=True)
-    # Step 2: Filter articles (scoring temporarily disabled)
-    print("Filtering articles...")
-    filtered_articles = []
+
+def filter_articles(articles: Iterable[dict]) -> Iterator[dict]:
+    """Articles with a title and content (scoring temporarily disabled)."""
     for article in articles:
-        if not article.get("title") or not article.get("content"):
-            continue
-        filtered_articles.append(article)
+        if article.get("title") and article.get("content"):
+            yield article
 
-    # Step 3: Deduplicate articles
-    print("Deduplicating articles...")
-    unique_articles = deduplicate_articles(filtered_articles)
 
-    # Step 4: Configure Gemini model for summarization
-    print("Configuring Gemini model...")
-    if not GOOGLE_API_KEY:
-        raise ValueError("GOOGLE_API_KEY is missing or None.")
-    model, chat = configure_model(str(GOOGLE_API_KEY))
+def summarise_articles(model, articles: Iterable[dict], workers: int = SUMMARY_WORKERS,
+                       checkpoint=None, failed: Optional[List[str]] = None) -> Iterator[dict]:
+    """
+    Summarise and score articles as they arrive, with up to `workers` Gemini requests in flight.
+    Yields the enriched articles in input order; an article that fails (raises, or comes back
+    as an "[Error ...]" summary) is skipped, and its URL appended to `failed` if given.
+    With a checkpoint (see checkpoints), articles it already has are not summarised again,
+    and each new one is saved to it as soon as it is done.
+    """
+    from scorer import score_article
+    from summariser import generate_summary
+
+    done = checkpoint.summaries() if checkpoint else {}
 
-    # Step 5: Generate summaries, topics, and mentioned companies
-    print("Generating summaries and extracting metadata...")
-    enriched_articles = []
-    limited_articles = unique_articles[:10]
-    for article in limited_articles:
+    def enrich(article: dict) -> Optional[dict]:
+        if article["url"] in done:
+            return done[article["url"]]
         try:
             summary = generate_summary(model, article["content"])
-            enriched_articles.append({
+            enriched = {
                 "title": article["title"],
                 "url": article["url"],
                 "date": article["publishedAt"],
                 "source": article["source"]["name"],
                 "summary": summary,
-                "sentiment": score_article(article),
-            })
+                "sentiment": article.get("sentiment") or score_article(article),
+            }
+            if summary.startswith("[Error"):
+                print(f"Error summarizing article '{article['title']}': {summary}")
+                if failed is not None:
+                    failed.append(article["url"])
+                return None
+            if checkpoint:
+                checkpoint.save_summary(article["url"], enriched)
+            return enriched
         except Exception as e:
             print(f"Error summarizing article '{article['title']}': {e}")
+            if failed is not None:
+                failed.append(article["url"])
+            return None
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="summarise") as pool:
+        pending = deque()
+        for article in articles:
+            # A copy of this context, so the LLM calls are counted in the current run
+            pending.append(pool.submit(contextvars.copy_context().run, enrich, article))
+            while pending and (pending[0].done() or len(pending) >= 2 * workers):
+                enriched = pending.popleft().result()
+                if enriched:
+                    yield enriched
+        while pending:
+            enriched = pending.popleft().result()
+            if enriched:
+                yield enriched
+
+
+def configure_summary_model():
+    """The Gemini model for summaries and the intro (or the stub, see summariser.llm_backend)."""
+    from summariser import configure_model, llm_backend
+
+    print("Configuring Gemini model...")
+    google_api_key = get_api_key("GOOGLE_API_KEY")
+    if not google_api_key and llm_backend()[0] == "gemini":
+        raise ValueError("GOOGLE_API_KEY is missing or None.")
+    model, chat = configure_model(str(google_api_key))
+    return model
+
+
+def fund_performance_section() -> Optional[dict]:
+    """Refresh fund data if it is stale, then build the briefing's fund performance section."""
+    from formatter import generate_fund_performance_section
+    from fund_info import FUND_DATA_PATH, refresh_fund_data
+
+    with metrics.stage("fund_refresh"):
+        print("Checking fund performance data...")
+        refresh_fund_data()  # Will only refresh if data is stale
+
+        print("Updating/loading fund performance data...")
+        if os.path.exists(FUND_DATA_PATH):
+            return generate_fund_performance_section(FUND_DATA_PATH)
+        return None
+
+
+def generate_briefing_from_articles(
+    articles: List[dict],
+    output_dir: str = "./output",
+    progress: Optional[Callable[[str], None]] = None,
+    profile: bool = False,
+    pdf: bool = True,
+    run_id: Optional[str] = None,
+    name: Optional[str] = None
+):
+    """
+    Generate the briefing from a list of accepted articles.
+    Filter, dedup and summarise are streamed: each article moves to the next stage as soon
+    as it is through one, dedup stops once SUMMARY_LIMIT unique articles are found, and
+    summaries run SUMMARY_WORKERS at a time. The fund refresh runs alongside them.
+    progress, if given, is called with the name of each stage as it starts
+    (fund_refresh, filter, dedup, summarise, build, render).
+    Stage timings and counters are written to a JSON run report next to the briefing;
+    with profile=True, per-stage profiles are written there too (see profiling).
+    pdf=False skips the PDF (which needs Chromium); 'pdf' is then None in the result.
+    Each stage's output is checkpointed under run_id (a new id unless given, see checkpoints),
+    so if the run fails, resume_briefing(run_id) redoes only what was not completed.
+    name, if given, is appended to the file names: briefing_YYYY-MM-DD_<name>.md.
+    """
+    from checkpoints import RunCheckpoint
+
+    checkpoint = RunCheckpoint.create(output_dir, articles, run_id, name=name)
+    return _generate_briefing(checkpoint, articles, output_dir, progress, profile, pdf, name)
+
+
+def resume_briefing(
+    run_id: str,
+    output_dir: str = "./output",
+    progress: Optional[Callable[[str], None]] = None,
+    profile: bool = False,
+    pdf: bool = True
+):
+    """
+    Generate the briefing of a checkpointed run: resume a failed generate_briefing_from_articles
+    run, reusing the stages it completed, or start one whose articles were checkpointed up front
+    (web jobs do this, so the job table stores the run id, not the articles).
+    Raises checkpoints.CheckpointError if the run has no checkpoints.
+    """
+    from checkpoints import RunCheckpoint
+
+    checkpoint = RunCheckpoint.open(output_dir, run_id)
+    completed = checkpoint.info().get("completed", [])
+    if completed:
+        print(f"Resuming run {run_id}, reusing: {', '.join(completed)}")
+    return _generate_briefing(checkpoint, checkpoint.load("articles"), output_dir, progress, profile, pdf,
+                              checkpoint.info().get("name"))
+
+
+def _generate_briefing(checkpoint, articles: List[dict], output_dir: str,
+                       progress: Optional[Callable[[str], None]], profile: bool, pdf: bool,
+                       name: Optional[str] = None):
+    from checkpoints import FAILED
+    from formatter import write_briefing_outputs
+    from summariser import generate_intro
+
+    def step(name: str, articles_in: Optional[int] = None):
+        if progress:
+            progress(name)
+        return metrics.stage(name, articles_in)
 
-    # Step 5.5: Updata and add fund performance data
-    print("Checking fund performance data...")
-    refresh_fund_data()  # Will only refresh if data is stale
-
-    print("Updating/loading fund performance data...")
-
-    fund_performance = None
-    fund_data_path = "data/fund_analysis_results.csv"
-    if os.path.exists(fund_data_path):
-        fund_performance = generate_fund_performance_section(fund_data_path)
-
-    # Step 6: Build the final briefing
-    print("Building the briefing...")
-    summaries = [article["summary"] for article in enriched_articles]
-    briefing = build_briefing(enriched_articles)
-    briefing["fund_performance"] = fund_performance
-    briefing["intro"] = generate_intro(model, summaries)
-
-    # Step 7: Output to Markdown, HTML, and PDF
-    print("Generating output files...")
-    date_str = datetime.now().strftime("%Y-%m-%d")
-    markdown_path = os.path.join(output_dir, f"briefing_{date_str}.md")
-    html_path = os.path.join(output_dir, f"briefing_{date_str}.html")
-    pdf_path = os.path.join(output_dir, f"briefing_{date_str}.pdf")
-
-    generate_markdown(briefing, markdown_path)
-    html_content = generate_html(briefing, logo_path='images/logo.png')
-    with open(html_path, "w", encoding="utf-8") as html_file:
-        html_file.write(html_content)
-    generate_pdf(briefing, pdf_path, logo_path='images/logo.png')
-
-    print(f"Briefing generated successfully!")
-    print(f"- Markdown: {markdown_path}")
-    print(f"- HTML: {html_path}")
-    print(f"- PDF: {pdf_path}")
-
-    return {
-        "markdown": os.path.basename(markdown_path),
-        "html": os.path.basename(html_path),
-        "pdf": os.path.basename(pdf_path)
-    }
+    checkpoint.acquire()  # raises checkpoints.RunInProgress if another job is generating this run
+    try:
+        with metrics.run("briefing") as run_report, _profiled(run_report, output_dir, profile), \
+                ThreadPoolExecutor(max_workers=1, thread_name_prefix="fund-refresh") as branch:
+            os.makedirs(output_dir, exist_ok=True)
+            briefing = checkpoint.load("briefing") if checkpoint.has("briefing") else None
+            if briefing is None:
+                # Fund data does not depend on the articles: refresh it while they are summarised
+                if progress:
+                    progress("fund_refresh")
+                fund_future = branch.submit(contextvars.copy_context().run, _checkpointed,
+                                            checkpoint, "fund_performance", fund_performance_section)
+
+                model = configure_summary_model()
+
+                # Steps 2-5: filter, deduplicate, then summarise, score and extract metadata. The
+                # stages are streamed into one another, so progress reports them as one: summarise
+                if progress:
+                    progress("summarise")
+                print("Filtering, deduplicating and summarising articles...")
+                streams = []
+                if checkpoint.has("unique"):
+                    selected = iter(checkpoint.load("unique"))
+                else:
+                    streams.append(metrics.streamed("filter", filter_articles, articles))
+                    streams.append(metrics.streamed("dedup", iter_unique, streams[-1]))
+                    selected = _saved_when_complete(checkpoint, "unique", islice(streams[-1], SUMMARY_LIMIT))
+                failed = []
+                streams.append(metrics.streamed("summarise", partial(summarise_articles, model, checkpoint=checkpoint,
+                                                                     failed=failed), selected))
+                try:
+                    enriched_articles = list(streams[-1])
+                finally:
+                    for stream in streams:
+                        stream.close()
+                if failed:
+                    # No briefing with gaps: fail the run, keeping the summaries done for the resume
+                    raise RuntimeError(f"{len(failed)} of {len(failed) + len(enriched_articles)} articles "
+                                       f"could not be summarised")
+                fund_performance = fund_future.result()
+
+                # Step 6: Build the final briefing
+                with step("build", len(enriched_articles)) as stage:
+                    print("Building the briefing...")
+                    summaries = [article["summary"] for article in enriched_articles]
+                    briefing = build_briefing(enriched_articles)
+                    briefing["fund_performance"] = fund_performance
+                    briefing["intro"] = generate_intro(model, summaries)
+                    stage.articles_out = len(briefing["articles"])
+                checkpoint.save("briefing", briefing)
+
+            # Step 7: Output to Markdown, HTML, and PDF
+            with step("render", len(briefing["articles"])):
+                print("Generating output files...")
+                stem = f"briefing_{datetime.now().strftime('%Y-%m-%d')}" + (f"_{name}" if name else "")
+                markdown_path = os.path.join(output_dir, f"{stem}.md")
+                html_path = os.path.join(output_dir, f"{stem}.html")
+                pdf_path = os.path.join(output_dir, f"{stem}.pdf") if pdf else None
+
+                timings = write_briefing_outputs(briefing, markdown_path, html_path, pdf_path, logo_path='images/logo.png')
+            run_report.path = metrics.run_report_path(markdown_path)
+
+            print(f"Briefing generated successfully!")
+            print(f"- Markdown: {markdown_path} ({timings['markdown']:.0f} ms)")
+            print(f"- HTML: {html_path} ({timings['html']:.0f} ms)")
+            if pdf_path:
+                print(f"- PDF: {pdf_path} ({timings['pdf']:.0f} ms)")
+            print(f"- Run report: {run_report.path}")
+
+            result = {
+                "markdown": os.path.basename(markdown_path),
+                "html": os.path.basename(html_path),
+                "pdf": os.path.basename(pdf_path) if pdf_path else None,
+                "run_report": os.path.basename(run_report.path),
+                "run_id": checkpoint.run_id,
+                "timings_ms": timings
+            }
+            if profile:
+                result["profile"] = os.path.basename(run_report.path)[:-len(metrics.RUN_REPORT_SUFFIX)] + ".profile.txt"
+    except Exception as e:
+        checkpoint.mark(FAILED, error=str(e))
+        checkpoint.release()
+        print(f"Briefing run {checkpoint.run_id} failed: {e}")
+        print(f"Resume with: python main.py --resume {checkpoint.run_id}")
+        raise
+    checkpoint.remove()
+    return result
+
+
+def _checkpointed(checkpoint, name: str, compute: Callable[[], object]):
+    """compute()'s result, saved to the checkpoint; taken from it if it is already there."""
+    if checkpoint.has(name):
+        return checkpoint.load(name)
+    value = compute()
+    checkpoint.save(name, value)
+    return value
+
+
+def _saved_when_complete(checkpoint, name: str, items: Iterable[dict]) -> Iterator[dict]:
+    """Pass items through, saving the full list to the checkpoint once they are exhausted."""
+    collected = []
+    for item in items:
+        collected.append(item)
+        yield item
+    checkpoint.save(name, collected)
+
+
+def _profiled(run_report, output_dir: str, profile: bool):
+    if not profile:
+        return nullcontext()
+    from profiling import profile_run
+    return profile_run(run_report, output_dir)
 
 
 def run_pipeline(
     output_dir: str = "./output",
     from_days_ago: int = 3,
     keywords: Optional[List[str]] = None,
-    funds: Optional[List[str]] = None
+    funds: Optional[List[str]] = None,
+    profile: bool = False
 ):
     """
     Run the sustainable finance news summarization pipeline.
@@ -128,40 +331,80 @@ def run_pipeline(
         from_days_ago (int): Number of days ago to fetch articles from.
         keywords (List[str], optional): Custom keywords to search for.
         funds (List[str], optional): Custom funds to include (currently not used in logic).
+        profile (bool): Profile each stage and write the results to output_dir (see profiling).
     """
     os.makedirs(output_dir, exist_ok=True)
 
-    # Step 1: Fetch articles from NewsAPI
-    print("Fetching articles...")
-    search_keywords = keywords if keywords else get_keywords()
-    all_accepted = []
+    # One run report covers fetching and screening as well as generation
+    with metrics.run("briefing") as run_report, _profiled(run_report, output_dir, profile):
+        # Step 1: Fetch articles from NewsAPI
+        print("Fetching articles...")
+        search_keywords = keywords if keywords else get_keywords()
+        all_accepted = []
 
-    articles = fetch_articles_for_briefing(search_keywords, from_days_ago=from_days_ago)
-    screened = human_screen_articles(articles)
-    all_accepted.extend(screened)
+        articles = fetch_articles_for_briefing(search_keywords, from_days_ago=from_days_ago)
+        with metrics.stage("screen", len(articles)) as stage:
+            screened = human_screen_articles(articles)
+            stage.articles_out = len(screened)
+        all_accepted.extend(screened)
 
-    if not all_accepted:
-        print("No articles accepted. Exiting.")
-        return None
-    if not articles:
-        print("No articles found. Exiting.")
-        return None
-    articles = all_accepted
+        if not all_accepted:
+            print("No articles accepted. Exiting.")
+            return None
+        if not articles:
+            print("No articles found. Exiting.")
+            return None
+        articles = all_accepted
 
-    # Now generate the briefing from the accepted articles
-    return generate_briefing_from_articles(articles, output_dir=output_dir)
+        # Now generate the briefing from the accepted articles
+        return generate_briefing_from_articles(articles, output_dir=output_dir, profile=profile)
 
 
-def main(output_dir: str = "./output", from_days_ago: int = 3):
+def main(output_dir: str = "./output", from_days_ago: int = 3, profile: bool = False):
     # For backward compatibility with CLI usage
-    run_pipeline(output_dir=output_dir, from_days_ago=from_days_ago)
+    run_pipeline(output_dir=output_dir, from_days_ago=from_days_ago, profile=profile)
 
 
 if __name__ == "__main__":
+    if os.getenv("HTTP_CASSETTE"):
+        # Offline runs: serve outbound HTTP from a recording (see replay)
+        import replay
+        replay.install_from_env()
     if '--update-fund-news' in sys.argv:
+        from fund_news_fetcher import fetch_news_for_funds
         print("Updating news for funds using MarketAux...")
         fetch_news_for_funds()
+    elif '--resume' in sys.argv:
+        # python main.py --resume <run-id> [output_dir] [--profile]
+        run_id = sys.argv[sys.argv.index('--resume') + 1]
+        args = [arg for arg in sys.argv[1:] if not arg.startswith('--') and arg != run_id]
+        resume_briefing(run_id, output_dir=args[0] if args else "./output", profile='--profile' in sys.argv)
+    elif '--batch' in sys.argv:
+        # python main.py --batch specs.json [output_dir]: several briefings sharing fetch and summaries
+        from batch import load_specs, run_batch
+        specs_path = sys.argv[sys.argv.index('--batch') + 1]
+        args = [arg for arg in sys.argv[1:] if not arg.startswith('--') and arg != specs_path]
+        run_batch(load_specs(specs_path), output_dir=args[0] if args else "./output")
+    elif '--runs' in sys.argv:
+        # python main.py --runs [output_dir]: runs that failed and can be resumed
+        from checkpoints import RUN_RETENTION_DAYS, list_runs, prune_runs
+        args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+        output_dir = args[0] if args else "./output"
+        pruned = prune_runs(output_dir)
+        if pruned:
+            print(f"Removed {len(pruned)} runs older than {RUN_RETENTION_DAYS} days")
+        runs = list_runs(output_dir)
+        for run in runs:
+            print(f"{run['run_id']}  {run['status']:<8} completed: {', '.join(run['completed']) or '-'}"
+                  + (f"  error: {run['error'].splitlines()[0]}" if run.get('error') else ""))
+        if not runs:
+            print(f"No resumable runs in {output_dir}")
+    elif '--serve-scheduler' in sys.argv:
+        from scheduler import serve_scheduler
+        serve_scheduler(once='--once' in sys.argv)
     else:
-        output_dir = sys.argv[1] if len(sys.argv) > 1 else "./output"
-        from_days_ago = int(sys.argv[2]) if len(sys.argv) > 2 else 7
-        main(output_dir=output_dir, from_days_ago=from_days_ago)
\ No newline at end of file
+        # python main.py [output_dir] [from_days_ago] [--profile]
+        args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+        output_dir = args[0] if len(args) > 0 else "./output"
+        from_days_ago = int(args[1]) if len(args) > 1 else 7
+        main(output_dir=output_dir, from_days_ago=from_days_ago, profile='--profile' in sys.argv)
\ No newline at end of file
@@ -0,0 +1,201 @@
+"""
+Market data providers for fund NAV / close price history.
+
+All providers return history in long format, one row per (ticker, date):
+
+    Ticker | Date | Close Price | NAV
+
+- RefinitivProvider: Refinitiv Data Library (refinitiv.data), requesting every field for a
+  batch of tickers in one get_history call.
+- FileMarketDataProvider: local CSV with the same long-format columns. Used to exercise and
+  benchmark the refresh path offline.
+"""
+
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+# Canonical field name -> Refinitiv field code
+REFINITIV_FIELDS = {
+    "Close Price": "TR.CLOSEPRICE",
+    "NAV": "TR.NETASSETVAL",
+}
+# Canonical field name -> column names get_history may return for it besides the field name and code
+REFINITIV_DISPLAY_NAMES = {
+    "Close Price": ["CLOSE"],
+    "NAV": ["Net Asset Value", "NETASSETVAL"],
+}
+DEFAULT_FIELDS = ["Close Price", "NAV"]
+
+
+class MarketDataError(Exception):
+    pass
+
+
+class MarketDataProvider(ABC):
+    """Base class. Subclasses implement get_history; open/close manage sessions."""
+
+    name = "base"
+
+    def __init__(self):
+        self.calls = 0  # upstream requests made, for benchmarking
+
+    def open(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    @abstractmethod
+    def get_history(self, tickers: List[str], fields: List[str], start: datetime, end: datetime) -> pd.DataFrame:
+        """Daily history for all tickers and fields between start and end (inclusive), long format."""
+
+
+class RefinitivProvider(MarketDataProvider):
+    """Refinitiv Data Library provider; requests all fields for up to batch_size tickers per call."""
+
+    name = "refinitiv"
+
+    def __init__(self, batch_size: int = 50):
+        super().__init__()
+        self.batch_size = batch_size
+        self._rd = None
+
+    def open(self) -> None:
+        try:
+            import refinitiv.data as rd
+        except ImportError as e:
+            raise MarketDataError("refinitiv.data is not installed") from e
+        rd.open_session()
+        self._rd = rd
+
+    def close(self) -> None:
+        if self._rd is not None:
+            try:
+                self._rd.close_session()
+            finally:
+                self._rd = None
+
+    def get_history(self, tickers: List[str], fields: List[str], start: datetime, end: datetime) -> pd.DataFrame:
+        if self._rd is None:
+            raise MarketDataError("Provider session is not open")
+        codes = [REFINITIV_FIELDS[field] for field in fields]
+        frames = []
+        for i in range(0, len(tickers), self.batch_size):
+            batch = tickers[i:i + self.batch_size]
+            self.calls += 1
+            data = self._rd.get_history(
+                universe=batch,
+                fields=codes,
+                interval="daily",
+                start=start.strftime("%Y-%m-%d"),
+                end=end.strftime("%Y-%m-%d"),
+            )
+            if data is not None and not data.empty:
+                frames.append(_refinitiv_to_long(data, batch, fields))
+        if not frames:
+            return pd.DataFrame(columns=["Ticker", "Date"] + fields)
+        return pd.concat(frames, ignore_index=True)
+
+
+def _refinitiv_columns(columns: pd.Index, fields: List[str]) -> Dict[str, str]:
+    """Returned column -> canonical field, matched by field name, code or display name (any case)."""
+    names = {}
+    for field in fields:
+        for name in [field, REFINITIV_FIELDS[field], *REFINITIV_DISPLAY_NAMES.get(field, [])]:
+            names[name.lower()] = field
+    matched = {column: names[str(column).lower()] for column in columns if str(column).lower() in names}
+    if not matched:
+        raise MarketDataError(f"Refinitiv returned none of the requested fields: {list(columns)}")
+    return matched
+
+
+def _refinitiv_to_long(data: pd.DataFrame, tickers: List[str], fields: List[str]) -> pd.DataFrame:
+    """
+    Normalise a get_history frame (date index; columns either fields for a single ticker
+    or (ticker, field) pairs for several) to long format. Field columns are matched by
+    name, as Refinitiv may return display names rather than the requested codes; a field
+    it did not return is left empty.
+    """
+    frames = []
+    if isinstance(data.columns, pd.MultiIndex):
+        subs = [(ticker, data[ticker]) for ticker in data.columns.get_level_values(0).unique()]
+    else:
+        subs = [(tickers[0], data)]
+    for ticker, sub in subs:
+        columns = _refinitiv_columns(sub.columns, fields)
+        sub = sub[list(columns)].rename(columns=columns).reindex(columns=fields)
+        sub["Ticker"] = ticker
+        frames.append(sub)
+    long_df = pd.concat(frames)
+    long_df.index.name = "Date"
+    return long_df.reset_index()[["Ticker", "Date"] + fields]
+
+
+class FileMarketDataProvider(MarketDataProvider):
+    """Local CSV-backed provider (columns: Ticker, Date, Close Price, NAV). Loaded once per instance."""
+
+    name = "file"
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._df: Optional[pd.DataFrame] = None
+
+    def open(self) -> None:
+        if not os.path.exists(self.path):
+            raise MarketDataError(f"Market data file not found: {self.path}")
+        df = pd.read_csv(self.path)
+        df["Date"] = pd.to_datetime(df["Date"])
+        self._df = df
+
+    def get_history(self, tickers: List[str], fields: List[str], start: datetime, end: datetime) -> pd.DataFrame:
+        if self._df is None:
+            self.open()
+        self.calls += 1
+        df = self._df
+        mask = df["Ticker"].isin(tickers) & (df["Date"] >= pd.Timestamp(start).normalize()) & (df["Date"] <= pd.Timestamp(end))
+        return df.loc[mask, ["Ticker", "Date"] + fields].reset_index(drop=True)
+
+
+def get_provider(spec: Optional[str] = None) -> MarketDataProvider:
+    """
+    Build a provider from a spec string: 'refinitiv' (default) or 'file:<path>'.
+    Falls back to the MARKET_DATA_PROVIDER environment variable.
+    """
+    spec = spec or os.getenv("MARKET_DATA_PROVIDER") or "refinitiv"
+    if spec.startswith("file:"):
+        return FileMarketDataProvider(spec[len("file:"):])
+    if spec == "refinitiv":
+        return RefinitivProvider()
+    raise MarketDataError(f"Unknown market data provider: {spec}")
+
+
+def latest_discounts(history: pd.DataFrame, names: Dict[str, str]) -> pd.DataFrame:
+    """
+    Latest row per ticker with both price and NAV, as fund results
+    (Fund Name, Ticker, Date, Close Price, NAV, Discount (%)).
+    """
+    columns = ['Fund Name', 'Ticker', 'Date', 'Close Price', 'NAV', 'Discount (%)']
+    if history.empty:
+        return pd.DataFrame(columns=columns)
+    df = history.dropna(subset=["Close Price", "NAV"])
+    df = df[df["NAV"] != 0]
+    if df.empty:
+        return pd.DataFrame(columns=columns)
+    df = df.sort_values(["Ticker", "Date"]).groupby("Ticker", as_index=False).tail(1).copy()
+    df["Fund Name"] = df["Ticker"].map(names)
+    df["Date"] = pd.to_datetime(df["Date"]).dt.strftime("%Y-%m-%d")
+    df["Discount (%)"] = (df["Close Price"] - df["NAV"]) / df["NAV"] * 100
+    return df[columns].reset_index(drop=True)
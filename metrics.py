@@ -0,0 +1,370 @@
+"""
+Lightweight in-process metrics for the briefing pipeline.
+
+Pipeline stages are timed with `with metrics.stage("dedup", articles_in=n) as s: ...`, or
+with metrics.streamed() for generator stages that overlap with the next one, and
+other events are recorded with metrics.inc() (counters) and metrics.observe() (latency
+histograms). Everything goes into one process-wide registry, served by the web app at
+/metrics in the Prometheus text format.
+
+A run (`with metrics.run("briefing") as report:`) additionally collects the stages and
+counters of one briefing; the pipeline writes it as a JSON run report next to the
+briefing files (briefing_YYYY-MM-DD[_custom].run.json). Stage entries carry started_ms and
+finished_ms since the run started, so overlapping stages show up as a timeline; streamed
+stages also record first_out_ms, when their first item reached the next stage.
+"""
+
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+RUN_REPORT_SUFFIX = ".run.json"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, math.inf)
+
+# name: (type, help). Recording a metric that is not listed here raises KeyError.
+METRICS = {
+    "briefing_runs_total": ("counter", "Briefing runs by kind and final status."),
+    "briefing_stage_seconds": ("histogram", "Duration of each pipeline stage."),
+    "briefing_stage_articles_total": ("counter", "Articles entering (in) and leaving (out) each pipeline stage."),
+    "briefing_render_seconds": ("histogram", "Time to write each briefing output format, by artifact cache result."),
+    "cache_requests_total": ("counter", "Lookups in the candidate corpus and the artifact cache, by result."),
+    "llm_requests_total": ("counter", "Gemini requests by call and status."),
+    "llm_request_seconds": ("histogram", "Gemini request latency by call."),
+    "llm_tokens_total": ("counter", "Gemini tokens by call and kind (prompt, output), as reported by the API."),
+    "upstream_request_seconds": ("histogram", "Latency of HTTP requests to upstream services."),
+    "extract_attempts_total": ("counter", "Article extraction attempts by layer and result."),
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+_current_run: ContextVar[Optional["RunReport"]] = ContextVar("metrics_run", default=None)
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _format_number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Registry:
+    """Thread-safe counters and histograms, keyed by metric name and label set."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        # name -> label set -> [bucket counts..., sum, count]
+        self._histograms: Dict[str, Dict[LabelKey, List[float]]] = {}
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        if METRICS[name][0] != "counter":
+            raise ValueError(f"{name} is not a counter.")
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        if METRICS[name][0] != "histogram":
+            raise ValueError(f"{name} is not a histogram.")
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            values = series.get(key)
+            if values is None:
+                values = series[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    values[i] += 1
+            values[-2] += seconds
+            values[-1] += 1
+
+    def value(self, name: str, **labels) -> float:
+        """Current counter value, or histogram observation count, for one label set."""
+        key = _label_key(labels)
+        with self._lock:
+            if name in self._histograms:
+                return self._histograms[name].get(key, [0])[-1]
+            return self._counters.get(name, {}).get(key, 0)
+
+    def total(self, name: str, **labels) -> float:
+        """value() summed over every label set that includes the given labels."""
+        wanted = set(_label_key(labels))
+        with self._lock:
+            if name in self._histograms:
+                return sum(values[-1] for key, values in self._histograms[name].items() if wanted <= set(key))
+            return sum(value for key, value in self._counters.get(name, {}).items() if wanted <= set(key))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self) -> str:
+        """All recorded series in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, (kind, help_text) in METRICS.items():
+                series = self._counters.get(name) if kind == "counter" else self._histograms.get(name)
+                if not series:
+                    continue
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for key in sorted(series):
+                    if kind == "counter":
+                        lines.append(f"{name}{_format_labels(key)} {_format_number(series[key])}")
+                        continue
+                    values = series[key]
+                    for bound, count in zip(self.buckets, values):
+                        lines.append(f"{name}_bucket{_format_labels(key, ('le', _format_number(bound)))} {count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {_format_number(round(values[-2], 6))}")
+                    lines.append(f"{name}_count{_format_labels(key)} {values[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+class Stage:
+    """A running stage; set articles_out before the block ends to record it."""
+
+    def __init__(self, name: str, articles_in: Optional[int] = None):
+        self.name = name
+        self.articles_in = articles_in
+        self.articles_out: Optional[int] = None
+
+
+class RunReport:
+    """Stages and counters of one briefing run, written as JSON next to the briefing."""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self.status = "running"
+        self.stages: List[Dict] = []
+        self.counters: Dict[str, float] = {}
+        self.timings: Dict[str, float] = {}  # histogram name + labels -> total seconds
+        self.path: Optional[str] = None  # set once the briefing is written; the report goes here
+        self.profiler = None  # profiling.RunProfiler while the run is profiled
+        self.profile_files: List[str] = []
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def _add(self, table: Dict[str, float], name: str, labels: Dict[str, object], value: float) -> None:
+        key = name + _format_labels(_label_key(labels))
+        with self._lock:
+            table[key] = table.get(key, 0) + value
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {
+                "kind": self.kind,
+                "status": self.status,
+                "started_at": self.started_at,
+                "duration_ms": round((time.perf_counter() - self._start) * 1000, 1),
+                "stages": list(self.stages),
+                "counters": dict(sorted(self.counters.items())),
+                "timings_ms": {key: round(seconds * 1000, 1) for key, seconds in sorted(self.timings.items())},
+                **({"profile_files": list(self.profile_files)} if self.profile_files else {}),
+            }
+
+    def write(self, path: str) -> str:
+        """Write the report atomically to path; returns the path."""
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp_path, path)
+        return path
+
+
+_registry = Registry()
+
+
+def get_registry() -> Registry:
+    return _registry
+
+
+def current_run() -> Optional[RunReport]:
+    return _current_run.get()
+
+
+def inc(name: str, value: float = 1, **labels) -> None:
+    """Increment a counter in the registry and in the current run, if any."""
+    _registry.inc(name, value, **labels)
+    report = _current_run.get()
+    if report is not None:
+        report._add(report.counters, name, labels, value)
+
+
+def observe(name: str, seconds: float, **labels) -> None:
+    """Record a duration in a histogram, and its total in the current run, if any."""
+    _registry.observe(name, seconds, **labels)
+    report = _current_run.get()
+    if report is not None:
+        report._add(report.timings, name, labels, seconds)
+
+
+@contextmanager
+def timer(name: str, **labels) -> Iterator[None]:
+    """Observe the duration of the block in the given histogram."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+
+@contextmanager
+def stage(name: str, articles_in: Optional[int] = None) -> Iterator[Stage]:
+    """Time a pipeline stage and record its article counts, also when it fails."""
+    current = Stage(name, articles_in)
+    report = _current_run.get()
+    profiler = report.profiler if report is not None else None
+    if profiler is not None:
+        profiler.enter(name)
+    start = time.perf_counter()
+    error = None
+    try:
+        yield current
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        if profiler is not None:
+            profiler.exit(name)
+        _registry.observe("briefing_stage_seconds", seconds, stage=name)
+        for direction, count in (("in", current.articles_in), ("out", current.articles_out)):
+            if count is not None:
+                _registry.inc("briefing_stage_articles_total", count, stage=name, direction=direction)
+        if report is not None:
+            entry = {"stage": name, "duration_ms": round(seconds * 1000, 1),
+                     "articles_in": current.articles_in, "articles_out": current.articles_out,
+                     "started_ms": _since(report, start), "finished_ms": _since(report, start + seconds)}
+            if error:
+                entry["error"] = error
+            with report._lock:
+                report.stages.append(entry)
+
+
+def _since(report: RunReport, moment: float) -> float:
+    return round((moment - report._start) * 1000, 1)
+
+
+def streamed(name: str, transform: Callable[[Iterator], Iterable], items: Iterable) -> Iterator:
+    """
+    Run a generator stage: transform(items) is pulled one item at a time by the consumer,
+    so consecutive stages overlap. Records the articles in and out, the span from the first
+    pull to the end, and when the first item came out. The stage's entry takes its place in
+    the run report when streamed() is called; it is completed when the stream is exhausted
+    or closed.
+    """
+    report = _current_run.get()
+    entry = {"stage": name, "streamed": True}
+    if report is not None:
+        with report._lock:
+            report.stages.append(entry)
+    return _stream(name, transform, items, entry, report)
+
+
+def _stream(name: str, transform, items, entry: Dict, report: Optional[RunReport]) -> Iterator:
+    counts = {"in": 0, "out": 0}
+
+    def counted():
+        for item in items:
+            counts["in"] += 1
+            yield item
+
+    profiler = report.profiler if report is not None else None
+    if profiler is not None:
+        profiler.enter(name)  # ignored if an enclosing stage is being profiled
+    start = time.perf_counter()
+    first_out = None
+    error = None
+    stage_items = iter(transform(counted()))
+    try:
+        for item in stage_items:
+            if first_out is None:
+                first_out = time.perf_counter()
+            counts["out"] += 1
+            yield item
+    except GeneratorExit:
+        raise
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        for iterator in (stage_items, items):
+            if hasattr(iterator, "close"):
+                iterator.close()
+        end = time.perf_counter()
+        if profiler is not None:
+            profiler.exit(name)
+        _registry.observe("briefing_stage_seconds", end - start, stage=name)
+        for direction in ("in", "out"):
+            _registry.inc("briefing_stage_articles_total", counts[direction], stage=name, direction=direction)
+        if report is not None:
+            with report._lock:
+                entry.update({"duration_ms": round((end - start) * 1000, 1),
+                              "articles_in": counts["in"], "articles_out": counts["out"],
+                              "started_ms": _since(report, start), "finished_ms": _since(report, end),
+                              "first_out_ms": _since(report, first_out) if first_out is not None else None})
+                if error:
+                    entry["error"] = error
+
+
+@contextmanager
+def run(kind: str) -> Iterator[RunReport]:
+    """
+    Collect a run report for the block and write it to report.path, if set, when the block
+    exits. A nested run() joins the enclosing one, so the CLI can start the run before
+    fetching while generate_briefing_from_articles also works on its own (web jobs).
+    """
+    report = _current_run.get()
+    if report is not None:
+        yield report
+        return
+    report = RunReport(kind)
+    token = _current_run.set(report)
+    try:
+        yield report
+        report.status = "succeeded"
+    except BaseException:
+        report.status = "failed"
+        raise
+    finally:
+        _current_run.reset(token)
+        _registry.inc("briefing_runs_total", kind=kind, status=report.status)
+        if report.path:
+            try:
+                report.write(report.path)
+            except OSError as e:
+                print(f"Could not write run report {report.path}: {e}")
+
+
+def run_report_path(briefing_path: str) -> str:
+    """briefing_2025-06-18.md -> briefing_2025-06-18.run.json"""
+    return os.path.splitext(briefing_path)[0] + RUN_REPORT_SUFFIX
+
+
+def render() -> str:
+    return _registry.render()
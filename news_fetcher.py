@@ -1,4 +1,5 @@
 import config
+import metrics
 import urllib.parse
 import requests
 from datetime import date, timedelta
@@ -10,20 +11,26 @@ def construct_query_from_keywords(keywords: List[str]) -> str:
     return urllib.parse.quote(query_joined)
 
 
-def fetch_articles(keywords: List[str], from_days_ago: int) -> List[Dict]:
+def everything_url(keywords: List[str], from_days_ago: int) -> str:
+    """NewsAPI /v2/everything request URL for the keywords, from from_days_ago days ago."""
     query_encoded = construct_query_from_keywords(keywords)
     from_date = (date.today() - timedelta(days=from_days_ago)).isoformat()
 
-    url = (
+    return (
         'https://newsapi.org/v2/everything?'
         f'q={query_encoded}&'
         f'from={from_date}&'
         'language=en&'
         'sortBy=publishedAt&'
-        f'apiKey={config.NEWS_API_KEY}'
+        f'apiKey={config.get_api_key("NEWS_API_KEY")}'
     )
 
-    response = requests.get(url)
+
+def fetch_articles(keywords: List[str], from_days_ago: int) -> List[Dict]:
+    url = everything_url(keywords, from_days_ago)
+
+    with metrics.timer("upstream_request_seconds", service="newsapi"):
+        response = requests.get(url)
     if response.status_code != 200:
         raise RuntimeError(f"NewsAPI error: {response.status_code} - {response.text}")
     
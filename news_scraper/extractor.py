@@ -7,6 +7,11 @@ Layers:
 - L3: Playwright (headless Chromium, stealth, JS rendering)
 - L4: (stub) fallback_api.fetch(url)
 
+Each layer is a function returning (title, text), listed in LAYERS in the order tried;
+benchmarks/bench_extraction.py measures them one by one (plus extract_trafilatura) against
+a recorded corpus, to tune the order and MIN_TEXT_CHARS. While HTTP is replayed from a
+cassette (see replay), the Playwright layer is skipped.
+
 Setup:
     pip install -r requirements.txt
     playwright install
@@ -15,7 +20,8 @@ Legal: Only use on sites where you have permission. Respect publisher ToS.
 """
 
 import asyncio
-from typing import Optional, Dict, Any
+import inspect
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import structlog
 from time import time
 from newspaper import Article, Config
@@ -24,65 +30,101 @@ from bs4 import BeautifulSoup
 from readability import Document
 import trafilatura
 from news_scraper.playwright_layer import fetch_article_html
+import metrics
+import replay
 
 logger = structlog.get_logger()
 
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/124.0.0.0 Safari/537.36"
+)
+MIN_TEXT_CHARS = 1000  # shorter extractions fall through to the next layer
+READABILITY_MIN_CHARS = 500  # below this, rendered pages are re-extracted with trafilatura
+
+
+def extract_newspaper(url: str) -> Optional[Tuple[Optional[str], str]]:
+    """L1: newspaper3k download + parse. Returns (title, text)."""
+    config = Config()
+    config.browser_user_agent = USER_AGENT
+    art = Article(url, config=config)
+    with metrics.timer("upstream_request_seconds", service="article"):
+        art.download()
+    art.parse()
+    return art.title, art.text or ""
+
+
+def extract_readability(url: str) -> Optional[Tuple[Optional[str], str]]:
+    """L2: requests + readability-lxml + BeautifulSoup."""
+    with metrics.timer("upstream_request_seconds", service="article"):
+        resp = requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=15)
+    resp.raise_for_status()
+    doc = Document(resp.text)
+    soup = BeautifulSoup(doc.summary(), "lxml")
+    return doc.title(), soup.get_text(separator="\n", strip=True)
+
+
+def extract_trafilatura(url: str) -> Optional[Tuple[Optional[str], str]]:
+    """requests + trafilatura. Not in the default LAYERS; available for benchmarking and reordering."""
+    with metrics.timer("upstream_request_seconds", service="article"):
+        resp = requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=15)
+    resp.raise_for_status()
+    text = trafilatura.extract(resp.text, favor_precision=True) or ""
+    title = trafilatura.extract_metadata(resp.text)
+    return (title.title if title else None), text
+
+
+async def extract_playwright(url: str) -> Optional[Tuple[Optional[str], str]]:
+    """L3: Playwright (headless, stealth) render, then readability-lxml or trafilatura."""
+    with metrics.timer("upstream_request_seconds", service="article_playwright"):
+        html = await fetch_article_html(url)
+    if not html:
+        return None
+    doc = Document(html)
+    text = doc.summary(html_partial=False)
+    if not text or len(text) < READABILITY_MIN_CHARS:
+        text = trafilatura.extract(html, favor_precision=True) or ""
+    return doc.title(), text
+
+
+# Tried in order until one returns at least MIN_TEXT_CHARS; L4 (fallback_api.fetch) is a future stub
+LAYERS: List[Tuple[str, Callable]] = [
+    ("newspaper3k", extract_newspaper),
+    ("readability-lxml", extract_readability),
+    ("playwright", extract_playwright),
+]
+
+
+async def run_layer(extract: Callable, url: str) -> Optional[Tuple[Optional[str], str]]:
+    """Call a layer function, sync (run in a thread) or async."""
+    if inspect.iscoroutinefunction(extract):
+        return await extract(url)
+    return await asyncio.to_thread(extract, url)
+
+
 async def get_full_article(url: str) -> Optional[Dict[str, Any]]:
     """
     Try multiple extraction layers for a news article. Returns dict with 'title', 'text', 'layer', 'elapsed_ms', 'url'.
     Returns None if all layers fail.
     """
     start = time()
-    # L1: newspaper3k
-    try:
-        config = Config()
-        config.browser_user_agent = (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/124.0.0.0 Safari/537.36"
-        )
-        art = Article(url, config=config)
-        art.download()
-        art.parse()
-        text = art.text or ""
-        if len(text) >= 1000:
+    for layer, extract in LAYERS:
+        if layer == "playwright" and replay.active():
+            continue  # browser traffic bypasses requests, so it cannot be replayed
+        try:
+            result = await run_layer(extract, url)
+        except Exception as e:
+            logger.warning("extract_fail", kind="exception", url=url, layer=layer, error=str(e))
+            metrics.inc("extract_attempts_total", layer=layer, result="error")
+            continue
+        title, text = result or (None, "")
+        if text and len(text) >= MIN_TEXT_CHARS:
             elapsed = int((time() - start) * 1000)
-            logger.info("extract_success", event="extract", url=url, layer="newspaper3k", elapsed_ms=elapsed)
-            return {"title": art.title, "text": text, "layer": "newspaper3k", "elapsed_ms": elapsed, "url": url}
-    except Exception as e:
-        logger.warning("extract_fail", event="exception", url=url, layer="newspaper3k", error=str(e))
-
-    # L2: requests + BeautifulSoup + readability-lxml
-    try:
-        headers = {"User-Agent": config.browser_user_agent}
-        resp = requests.get(url, headers=headers, timeout=15)
-        resp.raise_for_status()
-        doc = Document(resp.text)
-        summary_html = doc.summary()
-        soup = BeautifulSoup(summary_html, "lxml")
-        text = soup.get_text(separator="\n", strip=True)
-        if len(text) >= 1000:
-            elapsed = int((time() - start) * 1000)
-            logger.info("extract_success", event="extract", url=url, layer="readability-lxml", elapsed_ms=elapsed)
-            return {"title": doc.title(), "text": text, "layer": "readability-lxml", "elapsed_ms": elapsed, "url": url}
-    except Exception as e:
-        logger.warning("extract_fail", event="exception", url=url, layer="readability-lxml", error=str(e))
+            logger.info("extract_success", kind="extract", url=url, layer=layer, elapsed_ms=elapsed)
+            metrics.inc("extract_attempts_total", layer=layer, result="success")
+            return {"title": title, "text": text, "layer": layer, "elapsed_ms": elapsed, "url": url}
+        metrics.inc("extract_attempts_total", layer=layer, result="too_short")
 
-    # L3: Playwright (headless, stealth)
-    try:
-        html = await fetch_article_html(url)
-        if html:
-            doc = Document(html)
-            text = doc.summary(html_partial=False)
-            if not text or len(text) < 500:
-                text = trafilatura.extract(html, favor_precision=True) or ""
-            if text and len(text) >= 1000:
-                elapsed = int((time() - start) * 1000)
-                logger.info("extract_success", event="extract", url=url, layer="playwright", elapsed_ms=elapsed)
-                return {"title": doc.title(), "text": text, "layer": "playwright", "elapsed_ms": elapsed, "url": url}
-    except Exception as e:
-        logger.warning("extract_fail", event="exception", url=url, layer="playwright", error=str(e))
-
-    # L4: (future) fallback_api.fetch(url) stub
-    logger.info("extract_fail", event="all_layers_failed", url=url)
-    return None 
\ No newline at end of file
+    logger.info("extract_fail", kind="all_layers_failed", url=url)
+    return None
@@ -5,6 +5,8 @@ Playwright-based article HTML fetcher for news scraping.
 - Rotates user-agents and viewport sizes.
 - Capped concurrency with asyncio.Semaphore.
 - Retries with exponential backoff on 429/503.
+- Persists per-domain storage state (cookies/localStorage) so consent walls are only paid once.
+- Optional per-domain consent-accept hooks run on the first visit to a domain.
 - Returns fully rendered HTML for downstream extraction (readability-lxml, trafilatura).
 
 Setup:
@@ -15,9 +17,13 @@ Legal: Only use on sites where you have permission. Respect publisher ToS.
 """
 
 import asyncio
+import os
 import random
-from typing import Optional, cast
-from playwright.async_api import async_playwright, Browser, Page, ViewportSize
+import tempfile
+import time
+from typing import Awaitable, Callable, Dict, Optional, cast
+from urllib.parse import urlparse
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, ViewportSize
 from playwright_stealth import stealth # type: ignore
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 import structlog
@@ -41,46 +47,164 @@ VIEWPORTS = [
     {"width": 1440, "height": 900},
 ]
 
+# Per-domain storage state (cookies/localStorage) persisted between renders
+STORAGE_STATE_DIR = os.path.join("data", "playwright_state")
+STORAGE_STATE_MAX_AGE_HOURS = 24 * 7
+
+# Generic "accept" buttons used by the common consent management platforms
+CONSENT_SELECTORS = [
+    "#onetrust-accept-btn-handler",
+    "button#didomi-notice-agree-button",
+    "button.fc-cta-consent",
+    "button[mode='primary'][title='Accept all']",
+    "button:has-text('Accept all')",
+    "button:has-text('Accept All')",
+    "button:has-text('I Accept')",
+    "button:has-text('Agree')",
+]
+
+ConsentHook = Callable[[Page], Awaitable[None]]
+CONSENT_HOOKS: Dict[str, ConsentHook] = {}
+
 logger = structlog.get_logger()
 
 class FetchError(Exception):
     pass
 
+
+def get_domain(url: str) -> str:
+    """Return the registrable-ish host for a URL (lowercased, 'www.' stripped)."""
+    host = (urlparse(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def storage_state_path(domain: str, state_dir: Optional[str] = None) -> str:
+    """Path of the persisted storage state file for a domain."""
+    safe_domain = "".join(c if c.isalnum() or c in "-." else "_" for c in domain) or "_default"
+    return os.path.join(state_dir or STORAGE_STATE_DIR, f"{safe_domain}.json")
+
+
+def load_storage_state(domain: str, max_age_hours: float = STORAGE_STATE_MAX_AGE_HOURS,
+                       state_dir: Optional[str] = None) -> Optional[str]:
+    """
+    Return the path of a usable storage state for the domain, or None.
+    Expired state files are removed so the next render re-accepts consent.
+    """
+    path = storage_state_path(domain, state_dir)
+    if not os.path.exists(path):
+        return None
+    age_seconds = time.time() - os.path.getmtime(path)
+    if age_seconds > max_age_hours * 3600:
+        logger.info("storage_state_expired", domain=domain, age_hours=round(age_seconds / 3600, 1))
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+    return path
+
+
+async def save_storage_state(context: BrowserContext, domain: str, state_dir: Optional[str] = None) -> str:
+    """Persist the context's cookies/localStorage for the domain, replacing the file atomically."""
+    path = storage_state_path(domain, state_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # A unique temp file: concurrent renders of the same domain must not write into each other's
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        await context.storage_state(path=tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return path
+
+
+def register_consent_hook(domain: str, hook: ConsentHook) -> None:
+    """Register a scripted consent-accept hook for a domain (e.g. 'ft.com')."""
+    CONSENT_HOOKS[domain.lower()] = hook
+
+
+async def accept_common_consent(page: Page, timeout_ms: int = 2_000) -> bool:
+    """
+    Click the first visible consent button from CONSENT_SELECTORS. Returns True if one was
+    clicked, False if none is visible; raises if a visible button could not be clicked.
+    """
+    for selector in CONSENT_SELECTORS:
+        button = page.locator(selector).first
+        try:
+            visible = await button.is_visible(timeout=timeout_ms)
+        except Exception:
+            continue
+        if visible:
+            await button.click(timeout=timeout_ms)
+            await page.wait_for_load_state("networkidle", timeout=timeout_ms * 5)
+            return True
+    return False
+
+
+async def run_consent_hook(page: Page, domain: str) -> bool:
+    """
+    Run the registered hook for the domain, falling back to the generic selectors. Returns
+    False if consent failed (the hook or a click raised or timed out), in which case the
+    page's storage state must not be saved for reuse.
+    """
+    hook = CONSENT_HOOKS.get(domain)
+    try:
+        if hook:
+            await hook(page)
+        else:
+            await accept_common_consent(page)
+    except Exception as e:
+        logger.warning("consent_hook_fail", domain=domain, error=str(e))
+        return False
+    return True
+
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=2, max=10),
     retry=retry_if_exception_type(FetchError)
 )
-async def fetch_article_html(url: str, timeout_ms: int = 30_000, user_agent: Optional[str] = None) -> Optional[str]:
+async def fetch_article_html(url: str, timeout_ms: int = 30_000, user_agent: Optional[str] = None,
+                             use_storage_state: bool = True) -> Optional[str]:
     """
     Render URL in headless Chromium (stealth), return final HTML.
+    Reuses the domain's persisted storage state when available; on a first visit the
+    domain's consent hook runs and the resulting state is saved for later renders.
     Return None on 4xx/5xx or if load exceeds timeout.
     """
     async with SEM:
         user_agent = user_agent or random.choice(USER_AGENTS)
         viewport = cast(ViewportSize, random.choice(VIEWPORTS))
+        domain = get_domain(url)
+        state_path = load_storage_state(domain) if use_storage_state else None
         start = asyncio.get_event_loop().time()
         try:
             async with async_playwright() as p:
                 browser: Browser = await p.chromium.launch(headless=True)
-                page: Page = await browser.new_page(
+                context: BrowserContext = await browser.new_context(
                     user_agent=user_agent,
                     viewport=viewport,
                     java_script_enabled=True,
+                    storage_state=state_path,
                 )
+                page: Page = await context.new_page()
                 await stealth(page) # type: ignore
                 resp = await page.goto(url, timeout=timeout_ms, wait_until="networkidle")
                 status = resp.status if resp else None
                 if status and (400 <= status < 600):
-                    logger.info("playwright_fetch_fail", event="http_error", url=url, status=status)
+                    logger.info("playwright_fetch_fail", kind="http_error", url=url, status=status)
                     await browser.close()
                     return None
+                if use_storage_state and not state_path and await run_consent_hook(page, domain):
+                    await save_storage_state(context, domain)
                 html = await page.content()
                 elapsed = int((asyncio.get_event_loop().time() - start) * 1000)
-                logger.info("playwright_fetch_success", event="fetch", url=url, layer="playwright", elapsed_ms=elapsed, status=status)
+                logger.info("playwright_fetch_success", kind="fetch", url=url, layer="playwright", elapsed_ms=elapsed,
+                            status=status, storage_state_reused=bool(state_path))
                 await browser.close()
                 return html
         except Exception as e:
             elapsed = int((asyncio.get_event_loop().time() - start) * 1000)
-            logger.warning("playwright_fetch_exception", event="exception", url=url, layer="playwright", elapsed_ms=elapsed, error=str(e))
+            logger.warning("playwright_fetch_exception", kind="exception", url=url, layer="playwright", elapsed_ms=elapsed, error=str(e))
             raise FetchError(str(e)) 
\ No newline at end of file
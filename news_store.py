@@ -0,0 +1,412 @@
+"""
+Indexed local store of ingested news articles (data/news.db).
+
+MarketAux fund news (fund_news_fetcher) and NewsAPI candidates (ingest) are upserted here at
+ingest time, with the derived fields the web UI needs precomputed: normalised published_at,
+a readable date, a sentiment label and the fund facet counts. Pages query it with filters
+(fund, date range, sentiment, text) and keyset cursor pagination over (published_at, id), so
+page latency doesn't grow with the corpus.
+
+Title, description and extracted content are also indexed in an FTS5 table (articles_fts,
+rowid = articles.rowid, porter stemming) that is updated in the same transaction as each
+upsert; search() ranks matches with BM25 and returns highlighted snippets.
+
+data/marketaux_news_results.json and data/marketaux_news_with_content.json stay the ingest
+outputs. Their writers (fund_news_fetcher, fund_news_scraper) update the store as they
+write them, and a process re-syncs from them when it first opens the store, in case they
+changed in between.
+"""
+
+import base64
+import html
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+NEWS_DB_PATH = "data/news.db"
+FUND_NEWS_PATH = "data/marketaux_news_results.json"
+FUND_NEWS_CONTENT_PATH = "data/marketaux_news_with_content.json"
+FUND_NEWS = "marketaux"
+NEWSAPI = "newsapi"
+PAGE_SIZE = 50
+SEARCH_PAGE_SIZE = 20
+SENTIMENT_THRESHOLD = 0.1  # same cut-offs as scorer.score_article
+BM25_WEIGHTS = (10.0, 4.0, 1.0)  # title, description, content
+SNIPPET_TOKENS = 24
+_MARK_START, _MARK_END = "\x02", "\x03"
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS articles (
+        id TEXT PRIMARY KEY,
+        kind TEXT NOT NULL,
+        url TEXT,
+        title TEXT,
+        description TEXT,
+        source TEXT,
+        published_at TEXT NOT NULL,
+        published_at_readable TEXT,
+        sentiment REAL,
+        sentiment_label TEXT,
+        funds TEXT NOT NULL DEFAULT '[]',
+        data TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_articles_kind_published ON articles (kind, published_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_articles_sentiment ON articles (kind, sentiment_label, published_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_articles_url ON articles (url)",
+    """
+    CREATE TABLE IF NOT EXISTS article_funds (
+        fund TEXT NOT NULL,
+        published_at TEXT NOT NULL,
+        article_id TEXT NOT NULL,
+        PRIMARY KEY (fund, published_at, article_id)
+    )
+    """,
+    "DROP INDEX IF EXISTS idx_article_funds_article",
+    "CREATE INDEX IF NOT EXISTS idx_article_funds_article_fund ON article_funds (article_id, fund)",
+    "CREATE TABLE IF NOT EXISTS funds (name TEXT PRIMARY KEY, articles INTEGER NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(title, description, content, tokenize='porter unicode61')",
+]
+
+_LIST_COLUMNS = "a.id, a.url, a.title, a.description, a.source, a.published_at, a.published_at_readable, a.sentiment, a.sentiment_label, a.funds"
+
+
+def _normalise_date(value: Optional[str]) -> Optional[datetime]:
+    """Naive UTC datetime; values with another offset are converted, naive ones taken as UTC."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed.astimezone(timezone.utc).replace(tzinfo=None) if parsed.tzinfo else parsed
+
+
+def entity_sentiment(article: Dict) -> Optional[float]:
+    """Mean MarketAux entity sentiment_score, or None if no entity has one."""
+    scores = [e["sentiment_score"] for e in article.get("entities") or [] if e.get("sentiment_score") is not None]
+    return sum(scores) / len(scores) if scores else None
+
+
+def sentiment_label(score: Optional[float]) -> Optional[str]:
+    if score is None:
+        return None
+    if score > SENTIMENT_THRESHOLD:
+        return "Positive"
+    if score < -SENTIMENT_THRESHOLD:
+        return "Negative"
+    return "Neutral"
+
+
+def encode_cursor(published_at: str, article_id: str) -> str:
+    return base64.urlsafe_b64encode(f"{published_at}|{article_id}".encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str):
+    try:
+        published_at, article_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|", 1)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return published_at, article_id
+
+
+def fts_query(text: str) -> Optional[str]:
+    """
+    Turn free text into a safe FTS5 query: every word must match (implicit AND), the last
+    word as a prefix so results update while typing. None if the text has no words.
+    """
+    tokens = _TOKEN_RE.findall(text or "")
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def _highlight(snippet: str) -> str:
+    """HTML-escape an FTS snippet and turn the match markers into <mark> tags."""
+    return html.escape(snippet or "").replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+
+class NewsStore:
+    """SQLite-backed article store with precomputed fields and keyset pagination."""
+
+    def __init__(self, db_path: str = NEWS_DB_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            # Persist the weighted BM25 as the FTS 'rank', so ORDER BY rank is resolved inside FTS5
+            # and snippets are only built for the rows actually returned
+            conn.execute("INSERT INTO articles_fts (articles_fts, rank) VALUES ('rank', ?)",
+                         (f"bm25({', '.join(str(w) for w in BM25_WEIGHTS)})",))
+        if self._search_index_missing():
+            self.rebuild_search_index()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _search_index_missing(self) -> bool:
+        """True for stores created before the search index existed (articles but no FTS rows)."""
+        with self._connect() as conn:
+            has_articles = conn.execute("SELECT 1 FROM articles LIMIT 1").fetchone() is not None
+            has_index = conn.execute("SELECT 1 FROM articles_fts LIMIT 1").fetchone() is not None
+        return has_articles and not has_index
+
+    def rebuild_search_index(self) -> int:
+        """Re-index every stored article (content taken from the stored article data)."""
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM articles_fts")
+            rows = conn.execute("SELECT rowid, title, description, data FROM articles").fetchall()
+            conn.executemany(
+                "INSERT INTO articles_fts (rowid, title, description, content) VALUES (?, ?, ?, ?)",
+                ((row["rowid"], row["title"], row["description"], json.loads(row["data"]).get("content") or "")
+                 for row in rows),
+            )
+        return len(rows)
+
+    def _row(self, article: Dict, kind: str) -> Optional[tuple]:
+        article_id = str(article.get("uuid") or article.get("url") or "")
+        if not article_id:
+            return None
+        published = _normalise_date(article.get("published_at") or article.get("publishedAt"))
+        source = article.get("source")
+        if isinstance(source, dict):
+            source = source.get("name")
+        score = entity_sentiment(article)
+        label = sentiment_label(score) if score is not None else article.get("sentiment")
+        return (
+            article_id, kind, article.get("url"), article.get("title"), article.get("description"), source,
+            published.isoformat(timespec="seconds") if published else "",
+            published.strftime("%d %b %Y, %H:%M") if published else "",
+            score, label, json.dumps(article.get("funds") or []), json.dumps(article, ensure_ascii=False),
+        )
+
+    def upsert(self, articles: Iterable[Dict], kind: str = FUND_NEWS) -> int:
+        """
+        Insert or replace articles (keyed by uuid, else url), re-index them for search and
+        refresh the affected fund facets.
+        """
+        rows, contents = [], {}
+        for article in articles:
+            row = self._row(article, kind)
+            if row:
+                rows.append(row)
+                contents[row[0]] = article.get("content") or ""
+        if not rows:
+            return 0
+        with self._lock, self._connect() as conn:
+            ids = [row[0] for row in rows]
+            affected = set()
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                placeholders = ", ".join("?" for _ in chunk)
+                affected.update(r[0] for r in conn.execute(
+                    f"SELECT DISTINCT fund FROM article_funds WHERE article_id IN ({placeholders})", chunk))
+                conn.execute(f"DELETE FROM article_funds WHERE article_id IN ({placeholders})", chunk)
+                # Drop the old search rows, keeping extracted content an incoming copy doesn't carry
+                for old in conn.execute(
+                        f"SELECT a.id, f.content FROM articles a JOIN articles_fts f ON f.rowid = a.rowid WHERE a.id IN ({placeholders})",
+                        chunk).fetchall():
+                    if not contents.get(old["id"]) and old["content"]:
+                        contents[old["id"]] = old["content"]
+                conn.execute(f"DELETE FROM articles_fts WHERE rowid IN (SELECT rowid FROM articles WHERE id IN ({placeholders}))", chunk)
+            conn.executemany("INSERT OR REPLACE INTO articles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                placeholders = ", ".join("?" for _ in chunk)
+                conn.executemany(
+                    "INSERT INTO articles_fts (rowid, title, description, content) VALUES (?, ?, ?, ?)",
+                    ((row["rowid"], row["title"], row["description"], contents.get(row["id"], ""))
+                     for row in conn.execute(f"SELECT rowid, id, title, description FROM articles WHERE id IN ({placeholders})", chunk).fetchall()),
+                )
+            fund_rows = [(fund, row[6], row[0]) for row in rows for fund in json.loads(row[10])]
+            conn.executemany("INSERT OR IGNORE INTO article_funds (fund, published_at, article_id) VALUES (?, ?, ?)", fund_rows)
+            affected.update(fund for fund, _, _ in fund_rows)
+            for fund in affected:
+                count = conn.execute("SELECT COUNT(*) FROM article_funds WHERE fund = ?", (fund,)).fetchone()[0]
+                if count:
+                    conn.execute("INSERT OR REPLACE INTO funds (name, articles) VALUES (?, ?)", (fund, count))
+                else:
+                    conn.execute("DELETE FROM funds WHERE name = ?", (fund,))
+        return len(rows)
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def sync_file(self, path: str = FUND_NEWS_PATH, kind: str = FUND_NEWS) -> bool:
+        """Upsert every article from a JSON ingest file if it changed since the last sync. Returns True if synced."""
+        try:
+            mtime = str(os.stat(path).st_mtime_ns)
+        except FileNotFoundError:
+            return False
+        key = f"synced:{os.path.abspath(path)}"
+        if self.get_meta(key) == mtime:
+            return False
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                articles = json.load(f)
+        except json.JSONDecodeError as e:
+            print(f"Could not sync {path}: {e}")
+            return False
+        self.upsert(articles, kind)
+        self.set_meta(key, mtime)
+        return True
+
+    def mark_synced(self, path: str = FUND_NEWS_PATH) -> None:
+        """Record that the store already holds the current contents of path (after an incremental upsert)."""
+        self.set_meta(f"synced:{os.path.abspath(path)}", str(os.stat(path).st_mtime_ns))
+
+    def funds(self) -> List[Dict]:
+        """Fund facet list: name and article count, alphabetical."""
+        with self._connect() as conn:
+            return [dict(row) for row in conn.execute("SELECT name, articles FROM funds ORDER BY name")]
+
+    def query(self, kind: str = FUND_NEWS, fund: Optional[str] = None, start: Optional[str] = None,
+              end: Optional[str] = None, sentiment: Optional[str] = None, text: Optional[str] = None,
+              cursor: Optional[str] = None, limit: int = PAGE_SIZE) -> Dict:
+        """
+        One page of articles, newest first. start/end are inclusive 'YYYY-MM-DD' dates; text must
+        match the search index (all words, see fts_query). Returns {'articles', 'next_cursor'}.
+        """
+        params: List = []
+        if fund:
+            sql = f"SELECT {_LIST_COLUMNS} FROM article_funds f JOIN articles a ON a.id = f.article_id WHERE f.fund = ? AND a.kind = ?"
+            params += [fund, kind]
+            order_columns = ("f.published_at", "f.article_id")
+        else:
+            sql = f"SELECT {_LIST_COLUMNS} FROM articles a WHERE a.kind = ?"
+            params.append(kind)
+            order_columns = ("a.published_at", "a.id")
+        if start:
+            sql += f" AND {order_columns[0]} >= ?"
+            params.append(start)
+        if end:
+            sql += f" AND {order_columns[0]} < ?"
+            params.append(end + "T99")  # sorts after any time on the end date
+        if sentiment:
+            sql += " AND a.sentiment_label = ?"
+            params.append(sentiment)
+        match = fts_query(text) if text else None
+        if match:
+            sql += " AND a.rowid IN (SELECT rowid FROM articles_fts WHERE articles_fts MATCH ?)"
+            params.append(match)
+        if cursor:
+            published_at, article_id = decode_cursor(cursor)
+            sql += f" AND ({order_columns[0]}, {order_columns[1]}) < (?, ?)"
+            params += [published_at, article_id]
+        sql += f" ORDER BY {order_columns[0]} DESC, {order_columns[1]} DESC LIMIT ?"
+        params.append(limit + 1)
+
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        articles = []
+        for row in rows[:limit]:
+            article = dict(row)
+            article["funds"] = json.loads(article["funds"])
+            article["uuid"] = article["id"]
+            articles.append(article)
+        next_cursor = None
+        if len(rows) > limit:
+            last = articles[-1]
+            next_cursor = encode_cursor(last["published_at"], last["id"])
+        return {"articles": articles, "next_cursor": next_cursor}
+
+    def search(self, text: str, kind: Optional[str] = None, fund: Optional[str] = None, start: Optional[str] = None,
+               end: Optional[str] = None, limit: int = SEARCH_PAGE_SIZE, offset: int = 0) -> Dict:
+        """
+        Full-text search over title, description and content, best BM25 match first.
+        Results carry the list fields plus 'rank' and an HTML 'snippet' with <mark>ed matches.
+        Returns {'results', 'total'}; kind/fund/start/end filter as in query().
+        """
+        match = fts_query(text)
+        if not match:
+            return {"results": [], "total": 0}
+        where = "articles_fts MATCH ?"
+        params: List = [match]
+        if kind:
+            where += " AND a.kind = ?"
+            params.append(kind)
+        if fund:
+            where += " AND EXISTS (SELECT 1 FROM article_funds af WHERE af.article_id = a.id AND af.fund = ?)"
+            params.append(fund)
+        if start:
+            where += " AND a.published_at >= ?"
+            params.append(start)
+        if end:
+            where += " AND a.published_at < ?"
+            params.append(end + "T99")
+        sql = (
+            f"SELECT {_LIST_COLUMNS}, a.kind, articles_fts.rank AS rank, "
+            f"snippet(articles_fts, -1, ?, ?, '…', ?) AS snippet "
+            f"FROM articles_fts JOIN articles a ON a.rowid = articles_fts.rowid WHERE {where} "
+            f"ORDER BY articles_fts.rank LIMIT ? OFFSET ?"
+        )
+        if len(params) == 1:
+            count_sql = "SELECT COUNT(*) FROM articles_fts WHERE articles_fts MATCH ?"
+        else:
+            count_sql = f"SELECT COUNT(*) FROM articles_fts JOIN articles a ON a.rowid = articles_fts.rowid WHERE {where}"
+        with self._connect() as conn:
+            rows = conn.execute(sql, [_MARK_START, _MARK_END, SNIPPET_TOKENS, *params, limit, offset]).fetchall()
+            total = conn.execute(count_sql, params).fetchone()[0]
+        results = []
+        for row in rows:
+            result = dict(row)
+            result["funds"] = json.loads(result["funds"])
+            result["snippet"] = _highlight(result["snippet"])
+            results.append(result)
+        return {"results": results, "total": total}
+
+    def get_many(self, ids: Iterable[str]) -> List[Dict]:
+        """Full ingested article dicts for the given ids, newest first."""
+        ids = list(dict.fromkeys(str(i) for i in ids))
+        rows = []
+        with self._connect() as conn:
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                placeholders = ", ".join("?" for _ in chunk)
+                rows += conn.execute(
+                    f"SELECT data, published_at, published_at_readable FROM articles WHERE id IN ({placeholders})", chunk
+                ).fetchall()
+        articles = []
+        for row in sorted(rows, key=lambda r: r["published_at"], reverse=True):
+            article = json.loads(row["data"])
+            article["published_at_readable"] = row["published_at_readable"]
+            articles.append(article)
+        return articles
+
+
+_store: Optional[NewsStore] = None
+_store_lock = threading.Lock()
+
+
+def get_news_store() -> NewsStore:
+    """
+    Process-wide NewsStore, created on first use and then synced with the fund news files.
+    Later calls do not re-check the files: the code writing them updates the store itself.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            store = NewsStore()
+            store.sync_file(FUND_NEWS_CONTENT_PATH)
+            store.sync_file(FUND_NEWS_PATH)
+            _store = store
+        return _store
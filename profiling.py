@@ -0,0 +1,220 @@
+"""
+Profiling mode for briefing runs (python main.py --profile, or ?profile=1 in the web app).
+
+While a run is profiled, every pipeline stage (metrics.stage) gets its own cProfile
+profile and tracemalloc window, and a sampler thread records the pipeline thread's stack
+every few milliseconds. When the run ends three files are written next to the briefing
+(or as profile_<timestamp>.* in the output directory if the run failed before rendering):
+
+    briefing_YYYY-MM-DD.profile.txt        per stage: wall time, peak RSS, peak traced memory,
+                                           top functions (cumulative) and top allocation sites
+    briefing_YYYY-MM-DD.profile.collapsed  sampled stacks in collapsed format, rooted at the
+                                           stage name (flamegraph.pl, speedscope, inferno)
+    briefing_YYYY-MM-DD.profile.pstats     all stage profiles merged (snakeviz, pstats)
+
+Only the pipeline thread is profiled; PDF rendering happens on the Playwright worker
+thread and shows up as time waiting for it.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import metrics
+
+TOP_N = 25
+SAMPLE_INTERVAL = 0.005  # seconds between stack samples
+TRACEMALLOC_FRAMES = 1  # allocation sites are grouped by line; deeper tracebacks double the overhead
+PROFILE_SUFFIXES = (".profile.txt", ".profile.collapsed", ".profile.pstats")
+OUTSIDE_STAGE = "(no stage)"
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far, in MB (None where unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KB on Linux
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.splitext(os.path.basename(code.co_filename))[0]}:{code.co_name}"
+
+
+class _ActiveStage:
+    def __init__(self, name: str):
+        self.name = name
+        self.profile = cProfile.Profile()
+        self.snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        self.start = time.perf_counter()
+
+
+class RunProfiler:
+    """
+    Per-stage cProfile and tracemalloc, plus a stack sampler, for the thread that creates it.
+    metrics.stage() calls enter()/exit() while the profiler is attached to the current run.
+    """
+
+    def __init__(self, top: int = TOP_N, interval: float = SAMPLE_INTERVAL):
+        self.top = top
+        self.interval = interval
+        self.thread_id = threading.get_ident()
+        self.stages: List[Dict] = []
+        self.samples: Counter = Counter()
+        self._active: Optional[_ActiveStage] = None
+        self._busy = False  # snapshotting: not the pipeline's time, so not sampled
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._started_tracemalloc = False
+        self._start = time.perf_counter()
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._started_tracemalloc = True
+        self._sampler = threading.Thread(target=self._sample, name="profiler-sampler", daemon=True)
+        self._sampler.start()
+
+    def stop(self) -> None:
+        if self._active is not None:
+            self.exit(self._active.name)
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+    def _sample(self) -> None:
+        own_file = __file__
+        while not self._stop.wait(self.interval):
+            if self._busy:
+                continue
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                if frame.f_code.co_filename != own_file:
+                    stack.append(_frame_name(frame))
+                frame = frame.f_back
+            active = self._active
+            stack.append(active.name if active is not None else OUTSIDE_STAGE)
+            self.samples[";".join(reversed(stack))] += 1
+
+    def enter(self, name: str) -> None:
+        # Stages do not nest in the pipeline; a nested one is profiled as part of its parent
+        if self._active is not None or threading.get_ident() != self.thread_id:
+            return
+        self._busy = True
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        active = _ActiveStage(name)
+        self._active = active
+        self._busy = False
+        active.profile.enable()
+
+    def exit(self, name: str) -> None:
+        active = self._active
+        if active is None or active.name != name or threading.get_ident() != self.thread_id:
+            return
+        active.profile.disable()
+        wall_ms = (time.perf_counter() - active.start) * 1000
+        self._busy = True
+        self._active = None
+        allocations, traced_peak = [], None
+        if active.snapshot is not None and tracemalloc.is_tracing():
+            traced_peak = tracemalloc.get_traced_memory()[1]
+            snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            ])
+            allocations = [str(stat) for stat in snapshot.compare_to(active.snapshot, "lineno")[:self.top]]
+        self.stages.append({
+            "stage": name,
+            "wall_ms": wall_ms,
+            "rss_peak_mb": peak_rss_mb(),
+            "traced_peak_mb": traced_peak / (1024 * 1024) if traced_peak is not None else None,
+            "allocations": allocations,
+            "profile": active.profile,
+        })
+        self._busy = False
+
+    def summary(self) -> str:
+        """Top-N text report: one section per stage."""
+        out = io.StringIO()
+        total_ms = (time.perf_counter() - self._start) * 1000
+        rss = peak_rss_mb()
+        out.write(f"Profiled run: {total_ms:.0f} ms wall")
+        if rss is not None:
+            out.write(f", peak RSS {rss:.1f} MB")
+        out.write(f", {sum(self.samples.values())} stack samples every {self.interval * 1000:g} ms\n\n")
+        for stage in self.stages:
+            out.write(f"{stage['stage']}: {stage['wall_ms']:.0f} ms")
+            if stage["rss_peak_mb"] is not None:
+                out.write(f", peak RSS so far {stage['rss_peak_mb']:.1f} MB")
+            if stage["traced_peak_mb"] is not None:
+                out.write(f", peak traced memory {stage['traced_peak_mb']:.1f} MB")
+            out.write("\n" + "=" * 100 + "\n")
+            stats = pstats.Stats(stage["profile"], stream=out)
+            stats.strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+            if stage["allocations"]:
+                out.write(f"Top {len(stage['allocations'])} allocation sites (growth during the stage):\n")
+                out.writelines(f"  {line}\n" for line in stage["allocations"])
+            out.write("\n")
+        return out.getvalue()
+
+    def write(self, base_path: str) -> Dict[str, str]:
+        """Write the summary, collapsed stacks and merged pstats; returns {suffix: path}."""
+        os.makedirs(os.path.dirname(base_path) or ".", exist_ok=True)
+        paths = {suffix: base_path + suffix for suffix in PROFILE_SUFFIXES}
+        with open(paths[".profile.txt"], "w", encoding="utf-8") as f:
+            f.write(self.summary())
+        with open(paths[".profile.collapsed"], "w", encoding="utf-8") as f:
+            f.writelines(f"{stack} {count}\n" for stack, count in sorted(self.samples.items()))
+        if self.stages:
+            merged = pstats.Stats(self.stages[0]["profile"])
+            for stage in self.stages[1:]:
+                merged.add(stage["profile"])
+            merged.dump_stats(paths[".profile.pstats"])
+        else:
+            del paths[".profile.pstats"]
+        return paths
+
+
+@contextmanager
+def profile_run(report: metrics.RunReport, output_dir: str, top: int = TOP_N) -> Iterator[RunProfiler]:
+    """
+    Profile the stages of a run. Files are named after report.path (the run report) if it
+    is set by the time the block exits. Joins the profiler already attached to the run.
+    """
+    if report.profiler is not None:
+        yield report.profiler
+        return
+    profiler = RunProfiler(top)
+    report.profiler = profiler
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        report.profiler = None
+        if report.path:
+            base = report.path[:-len(metrics.RUN_REPORT_SUFFIX)]
+        else:
+            base = os.path.join(output_dir, f"profile_{datetime.now().strftime('%Y-%m-%d_%H%M%S')}")
+        paths = profiler.write(base)
+        report.profile_files = [os.path.basename(path) for path in paths.values()]
+        print(f"Profile written to {paths['.profile.txt']} (flamegraph: {paths['.profile.collapsed']})")
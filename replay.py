@@ -0,0 +1,240 @@
+"""
+Record/replay for outbound HTTP sent through requests (NewsAPI, MarketAux, publisher pages),
+so full pipeline runs can be tested and benchmarked offline and deterministically.
+
+While a cassette is installed, every request sent by requests goes through it:
+
+- record: the request is sent and its response is added to the cassette, which is written
+  out when the cassette is uninstalled
+- replay: the response is served from the cassette (optionally after a fixed delay standing
+  in for upstream latency). A request that was not recorded raises CassetteMiss, a
+  requests.ConnectionError, so nothing reaches the network.
+
+Requests are matched on method, URL and query parameters, ignoring SECRET_PARAMS (which
+are also redacted from recordings) and the cassette's ignore_params (the date parameters
+by default, so a recording still replays on later days). Several responses recorded for
+the same request are served in turn, then the last one repeats. Requests to localhost
+are passed through.
+
+CLI and web app: HTTP_CASSETTE=<path> [HTTP_CASSETTE_MODE=record] [HTTP_REPLAY_LATENCY_MS=<ms>]
+In code:         with replay.cassette(path): ...
+
+Other upstreams have their own offline switches: Gemini (LLM_BACKEND=stub, see summariser)
+and Refinitiv (MARKET_DATA_PROVIDER=file:<csv>, see market_data). The extractor's
+Playwright layer is skipped while replaying.
+"""
+
+import atexit
+import base64
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+RECORD = "record"
+REPLAY = "replay"
+SECRET_PARAMS = ("apiKey", "api_token", "apikey", "key", "token")
+DEFAULT_IGNORE_PARAMS = ("from", "to", "published_after", "published_before")
+REDACTED = "REDACTED"
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1")
+# Not replayed: the recorded body is already decoded, and cookies are not worth keeping
+DROPPED_HEADERS = ("content-encoding", "content-length", "transfer-encoding", "set-cookie")
+
+
+class CassetteMiss(requests.ConnectionError):
+    pass
+
+
+def redact_url(url: str) -> str:
+    """URL with the values of SECRET_PARAMS replaced by REDACTED."""
+    parts = urlsplit(url)
+    params = [(name, REDACTED if name in SECRET_PARAMS else value) for name, value in parse_qsl(parts.query, keep_blank_values=True)]
+    return urlunsplit(parts._replace(query=urlencode(params)))
+
+
+class Cassette:
+    """Recorded HTTP interactions, stored as JSON at path."""
+
+    def __init__(self, path: str, mode: str = REPLAY, latency_ms: Optional[float] = None,
+                 ignore_params: Optional[List[str]] = None):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.latency_ms = latency_ms
+        self.ignore_params = list(DEFAULT_IGNORE_PARAMS if ignore_params is None else ignore_params)
+        self.interactions: List[Dict] = []
+        self.hits = 0
+        self.misses = 0
+        self._served: Counter = Counter()
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.interactions = data.get("interactions", [])
+            if ignore_params is None:
+                self.ignore_params = data.get("ignore_params", self.ignore_params)
+        elif mode == REPLAY:
+            raise FileNotFoundError(f"Cassette not found: {path}")
+        self._index = self._build_index()
+
+    @classmethod
+    def from_env(cls) -> Optional["Cassette"]:
+        path = os.getenv("HTTP_CASSETTE")
+        if not path:
+            return None
+        latency = os.getenv("HTTP_REPLAY_LATENCY_MS")
+        return cls(path, os.getenv("HTTP_CASSETTE_MODE", REPLAY), float(latency) if latency else None)
+
+    def key(self, method: str, url: str) -> str:
+        parts = urlsplit(url)
+        skipped = set(SECRET_PARAMS) | set(self.ignore_params)
+        params = sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True) if name not in skipped)
+        return f"{method.upper()} {parts.scheme}://{parts.netloc}{parts.path}?{urlencode(params)}"
+
+    def _build_index(self) -> Dict[str, List[Dict]]:
+        index: Dict[str, List[Dict]] = {}
+        for interaction in self.interactions:
+            request = interaction["request"]
+            index.setdefault(self.key(request["method"], request["url"]), []).append(interaction)
+        return index
+
+    def add(self, method: str, url: str, body, status: int = 200, headers: Optional[Dict[str, str]] = None,
+            elapsed_ms: Optional[float] = None) -> Dict:
+        """Add a response (str, bytes, or JSON-serialisable data) for method + url."""
+        headers = {name: value for name, value in (headers or {}).items() if name.lower() not in DROPPED_HEADERS}
+        if not isinstance(body, (str, bytes)):
+            body = json.dumps(body)
+            headers.setdefault("Content-Type", "application/json")
+        response = {"status": status, "headers": headers}
+        if isinstance(body, bytes):
+            try:
+                response["body"] = body.decode("utf-8")
+            except UnicodeDecodeError:
+                response["body_base64"] = base64.b64encode(body).decode("ascii")
+        else:
+            response["body"] = body
+        if elapsed_ms is not None:
+            response["elapsed_ms"] = round(elapsed_ms, 1)
+        interaction = {"request": {"method": method.upper(), "url": redact_url(url)}, "response": response}
+        with self._lock:
+            self.interactions.append(interaction)
+            self._index.setdefault(self.key(method, url), []).append(interaction)
+        return interaction
+
+    def lookup(self, method: str, url: str) -> Optional[Dict]:
+        """Next recorded interaction for method + url (the last one repeats), or None."""
+        key = self.key(method, url)
+        with self._lock:
+            recorded = self._index.get(key)
+            if not recorded:
+                self.misses += 1
+                return None
+            self.hits += 1
+            served = self._served[key]
+            self._served[key] += 1
+        return recorded[min(served, len(recorded) - 1)]
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"ignore_params": self.ignore_params, "interactions": self.interactions}, f, indent=1)
+            f.write("\n")
+        os.replace(tmp_path, self.path)
+
+
+def _response(interaction: Dict, request) -> requests.Response:
+    recorded = interaction["response"]
+    response = requests.Response()
+    response.status_code = recorded["status"]
+    response.headers = CaseInsensitiveDict(recorded.get("headers", {}))
+    if "body_base64" in recorded:
+        response._content = base64.b64decode(recorded["body_base64"])
+    else:
+        response._content = recorded.get("body", "").encode("utf-8")
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers) or "utf-8"
+    response.url = request.url
+    response.request = request
+    response.reason = "Replayed"
+    return response
+
+
+_installed: Optional[Cassette] = None
+_original_send = HTTPAdapter.send
+
+
+def _send(adapter, request, **kwargs):
+    cassette = _installed
+    if cassette is None or urlsplit(request.url).hostname in LOCAL_HOSTS:
+        return _original_send(adapter, request, **kwargs)
+    if cassette.mode == RECORD:
+        start = time.perf_counter()
+        response = _original_send(adapter, request, **kwargs)
+        cassette.add(request.method, request.url, response.content, response.status_code,
+                     dict(response.headers), (time.perf_counter() - start) * 1000)
+        return response
+    interaction = cassette.lookup(request.method, request.url)
+    if interaction is None:
+        raise CassetteMiss(f"No recorded response for {request.method} {redact_url(request.url)} in {cassette.path}",
+                           request=request)
+    if cassette.latency_ms:
+        time.sleep(cassette.latency_ms / 1000)
+    return _response(interaction, request)
+
+
+def install(cassette: Cassette) -> None:
+    """Route requests through the cassette for the whole process (all threads)."""
+    global _installed
+    _installed = cassette
+    HTTPAdapter.send = _send
+    print(f"HTTP {cassette.mode}: {cassette.path} ({len(cassette.interactions)} recorded interactions)")
+
+
+def uninstall() -> None:
+    """Restore direct HTTP; a recording cassette is written out."""
+    global _installed
+    cassette, _installed = _installed, None
+    HTTPAdapter.send = _original_send
+    if cassette is not None and cassette.mode == RECORD:
+        cassette.save()
+        print(f"Recorded {len(cassette.interactions)} interactions to {cassette.path}")
+
+
+def install_from_env() -> Optional[Cassette]:
+    """
+    Install the cassette configured by HTTP_CASSETTE, if any and none is installed yet;
+    a recording is written at exit.
+    """
+    if _installed is not None:
+        return _installed
+    cassette = Cassette.from_env()
+    if cassette is not None:
+        install(cassette)
+        if cassette.mode == RECORD:
+            atexit.register(uninstall)
+    return cassette
+
+
+def active() -> Optional[Cassette]:
+    """The installed cassette, if any."""
+    return _installed
+
+
+@contextmanager
+def cassette(path: str, mode: str = REPLAY, latency_ms: Optional[float] = None,
+             ignore_params: Optional[List[str]] = None) -> Iterator[Cassette]:
+    installed = Cassette(path, mode, latency_ms, ignore_params)
+    install(installed)
+    try:
+        yield installed
+    finally:
+        uninstall()
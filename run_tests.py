@@ -1,3 +1,11 @@
+import os
+import subprocess
 import pytest
 import sys
-sys.exit(pytest.main(["-v", "tests"]))
+
+status = pytest.main(["-v", "tests"])
+if "--bench" in sys.argv:
+    # Offline micro-benchmarks compared with benchmarks/baseline_micro.json (sizes up to 1k)
+    bench = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "bench_micro.py")
+    status = status or subprocess.run([sys.executable, bench, "--compare", "--quick"]).returncode
+sys.exit(status)
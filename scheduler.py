@@ -0,0 +1,126 @@
+"""
+Pre-ingestion scheduler: keeps the local stores warm so briefing generation doesn't wait
+on upstream APIs.
+
+Tasks (run with `python main.py --serve-scheduler`):
+- news: NewsAPI candidates -> enrich -> score -> dedup (ingest.ingest_news)
+- fund_news: MarketAux fund news (fund_news_fetcher.fetch_news_for_funds)
+- fund_data: fund price/NAV refresh (fund_info.refresh_fund_data, skipped while current)
+
+Last-run times are kept in data/scheduler_state.json, so a restarted scheduler only runs
+the tasks that are due.
+"""
+
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+SCHEDULER_STATE_PATH = "data/scheduler_state.json"
+POLL_SECONDS = 30
+
+
+def _ingest_news():
+    from ingest import ingest_news
+    return ingest_news()
+
+
+def _ingest_fund_news():
+    from fund_news_fetcher import fetch_news_for_funds
+    return fetch_news_for_funds()
+
+
+def _refresh_fund_data():
+    from fund_info import refresh_fund_data
+    return refresh_fund_data()
+
+
+# name -> (interval in seconds, task)
+DEFAULT_TASKS: Dict[str, tuple] = {
+    "news": (30 * 60, _ingest_news),
+    "fund_news": (60 * 60, _ingest_fund_news),
+    "fund_data": (60 * 60, _refresh_fund_data),
+}
+
+
+def load_state(path: str = SCHEDULER_STATE_PATH) -> Dict[str, Dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_state(state: Dict[str, Dict], path: str) -> None:
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+class Scheduler:
+    """Runs each task when its interval has elapsed since its last run."""
+
+    def __init__(self, tasks: Optional[Dict[str, tuple]] = None, state_path: str = SCHEDULER_STATE_PATH,
+                 clock: Callable[[], float] = time.time):
+        self.tasks = tasks if tasks is not None else DEFAULT_TASKS
+        self.state_path = state_path
+        self.clock = clock
+
+    def due(self) -> List[str]:
+        state = load_state(self.state_path)
+        now = self.clock()
+        return [name for name, (interval, _) in self.tasks.items()
+                if now - state.get(name, {}).get("last_run", 0) >= interval]
+
+    def run_task(self, name: str) -> bool:
+        """Run one task and record the outcome. Errors are logged, not raised."""
+        _, task = self.tasks[name]
+        started = self.clock()
+        print(f"[scheduler] {name}: starting")
+        try:
+            result = task()
+            # refresh_fund_data reports failure by returning False rather than raising
+            status, error = ("error", "task reported failure") if result is False else ("ok", None)
+            print(f"[scheduler] {name}: done in {self.clock() - started:.1f}s ({result})")
+        except Exception as e:
+            status, error = "error", str(e)
+            print(f"[scheduler] {name}: failed: {e}")
+        state = load_state(self.state_path)
+        state[name] = {
+            "last_run": started,
+            "last_run_at": datetime.fromtimestamp(started).isoformat(timespec="seconds"),
+            "status": status,
+            "error": error,
+            "duration_s": round(self.clock() - started, 3),
+        }
+        _save_state(state, self.state_path)
+        return status == "ok"
+
+    def run_pending(self) -> List[str]:
+        due = self.due()
+        for name in due:
+            self.run_task(name)
+        return due
+
+    def serve(self, poll_seconds: float = POLL_SECONDS) -> None:
+        """Run due tasks forever."""
+        print(f"[scheduler] serving tasks: {', '.join(self.tasks)}")
+        try:
+            while True:
+                self.run_pending()
+                time.sleep(poll_seconds)
+        except KeyboardInterrupt:
+            print("[scheduler] stopped")
+
+
+def serve_scheduler(once: bool = False) -> None:
+    scheduler = Scheduler()
+    if once:
+        scheduler.run_pending()
+    else:
+        scheduler.serve()
@@ -1,19 +1,25 @@
+from functools import lru_cache
 from typing import List, Dict
-from textblob import TextBlob
-from textblob.sentiments import NaiveBayesAnalyzer
-from nltk.sentiment import SentimentIntensityAnalyzer
 
-def score_article(article: dict) -> str:
-    """
-    Returns the sentiment classification ('pos', 'neg', or 'neutral') of the article
-    using VADER sentiment analysis on the title + description.
-    """
+
+@lru_cache(maxsize=1)
+def _sentiment_analyzer():
+    """VADER analyser, created once; nltk is only imported when sentiment is first needed."""
     import nltk
+    from nltk.sentiment import SentimentIntensityAnalyzer
     try:
         nltk.data.find('sentiment/vader_lexicon.zip')
     except LookupError:
         nltk.download('vader_lexicon', quiet=True)
-    sia = SentimentIntensityAnalyzer()
+    return SentimentIntensityAnalyzer()
+
+
+def score_article(article: dict) -> str:
+    """
+    Returns the sentiment classification ('pos', 'neg', or 'neutral') of the article
+    using VADER sentiment analysis on the title + description.
+    """
+    sia = _sentiment_analyzer()
     text = f"{article.get('title', '')} {article.get('description', '')}".strip()
     if not text:
         return "neutral"  # fallback if article is empty
@@ -0,0 +1,116 @@
+"""
+Local store for human screening runs.
+
+/generate writes the fetched candidates once into a SQLite table (data/screening.db) under
+a run id; the Flask session then only carries the run id, the cursor and the set of
+accepted article positions, so each screening click reads a single row instead of
+re-pickling the whole article list.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+SCREENING_DB_PATH = "data/screening.db"
+RUN_RETENTION_HOURS = 24
+
+_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS runs (
+        id TEXT PRIMARY KEY,
+        total INTEGER NOT NULL,
+        created_at TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS run_articles (
+        run_id TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        article TEXT NOT NULL,
+        PRIMARY KEY (run_id, position)
+    )
+    """,
+]
+
+
+class ScreeningStore:
+    """Screening runs: an ordered list of candidate articles addressed by (run id, position)."""
+
+    def __init__(self, db_path: str = SCREENING_DB_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def create_run(self, articles: List[Dict]) -> str:
+        """Persist the candidates for a new screening run and return its id. Expired runs are pruned."""
+        run_id = uuid.uuid4().hex
+        now = datetime.now()
+        with self._lock, self._connect() as conn:
+            conn.execute("INSERT INTO runs (id, total, created_at) VALUES (?, ?, ?)",
+                         (run_id, len(articles), now.isoformat(timespec="seconds")))
+            conn.executemany(
+                "INSERT INTO run_articles (run_id, position, article) VALUES (?, ?, ?)",
+                ((run_id, i, json.dumps(article, ensure_ascii=False)) for i, article in enumerate(articles)),
+            )
+            self._prune(conn, now - timedelta(hours=RUN_RETENTION_HOURS))
+        return run_id
+
+    def _prune(self, conn: sqlite3.Connection, cutoff: datetime) -> None:
+        expired = [row[0] for row in conn.execute(
+            "SELECT id FROM runs WHERE created_at < ?", (cutoff.isoformat(timespec="seconds"),))]
+        for run_id in expired:
+            conn.execute("DELETE FROM run_articles WHERE run_id = ?", (run_id,))
+            conn.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+
+    def total(self, run_id: str) -> Optional[int]:
+        """Number of candidates in the run, or None if the run does not exist (or has expired)."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT total FROM runs WHERE id = ?", (run_id,)).fetchone()
+        return row[0] if row else None
+
+    def get_article(self, run_id: str, position: int) -> Optional[Dict]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT article FROM run_articles WHERE run_id = ? AND position = ?",
+                               (run_id, position)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_articles(self, run_id: str, positions: Iterable[int]) -> List[Dict]:
+        """Articles at the given positions, in screening order."""
+        positions = sorted(set(positions))
+        if not positions:
+            return []
+        placeholders = ", ".join("?" for _ in positions)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT article FROM run_articles WHERE run_id = ? AND position IN ({placeholders}) ORDER BY position",
+                (run_id, *positions),
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def delete_run(self, run_id: str) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM run_articles WHERE run_id = ?", (run_id,))
+            conn.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+
+
+_store: Optional[ScreeningStore] = None
+_store_lock = threading.Lock()
+
+
+def get_screening_store() -> ScreeningStore:
+    """Process-wide ScreeningStore, created on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ScreeningStore()
+        return _store
@@ -1,12 +1,96 @@
-import google.generativeai as genai
-from typing import Dict, Tuple
+import os
+import re
+import time
+import zlib
+from types import SimpleNamespace
+from typing import Dict, Optional, Tuple
 
+import metrics
 
-def configure_model(api_key: str):
-    """Configures Gemini API and returns the model + chat session."""
+genai = None  # google.generativeai: slow to import, so loaded on first use (see _genai)
+
+STUB_TOPICS = ["Regulatory & Policy", "Corporate Action", "Market Trends", "New Technology", "General News"]
+
+
+def _genai():
+    global genai
+    if genai is None:
+        import google.generativeai
+        genai = google.generativeai
+    return genai
+
+
+def _record_usage(call: str, response, start: float, status: str = "ok") -> None:
+    """Request latency, status and the token counts Gemini reports in usage_metadata."""
+    metrics.observe("llm_request_seconds", time.perf_counter() - start, call=call)
+    metrics.inc("llm_requests_total", call=call, status=status)
+    usage = getattr(response, "usage_metadata", None)
+    for kind, field in (("prompt", "prompt_token_count"), ("output", "candidates_token_count")):
+        count = getattr(usage, field, None)
+        if isinstance(count, int):
+            metrics.inc("llm_tokens_total", count, call=call, kind=kind)
+
+
+def llm_backend(spec: Optional[str] = None) -> Tuple[str, float]:
+    """
+    Parse a backend spec: 'gemini' (default) or 'stub[:<latency_ms>]'.
+    Falls back to the LLM_BACKEND environment variable. Returns (name, latency_ms).
+    """
+    spec = spec or os.getenv("LLM_BACKEND") or "gemini"
+    name, _, latency = spec.partition(":")
+    if name not in ("gemini", "stub"):
+        raise ValueError(f"Unknown LLM backend: {spec}")
+    return name, float(latency) if latency else 0.0
+
+
+class StubModel:
+    """
+    Offline stand-in for the Gemini model (LLM_BACKEND=stub): generate_content waits
+    latency_ms, then answers deterministically from the prompt in the shape the pipeline
+    parses (three bullets, Topic, Mentioned Companies), with word counts as token usage.
+    """
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_ms = latency_ms
+        self.calls = 0
+
+    def start_chat(self):
+        return self
+
+    def generate_content(self, prompt):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        self.calls += 1
+        text = "\n".join(prompt) if isinstance(prompt, list) else prompt
+        if isinstance(prompt, list):
+            # generate_intro: [system prompt, prompt listing the summaries]
+            first = re.search(r"^[-\s]*-\s+(.+)$", text, re.MULTILINE)
+            answer = "This week's briefing brings together the latest developments in sustainable finance."
+            if first:
+                answer += f" {first.group(1)}"
+        else:
+            # generate_summary: the article text ends the prompt
+            sentences = [s for s in re.split(r"(?<=[.!?])\s+", text.split("\n\n")[-1].strip()) if s]
+            topic = STUB_TOPICS[zlib.crc32(text.encode("utf-8")) % len(STUB_TOPICS)]
+            answer = "\n".join(f"- {sentence}" for sentence in sentences[-3:])
+            answer += f"\nTopic: {topic}\nMentioned Companies: None"
+        usage = SimpleNamespace(prompt_token_count=len(text.split()), candidates_token_count=len(answer.split()))
+        return SimpleNamespace(text=answer, parts=[answer], usage_metadata=usage)
+
+
+def configure_model(api_key: str, backend: Optional[str] = None):
+    """
+    Configures Gemini API and returns the model + chat session.
+    With backend (or LLM_BACKEND) 'stub[:<latency_ms>]', returns a StubModel instead.
+    """
+    name, latency_ms = llm_backend(backend)
+    if name == "stub":
+        model = StubModel(latency_ms)
+        return model, model.start_chat()
     try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('models/gemini-2.0-flash')
+        client = _genai()
+        client.configure(api_key=api_key)
+        model = client.GenerativeModel('models/gemini-2.0-flash')
         chat = model.start_chat()
         return model, chat
     except Exception as e:
@@ -25,11 +109,17 @@ def generate_summary(model, article_text: str) -> str:
         "'Regulatory & Policy', 'Corporate Action', 'Market Trends', 'New Technology', or 'General News'.\n"
         "At the very end, add a 'Mentioned Companies:' line and list any public companies mentioned in the article. Double check this, companies will most likely be mentioned "
         "If none, write 'None only for mentioned comapnies, make sure there is a topic'.\n"
-        "Also in terms of formating do not have an introduction like 'here is the summary' just start with bullet points"
+        "Also in terms of formating do not have an introduction like 'here is the summary' just start with bullet points\n\n"
         f"{article_text}"
     )
+    start = time.perf_counter()
     try:
         response = model.generate_content(prompt)
+    except Exception as e:
+        _record_usage("summary", None, start, "error")
+        return f"[Error generating summary: {str(e)}]"
+    _record_usage("summary", response, start, "ok" if response.parts else "empty")
+    try:
         return response.text.strip() if response.parts else "[Error: Empty response from Gemini]"
     except Exception as e:
         return f"[Error generating summary: {str(e)}]"
@@ -57,5 +147,11 @@ def generate_intro(model, summaries, topics=None, sentiment_stats=None):
         "Do not have any intro or outro like 'here is the intro' just start with the overall summary"
     )
 
-    response = model.generate_content([system_prompt, prompt])
+    start = time.perf_counter()
+    try:
+        response = model.generate_content([system_prompt, prompt])
+    except Exception:
+        _record_usage("intro", None, start, "error")
+        raise
+    _record_usage("intro", response, start)
     return response.text.strip()
@@ -0,0 +1,41 @@
+from datetime import date
+
+import pytest
+
+import summariser
+
+FUNDS = {"AEET.L": "Aquila Energy Efficiency Trust", "AERS.L": "Aquila European Renewables"}
+
+
+@pytest.fixture
+def articles():
+    """Three NewsAPI-style articles on different stories, so none is filtered or deduplicated."""
+    return [
+        {"title": title, "description": "Financing closed.",
+         "content": f"Developer {i} closed a refinancing. The portfolio is contracted. Investors welcomed the deal.",
+         "url": f"https://news.example.com/{i}", "publishedAt": "2025-06-17T10:00:00Z", "source": {"name": "Example Wire"}}
+        for i, title in enumerate(["Offshore wind developer secures financing", "Solar fund cuts guidance",
+                                   "Grid operator wins interconnector auction"])
+    ]
+
+
+@pytest.fixture
+def stub_model(tmp_path, monkeypatch):
+    """
+    Offline workspace in tmp_path (the working directory): the FUNDS list, their prices from a
+    local file and the stub LLM. Every run shares the returned stub model, so its calls can be
+    counted.
+    """
+    history = tmp_path / "history.csv"
+    history.write_text("Ticker,Date,Close Price,NAV\n"
+                       + "".join(f"{ticker},{date.today().isoformat()},0.5,1.0\n" for ticker in FUNDS))
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "listed_funds_tickers.csv").write_text(
+        "Investment trust name,Ticker\n" + "".join(f"{name},{ticker}\n" for ticker, name in FUNDS.items()))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("LLM_BACKEND", "stub")
+    monkeypatch.setenv("MARKET_DATA_PROVIDER", f"file:{history}")
+    monkeypatch.setattr("scorer.score_article", lambda article: "Neutral")  # VADER's lexicon is a download
+    stub = summariser.StubModel()
+    monkeypatch.setattr(summariser, "configure_model", lambda api_key, backend=None: (stub, stub))
+    return stub
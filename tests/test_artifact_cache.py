@@ -0,0 +1,93 @@
+import gzip
+import os
+import pytest
+import artifact_cache
+from formatter import write_briefing_outputs
+
+
+@pytest.fixture
+def sample_briefing():
+    return {
+        "title": "SAFL End of Week Briefing",
+        "date": "2025-06-18",
+        "intro": "Weekly update.",
+        "articles": [
+            {"title": "Green bonds rise", "summary": "- Demand is strong.", "url": "https://example.com", "date": "2025-06-17", "source": "ESG Newswire"}
+        ],
+    }
+
+
+def test_briefing_hash_is_stable_and_content_sensitive(sample_briefing):
+    digest = artifact_cache.briefing_hash(sample_briefing, "v1")
+    assert digest == artifact_cache.briefing_hash(dict(sample_briefing), "v1")
+    assert digest != artifact_cache.briefing_hash(sample_briefing, "v2")
+    changed = dict(sample_briefing, intro="Different intro.")
+    assert digest != artifact_cache.briefing_hash(changed, "v1")
+
+
+def test_write_briefing_outputs_reuses_cached_artifacts(tmp_path, sample_briefing, monkeypatch):
+    md_path, html_path = tmp_path / "briefing_2025-06-18.md", tmp_path / "briefing_2025-06-18.html"
+    write_briefing_outputs(sample_briefing, str(md_path), str(html_path), None)
+    manifest = artifact_cache.load_manifest(str(tmp_path))
+    assert len(manifest) == 1
+
+    def fail_render(*args, **kwargs):
+        raise AssertionError("cached briefing should not be re-rendered")
+
+    monkeypatch.setattr("formatter.generate_html", fail_render)
+    monkeypatch.setattr("formatter.generate_markdown", fail_render)
+    copy_md, copy_html = tmp_path / "briefing_2025-06-18_copy.md", tmp_path / "briefing_2025-06-18_copy.html"
+    write_briefing_outputs(sample_briefing, str(copy_md), str(copy_html), None)
+    assert copy_html.read_text(encoding="utf-8") == html_path.read_text(encoding="utf-8")
+    assert os.path.samefile(copy_md, md_path)
+    entry = next(iter(artifact_cache.load_manifest(str(tmp_path)).values()))
+    assert set(entry["outputs"]) == {md_path.name, html_path.name, copy_md.name, copy_html.name}
+
+
+def test_overwriting_output_does_not_corrupt_cache(tmp_path, sample_briefing):
+    html_path = tmp_path / "briefing_2025-06-18.html"
+    write_briefing_outputs(sample_briefing, None, str(html_path), None)
+    first = html_path.read_text(encoding="utf-8")
+    write_briefing_outputs(dict(sample_briefing, intro="Another briefing."), None, str(html_path), None)
+    assert "Another briefing." in html_path.read_text(encoding="utf-8")
+    digest_files = [p for p in (tmp_path / ".artifacts").iterdir() if p.suffix == ".html"]
+    assert first in [p.read_text(encoding="utf-8") for p in digest_files]
+
+
+def test_html_artifacts_get_gzip_sibling(tmp_path, sample_briefing):
+    html_path = tmp_path / "briefing_2025-06-18.html"
+    write_briefing_outputs(sample_briefing, None, str(html_path), None)
+    digest = next(iter(artifact_cache.load_manifest(str(tmp_path))))
+
+    assert artifact_cache.is_artifact(str(tmp_path), digest, "html", str(html_path))
+    gz_path = artifact_cache.compressed_path(str(tmp_path), digest, "html", "gzip")
+    with gzip.open(gz_path, "rb") as f:
+        assert f.read() == html_path.read_bytes()
+    assert artifact_cache.compressed_path(str(tmp_path), digest, "markdown", "gzip") is None
+
+
+def test_release_removes_artifacts_no_output_refers_to(tmp_path, sample_briefing):
+    md_path, html_path = tmp_path / "briefing_2025-06-18.md", tmp_path / "briefing_2025-06-18.html"
+    write_briefing_outputs(sample_briefing, str(md_path), str(html_path), None)
+    write_briefing_outputs(sample_briefing, None, str(tmp_path / "briefing_2025-06-18_copy.html"), None)
+    digest = next(iter(artifact_cache.load_manifest(str(tmp_path))))
+
+    assert artifact_cache.release(str(tmp_path), [md_path.name, html_path.name]) == []  # the copy still uses them
+    assert artifact_cache.load_manifest(str(tmp_path))[digest]["outputs"] == ["briefing_2025-06-18_copy.html"]
+    assert artifact_cache.release(str(tmp_path), ["briefing_2025-06-18_copy.html"]) == [digest]
+    assert artifact_cache.load_manifest(str(tmp_path)) == {}
+    assert [p.name for p in (tmp_path / ".artifacts").iterdir()] == ["manifest.json"]
+
+
+def test_deleting_a_briefing_removes_its_artifacts(tmp_path, sample_briefing, monkeypatch):
+    from app import create_app
+
+    monkeypatch.setattr("app.routes.OUTPUT_DIR", str(tmp_path))
+    write_briefing_outputs(sample_briefing, str(tmp_path / "briefing_2025-06-18.md"),
+                           str(tmp_path / "briefing_2025-06-18.html"), None)
+
+    response = create_app().test_client().post("/delete_briefing/2025-06-18_daily")
+
+    assert response.get_json() == {"success": True}
+    assert artifact_cache.load_manifest(str(tmp_path)) == {}
+    assert [p.name for p in (tmp_path / ".artifacts").iterdir()] == ["manifest.json"]
@@ -0,0 +1,59 @@
+import os
+from datetime import date
+
+import pytest
+
+import replay
+from batch import fund_subset, run_batch, union_keywords, validate_specs
+from news_fetcher import everything_url
+
+SPECS = [
+    {"name": "client-a", "keywords": ["offshore wind", "green bonds"]},
+    {"name": "client-b", "keywords": ["Green Bonds", "solar"], "funds": ["AEET.L"]},
+]
+TITLES = ["Developer secures financing", "Issuer prices debut deal", "Bank launches framework", "Fund cuts guidance"]
+
+
+def article(i, keyword):
+    return {"title": TITLES[i], "description": f"An update on {keyword}.",
+            "content": f"Company {i} reported on {keyword}. The market reacted. Investors welcomed the deal.",
+            "url": f"https://news.example.com/{i}", "publishedAt": f"{date.today().isoformat()}T08:00:00Z",
+            "source": {"name": "Example Wire"}}
+
+
+def test_batch_fetches_and_summarises_shared_articles_once(tmp_path, stub_model):
+    pool = [article(0, "offshore wind"), article(1, "green bonds"), article(2, "green bonds"), article(3, "solar")]
+    cassette = replay.Cassette(str(tmp_path / "cassette.json"), replay.RECORD)
+    cassette.add("GET", everything_url(union_keywords(SPECS), 3), {"status": "ok", "totalResults": 4, "articles": pool})
+    cassette.save()
+
+    output_dir = str(tmp_path / "output")
+    with replay.cassette(cassette.path) as active:
+        result = run_batch(SPECS, output_dir=output_dir, pdf=False, use_corpus=False)
+
+    assert active.hits == 1
+    assert result["shared"]["articles_summarised"] == 4
+    assert result["separate_runs"] == {"fetches": 2, "articles_summarised": 6, "gemini_requests": 8}
+    assert stub_model.calls == 4 + 2  # each distinct article once, an intro per briefing
+    a, b = result["briefings"]
+    markdown_a = open(os.path.join(output_dir, a["markdown"]), encoding="utf-8").read()
+    markdown_b = open(os.path.join(output_dir, b["markdown"]), encoding="utf-8").read()
+    assert a["markdown"].endswith("_client-a.md") and b["markdown"].endswith("_client-b.md")
+    assert "Company 0 reported" in markdown_a and "Company 3 reported" not in markdown_a
+    assert "Company 3 reported" in markdown_b and "Company 0 reported" not in markdown_b
+    assert "Company 1 reported" in markdown_a and "Company 1 reported" in markdown_b
+    assert os.path.exists(os.path.join(output_dir, result["run_report"]))
+
+
+def test_fund_subset_and_spec_validation():
+    section = {"best_performers": [{"Fund Name": "Aquila European Renewables", "Ticker": "AERS.L"}],
+               "worst_performers": [{"Fund Name": "Aquila Energy Efficiency Trust", "Ticker": "AEET.L"}],
+               "last_updated": "2025-06-18 09:00:00"}
+    assert fund_subset(section, ["aeet.l"]) == dict(section, best_performers=[])
+    assert fund_subset(section, []) is section
+
+    assert validate_specs([{"name": "a", "keywords": ["solar"]}])[0]["from_days_ago"] == 3
+    with pytest.raises(ValueError):
+        validate_specs([{"name": "a b", "keywords": ["solar"]}])
+    with pytest.raises(ValueError):
+        validate_specs([{"name": "a", "keywords": ["solar"]}, {"name": "a", "keywords": ["wind"]}])
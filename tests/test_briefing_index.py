@@ -0,0 +1,126 @@
+import os
+import zipfile
+from datetime import datetime
+
+import briefing_index
+
+
+def touch(directory, name, content="x"):
+    path = os.path.join(directory, name)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+    return path
+
+
+def test_first_use_indexes_existing_files(tmp_path):
+    for name in ["briefing_2025-01-02.md", "briefing_2025-01-02.html", "briefing_2025-01-03_energy_focus.pdf",
+                 "notes.txt", "briefing_bad.md"]:
+        touch(tmp_path, name)
+
+    briefings = briefing_index.list_briefings(str(tmp_path))
+
+    assert [b["group_key"] for b in briefings] == ["2025-01-03_energy_focus", "2025-01-02_daily"]
+    assert briefings[0]["name"] == "Briefing for 2025-01-03 (Energy Focus)"
+    assert briefings[1]["files"] == {"md": "briefing_2025-01-02.md", "html": "briefing_2025-01-02.html"}
+    assert briefings[1]["datetime"] == datetime(2025, 1, 2)
+
+
+def test_record_remove_and_paginate(tmp_path):
+    paths = [touch(tmp_path, f"briefing_2025-02-{day:02d}.md") for day in range(1, 8)]
+    briefing_index.record_files(paths, {"title": "Daily", "articles": 4, "digest": "abc"})
+    briefing_index.record_files([touch(tmp_path, "briefing_2025-02-07.html")])
+
+    assert briefing_index.count_briefings(str(tmp_path)) == 7
+    page = briefing_index.list_briefings(str(tmp_path), limit=3, offset=3)
+    assert [b["date"] for b in page] == ["2025-02-04", "2025-02-03", "2025-02-02"]
+    latest = briefing_index.get_briefing(str(tmp_path), "2025-02-07_daily")
+    assert latest["files"] == {"md": "briefing_2025-02-07.md", "html": "briefing_2025-02-07.html"}
+    assert latest["articles"] == 4  # metadata kept when a later write omits it
+
+    briefing_index.remove_files(str(tmp_path), ["briefing_2025-02-07.md"])
+    assert briefing_index.get_briefing(str(tmp_path), "2025-02-07_daily")["files"] == {"html": "briefing_2025-02-07.html"}
+    briefing_index.remove_files(str(tmp_path), ["briefing_2025-02-07.html"])
+    assert briefing_index.get_briefing(str(tmp_path), "2025-02-07_daily") is None
+
+
+def test_rebuild_picks_up_changes_on_disk(tmp_path):
+    briefing_index.record_files([touch(tmp_path, "briefing_2025-03-01.md")])
+    os.remove(tmp_path / "briefing_2025-03-01.md")
+    touch(tmp_path, "briefing_2025-03-02.pdf")
+
+    assert briefing_index.rebuild(str(tmp_path)) == 1
+    assert [b["group_key"] for b in briefing_index.list_briefings(str(tmp_path))] == ["2025-03-02_daily"]
+
+
+def test_archive_bundles_old_briefings(tmp_path):
+    briefing_index.record_files([touch(tmp_path, "briefing_2025-01-05.md", "old"),
+                                 touch(tmp_path, "briefing_2025-01-05.html", "<p>old</p>"),
+                                 touch(tmp_path, "briefing_2025-03-01.md", "new")])
+
+    archived = briefing_index.archive_older_than(str(tmp_path), 30, today=datetime(2025, 3, 2))
+
+    assert archived == ["2025-01-05_daily"]
+    assert not os.path.exists(tmp_path / "briefing_2025-01-05.md")
+    with zipfile.ZipFile(tmp_path / "archive" / "briefings_2025-01.zip") as zf:
+        assert sorted(zf.namelist()) == ["briefing_2025-01-05.html", "briefing_2025-01-05.md"]
+        assert zf.read("briefing_2025-01-05.md") == b"old"
+    assert briefing_index.get_briefing(str(tmp_path), "2025-01-05_daily")["archive"] == "briefings_2025-01.zip"
+    assert briefing_index.count_briefings(str(tmp_path), include_archived=False) == 1
+
+    # Archived entries survive a rebuild, since their files are no longer on disk
+    briefing_index.rebuild(str(tmp_path))
+    assert briefing_index.count_briefings(str(tmp_path)) == 2
+
+
+def test_file_info_keeps_digest_and_excerpt(tmp_path):
+    lines = "".join(f"line {i}\n" for i in range(30))
+    briefing_index.record_files([touch(tmp_path, "briefing_2025-04-01.md", lines),
+                                 touch(tmp_path, "briefing_2025-04-01.pdf")], {"digest": "d1"})
+
+    info = briefing_index.get_file_info(str(tmp_path), "briefing_2025-04-01.md")
+    assert info == {"digest": "d1", "excerpt": "".join(f"line {i}\n" for i in range(20))}
+    assert briefing_index.get_file_info(str(tmp_path), "briefing_2025-04-01.pdf")["excerpt"] is None
+    assert briefing_index.get_file_info(str(tmp_path), "briefing_2025-04-02.md") is None
+
+    # Files indexed from disk have no digest to serve as an ETag
+    briefing_index.rebuild(str(tmp_path))
+    assert briefing_index.get_file_info(str(tmp_path), "briefing_2025-04-01.md")["digest"] is None
+
+
+def test_archive_keeps_a_regenerated_file_already_in_the_bundle(tmp_path):
+    briefing_index.record_files([touch(tmp_path, "briefing_2025-01-05.md", "first")])
+    briefing_index.archive_older_than(str(tmp_path), 30, today=datetime(2025, 3, 2))
+    # Regenerated after archiving: same name, different content; then an identical copy of that
+    briefing_index.record_files([touch(tmp_path, "briefing_2025-01-05.md", "second")])
+    briefing_index.archive_older_than(str(tmp_path), 30, today=datetime(2025, 3, 2))
+    briefing_index.record_files([touch(tmp_path, "briefing_2025-01-05.md", "second")])
+    briefing_index.archive_older_than(str(tmp_path), 30, today=datetime(2025, 3, 2))
+
+    assert not os.path.exists(tmp_path / "briefing_2025-01-05.md")
+    with zipfile.ZipFile(tmp_path / "archive" / "briefings_2025-01.zip") as zf:
+        assert sorted(zf.namelist()) == ["briefing_2025-01-05.md", "briefing_2025-01-05_2.md"]
+        assert zf.read("briefing_2025-01-05.md") == b"first"
+        assert zf.read("briefing_2025-01-05_2.md") == b"second"
+
+
+def test_archiving_releases_cached_artifacts(tmp_path):
+    from formatter import write_briefing_outputs
+
+    briefing = {"title": "Briefing", "date": "2025-01-05", "intro": "Old.", "articles": []}
+    write_briefing_outputs(briefing, str(tmp_path / "briefing_2025-01-05.md"), str(tmp_path / "briefing_2025-01-05.html"), None)
+    assert briefing_index.archive_older_than(str(tmp_path), 30, today=datetime(2025, 3, 2)) == ["2025-01-05_daily"]
+    assert [p.name for p in (tmp_path / ".artifacts").iterdir()] == ["manifest.json"]
+
+
+def test_archived_briefings_link_only_to_their_bundle(tmp_path, monkeypatch):
+    from app import create_app
+
+    monkeypatch.setattr("app.utils.OUTPUT_DIR", str(tmp_path))
+    briefing_index.record_files([touch(tmp_path, "briefing_2025-01-05.html", "<p>old</p>"),
+                                 touch(tmp_path, "briefing_2025-03-01.html", "<p>new</p>")])
+    briefing_index.archive_older_than(str(tmp_path), 30, today=datetime(2025, 3, 2))
+
+    page = create_app().test_client().get("/briefings").get_data(as_text=True)
+
+    assert "/archive/briefings_2025-01.zip" in page
+    assert "briefing_2025-03-01.html" in page and "briefing_2025-01-05.html" not in page
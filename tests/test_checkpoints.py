@@ -0,0 +1,123 @@
+import os
+from datetime import date
+
+import pytest
+
+import summariser
+from checkpoints import FAILED, RunCheckpoint, list_runs, run_exists
+from main import generate_briefing_from_articles, resume_briefing
+
+
+def test_resume_after_intro_failure_reuses_summaries(tmp_path, stub_model, articles, monkeypatch):
+    output_dir = str(tmp_path / "output")
+    generate_intro = summariser.generate_intro
+
+    def failing_intro(model, summaries):
+        raise RuntimeError("Gemini quota exceeded")
+
+    monkeypatch.setattr(summariser, "generate_intro", failing_intro)
+    with pytest.raises(RuntimeError):
+        generate_briefing_from_articles(articles, output_dir=output_dir, pdf=False, run_id="20250617-100000-abc123")
+    assert stub_model.calls == 3
+    [run] = list_runs(output_dir)
+    assert run["run_id"] == "20250617-100000-abc123" and run["status"] == FAILED
+    assert run["error"] == "Gemini quota exceeded"
+    assert run["completed"] == ["unique", "summaries", "fund_performance"]
+
+    monkeypatch.setattr(summariser, "generate_intro", generate_intro)
+    stages = []
+    result = resume_briefing("20250617-100000-abc123", output_dir=output_dir, pdf=False, progress=stages.append)
+
+    assert stub_model.calls == 4  # only the intro was redone
+    assert result["run_id"] == "20250617-100000-abc123"
+    assert result["markdown"] == f"briefing_{date.today().isoformat()}.md"  # not named after a stage
+    assert stages == ["fund_refresh", "summarise", "build", "render"]
+    markdown = open(os.path.join(output_dir, result["markdown"]), encoding="utf-8").read()
+    assert "Developer 2 closed a refinancing" in markdown and "This week's briefing" in markdown
+    assert list_runs(output_dir) == []  # checkpoints are removed once the run succeeds
+
+
+def test_resume_after_render_failure_only_renders(tmp_path, stub_model, articles, monkeypatch):
+    import formatter
+
+    output_dir = str(tmp_path / "output")
+    write_briefing_outputs = formatter.write_briefing_outputs
+
+    def crash(*args, **kwargs):
+        raise RuntimeError("Chromium crashed")
+
+    monkeypatch.setattr(formatter, "write_briefing_outputs", crash)
+    with pytest.raises(RuntimeError):
+        generate_briefing_from_articles(articles, output_dir=output_dir, pdf=False)
+    [run] = list_runs(output_dir)
+    assert "briefing" in run["completed"]
+    calls = stub_model.calls
+
+    monkeypatch.setattr(formatter, "write_briefing_outputs", write_briefing_outputs)
+    monkeypatch.setattr(summariser, "configure_model", lambda api_key, backend=None: pytest.fail("model configured"))
+    result = resume_briefing(run["run_id"], output_dir=output_dir, pdf=False)
+
+    assert stub_model.calls == calls
+    assert os.path.exists(os.path.join(output_dir, result["html"]))
+    assert not run_exists(output_dir, run["run_id"])
+
+
+def test_error_summaries_are_not_checkpointed(tmp_path, articles):
+    checkpoint = RunCheckpoint.create(str(tmp_path), articles)
+    checkpoint.save_summary("https://news.example.com/0", {"summary": "- Done."})
+    checkpoint.save_summary("https://news.example.com/1", {"summary": "[Error generating summary: timeout]"})
+
+    reopened = RunCheckpoint.open(str(tmp_path), checkpoint.run_id)
+    assert list(reopened.summaries()) == ["https://news.example.com/0"]
+    assert reopened.load("articles") == articles
+
+
+def test_run_lock_refuses_a_second_resume_and_prune_skips_it(tmp_path, articles):
+    from checkpoints import LOCK_FILE, RunInProgress, prune_runs
+
+    running = RunCheckpoint.create(str(tmp_path), articles, "20250601-090000-aaaaaa")
+    running.acquire()
+    with pytest.raises(RunInProgress):
+        RunCheckpoint.open(str(tmp_path), running.run_id)
+    with pytest.raises(RunInProgress):
+        RunCheckpoint(str(tmp_path), running.run_id).acquire()
+
+    stale = RunCheckpoint.create(str(tmp_path), articles, "20250601-090000-bbbbbb")
+    with open(os.path.join(stale.directory, LOCK_FILE), "w") as f:
+        f.write("localhost-that-exited:0")  # another host's lock is left alone...
+    assert stale.in_progress()
+    with open(os.path.join(stale.directory, LOCK_FILE), "w") as f:
+        f.write("")  # ...but an empty or exited owner's lock is taken over
+    RunCheckpoint.open(str(tmp_path), stale.run_id).acquire()
+    stale.release()
+
+    for checkpoint in (running, stale):
+        info = checkpoint.info()
+        checkpoint.save("run", dict(info, updated_at="2025-06-01T09:00:00"))
+    assert prune_runs(str(tmp_path)) == [stale.run_id]
+    assert [run["run_id"] for run in list_runs(str(tmp_path))] == [running.run_id]
+    running.release()
+
+
+def test_failed_summary_fails_the_run_and_resume_retries_only_it(tmp_path, stub_model, articles, monkeypatch):
+    output_dir = str(tmp_path / "output")
+    generate_summary = summariser.generate_summary
+
+    def quota_blip(model, content):
+        if "Developer 1 " in content:
+            return "[Error generating summary: 429 quota exceeded]"
+        return generate_summary(model, content)
+
+    monkeypatch.setattr(summariser, "generate_summary", quota_blip)
+    with pytest.raises(RuntimeError, match="1 of 3 articles could not be summarised"):
+        generate_briefing_from_articles(articles, output_dir=output_dir, pdf=False)
+    [run] = list_runs(output_dir)
+    assert run["status"] == FAILED and "briefing" not in run["completed"]
+    assert stub_model.calls == 2
+
+    monkeypatch.setattr(summariser, "generate_summary", generate_summary)
+    result = resume_briefing(run["run_id"], output_dir=output_dir, pdf=False)
+
+    assert stub_model.calls == 2 + 1 + 1  # the failed summary, then the intro
+    markdown = open(os.path.join(output_dir, result["markdown"]), encoding="utf-8").read()
+    assert "[Error" not in markdown and "Developer 1 closed a refinancing" in markdown
@@ -0,0 +1,71 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from config import ConfigError, ConfigStore, validate_config
+
+
+def write(path, data):
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+@pytest.fixture
+def store(tmp_path):
+    path, default_path = tmp_path / "config.json", tmp_path / "config_default.json"
+    write(path, {"KEYWORDS": ["green bonds"], "NEWS_API_KEY": "abc"})
+    write(default_path, {"KEYWORDS": ["Sustainable finance"]})
+    return ConfigStore(str(path), str(default_path))
+
+
+def test_validate_config_normalises_and_reports_every_error():
+    assert validate_config({"KEYWORDS": [" wind ", ""], "EXTRA": 1}) == {"KEYWORDS": ["wind"], "EXTRA": 1}
+    with pytest.raises(ConfigError) as e:
+        validate_config({"KEYWORDS": "wind", "NEWS_API_KEY": 3})
+    assert "KEYWORDS must be a list of strings." in str(e.value)
+    assert "NEWS_API_KEY must be a string." in str(e.value)
+    with pytest.raises(ConfigError):
+        validate_config(["wind"])
+
+
+def test_get_reads_once_and_reloads_on_change(store, monkeypatch):
+    assert store.get()["KEYWORDS"] == ["green bonds"]
+    reads = []
+    real_open = open
+    monkeypatch.setattr("builtins.open", lambda *a, **k: reads.append(a[0]) or real_open(*a, **k))
+    store.get()
+    assert reads == []
+
+    write(Path(store.path), {"KEYWORDS": ["offshore wind", "tidal"]})
+    assert store.get()["KEYWORDS"] == ["offshore wind", "tidal"]
+    assert len(reads) == 1
+
+
+def test_invalid_file_keeps_last_good_config(store):
+    store.get()
+    with open(store.path, "w", encoding="utf-8") as f:
+        f.write('{"KEYWORDS": 5}')
+    assert store.get()["KEYWORDS"] == ["green bonds"]
+
+
+def test_save_is_validated_and_atomic(store):
+    with pytest.raises(ConfigError):
+        store.save({"KEYWORDS": [1]})
+    assert json.loads(open(store.path, encoding="utf-8").read())["KEYWORDS"] == ["green bonds"]
+
+    store.update({"KEYWORDS": ["hydrogen"]})
+    assert json.loads(open(store.path, encoding="utf-8").read()) == {"KEYWORDS": ["hydrogen"], "NEWS_API_KEY": "abc"}
+    assert [name for name in os.listdir(os.path.dirname(store.path)) if name.endswith(".tmp")] == []
+    assert store.reset() == {"KEYWORDS": ["Sustainable finance"]}
+
+
+def test_change_events(store):
+    events = []
+    store.subscribe(lambda config, changed: events.append(changed), keys=["KEYWORDS"])
+
+    store.update({"NEWS_API_KEY": "def"})
+    assert events == []  # unrelated key: no event
+
+    store.update({"KEYWORDS": ["Tidal Stream"]})
+    assert events == [{"KEYWORDS"}]
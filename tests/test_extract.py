@@ -1,5 +1,12 @@
-import pytest
 import asyncio
+import os
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from news_scraper import extractor
 from news_scraper.extractor import get_full_article
 
 # Example public URLs (should be free to access)
@@ -19,4 +26,33 @@ def test_get_full_article(url):
     if not article:
         pytest.skip("Extraction failed or no content returned.")
     assert article["title"] and isinstance(article["title"], str)
-    assert article["text"] and len(article["text"]) >= 1000 
\ No newline at end of file
+    assert article["text"] and len(article["text"]) >= 1000 
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), "..", "benchmarks", "extraction_corpus")
+
+
+@pytest.fixture
+def corpus_url():
+    class QuietHandler(SimpleHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=CORPUS_DIR))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+def test_get_full_article_offline(corpus_url, monkeypatch):
+    # Static layers only; the recorded pages are served locally
+    monkeypatch.setattr(extractor, "LAYERS", [layer for layer in extractor.LAYERS if layer[0] != "playwright"])
+
+    article = asyncio.run(get_full_article(f"{corpus_url}/northsea-wire/nordic-hydro-stake-sale.html"))
+    assert article["layer"] == "newspaper3k"
+    assert article["title"] == "Infrastructure trust agrees sale of Nordic hydro stake"
+    with open(os.path.join(CORPUS_DIR, "northsea-wire", "nordic-hydro-stake-sale.txt"), encoding="utf-8") as f:
+        gold = f.read()
+    assert gold.split("\n")[0][:80] in article["text"] and len(article["text"]) >= extractor.MIN_TEXT_CHARS
+
+    # Below MIN_TEXT_CHARS in every layer
+    assert asyncio.run(get_full_article(f"{corpus_url}/energy-transition-blog/hydrogen-grant-quick-take.html")) is None
@@ -1,6 +1,8 @@
 import pytest
 from pathlib import Path
-from formatter import generate_markdown, generate_html, generate_pdf
+from formatter import generate_markdown, generate_html, generate_pdf, write_briefing_outputs, render_markdown, _font_face_css
+
+GOLDEN_DIR = Path(__file__).parent / "golden"
 
 
 @pytest.fixture
@@ -51,3 +53,101 @@ def test_generate_pdf_output(tmp_path, sample_briefing):
     generate_pdf(sample_briefing, output_path=str(pdf_path), logo_path=None)
     assert pdf_path.exists()
     assert pdf_path.stat().st_size > 1000  # check that file is not empty
+
+
+def test_write_briefing_outputs_without_pdf(tmp_path, sample_briefing):
+    md_path = tmp_path / "briefing.md"
+    html_path = tmp_path / "briefing.html"
+    timings = write_briefing_outputs(sample_briefing, str(md_path), str(html_path), None)
+    assert md_path.exists() and html_path.exists()
+    assert html_path.read_text(encoding="utf-8") == generate_html(sample_briefing, "")
+    assert set(timings) == {"markdown", "html"}
+
+
+def test_generate_html_has_no_remote_assets(sample_briefing):
+    html = generate_html(sample_briefing, logo_path=None)
+    assert "fonts.googleapis.com" not in html
+    assert "@import" not in html
+
+
+def test_font_face_css_inlines_vendored_fonts(tmp_path):
+    (tmp_path / "Inter-SemiBold.woff2").write_bytes(b"fake-font-data")
+    (tmp_path / "notes.txt").write_text("ignored")
+    css = _font_face_css(str(tmp_path))
+    assert "font-family: 'Inter'" in css
+    assert "font-weight: 600" in css
+    assert "data:font/woff2;base64," in css
+    assert _font_face_css(str(tmp_path / "missing")) == ""
+
+
+GOLDEN_BRIEFING = {
+    "title": "SAFL End of Week Briefing",
+    "date": "2025-06-18",
+    "intro": "This week the sustainable finance update covered green bonds, wind and storage.",
+    "articles": [
+        {"title": "Green bonds rise", "summary": "- Investors are piling into ESG assets.\n- Issuance hit a record.\n\nTopic: Market Trends", "url": "https://example.com/1", "date": "2025-06-17", "source": "ESG Newswire", "sentiment": "Positive"},
+        {"title": "Storage fund widens discount", "summary": "**Gore Street** reported a NAV drop.", "url": "https://example.com/2", "date": "2025-06-16", "source": "Fund Times", "sentiment": "neg"},
+        {"title": "Policy update", "summary": "", "url": "https://example.com/3", "date": None, "source": None, "sentiment": None},
+    ],
+    "fund_performance": {
+        "best_performers": [{"Fund Name": "Greencoat UK Wind", "Close Price": 1.42, "NAV": 1.60, "Discount (%)": -11.25}],
+        "worst_performers": [{"Fund Name": "Gore Street Energy Storage Fund", "Close Price": 0.51, "NAV": 1.05, "Discount (%)": -51.43}],
+        "last_updated": "2025-06-18 09:00:00",
+    },
+}
+
+
+@pytest.fixture
+def without_fonts(monkeypatch):
+    """The golden HTML covers markup and CSS, not the inlined font files."""
+    import formatter
+
+    monkeypatch.setattr(formatter, "_font_face_css", lambda: "")
+    formatter.get_briefing_style.cache_clear()
+    yield
+    formatter.get_briefing_style.cache_clear()
+
+
+def test_generate_html_matches_golden(without_fonts):
+    expected = (GOLDEN_DIR / "briefing.html").read_text(encoding="utf-8")
+    assert generate_html(GOLDEN_BRIEFING, "images/logo.png") == expected
+
+
+def test_render_markdown_matches_golden():
+    expected = (GOLDEN_DIR / "briefing.md").read_text(encoding="utf-8")
+    assert render_markdown(GOLDEN_BRIEFING) == expected
+
+
+def test_generate_html_escapes_article_fields(sample_briefing):
+    sample_briefing["articles"][0]["title"] = "<script>alert(1)</script>"
+    html = generate_html(sample_briefing, logo_path=None)
+    assert "<script>alert(1)</script>" not in html
+    assert "&lt;script&gt;" in html
+
+
+def test_pdf_renderer_fails_fast_when_playwright_cannot_start(monkeypatch):
+    import sys
+    from formatter import PdfRenderer
+
+    monkeypatch.setitem(sys.modules, "playwright.sync_api", None)  # import raises ImportError
+    renderer = PdfRenderer()
+    with pytest.raises(ImportError):
+        renderer.render("/tmp/briefing.html", "/tmp/briefing.pdf", timeout=10)
+    with pytest.raises(ImportError):  # a new worker is started for the next render
+        renderer.render("/tmp/briefing.html", "/tmp/briefing.pdf", timeout=10)
+    renderer.close()
+
+
+def test_get_pdf_renderer_reports_missing_playwright(monkeypatch):
+    import importlib.util
+    from formatter import get_pdf_renderer
+
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name: None)
+    with pytest.raises(ImportError, match="Playwright"):
+        get_pdf_renderer()
+
+
+def test_vendored_fonts_are_inlined():
+    css = _font_face_css()
+    assert css.count("@font-face") == 4
+    assert "font-family: 'OpenSans'; font-style: normal; font-weight: 700" in css
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fund_history import FundHistoryStore, get_discount_analytics
+
+
+def make_history(tickers, days, start="2025-01-01", discount=-10.0, step=0.0):
+    dates = pd.bdate_range(start, periods=days)
+    rows = []
+    for t, ticker in enumerate(tickers):
+        for i, day in enumerate(dates):
+            nav = 100.0
+            rows.append({"Ticker": ticker, "Date": day, "Close Price": nav * (1 + (discount + step * i) / 100), "NAV": nav})
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FundHistoryStore(str(tmp_path / "history"))
+
+
+def test_append_and_load_keeps_last_value_per_day(store):
+    store.append(make_history(["UKW.L"], 3))
+    later = make_history(["UKW.L"], 1, start="2025-01-03", discount=-20.0)
+    store.append(later)
+    rows = store.load()["rows"]
+    assert len(rows) == 3
+    assert rows.iloc[-1]["Close Price"] == pytest.approx(80.0)
+    assert len(store.segments()) == 2
+
+
+def test_compact_merges_segments(store):
+    store.append(make_history(["UKW.L"], 3))
+    store.append(make_history(["GSF.L"], 3))
+    before = store.load()["rows"]
+    store.compact()
+    assert len(store.segments()) == 1
+    pd.testing.assert_frame_equal(store.load()["rows"], before)
+
+
+def test_discount_analytics(store):
+    store.append(make_history(["UKW.L"], 30, discount=-10.0, step=-0.5))
+    store.append(make_history(["GSF.L"], 30, discount=-40.0))
+    analytics = store.discount_analytics()
+    ukw = analytics.loc["UKW.L"]
+    assert ukw["Discount (%)"] == pytest.approx(-10.0 - 0.5 * 29)
+    assert ukw["1w Change"] == pytest.approx(-2.5)
+    assert ukw["1m Change"] == pytest.approx(-10.5)
+    assert ukw["Discount Z-Score"] < 0
+    assert ukw["Percentile Rank"] == pytest.approx(100 / 30)
+    assert np.isnan(analytics.loc["GSF.L", "Discount Z-Score"])
+
+
+def test_get_discount_analytics_empty(tmp_path):
+    assert get_discount_analytics(str(tmp_path / "none")) == {}
@@ -0,0 +1,86 @@
+import os
+import pytest
+import fund_info
+from fund_info import load_fund_data, get_fund_performance, read_fund_metadata, metadata_path
+from fund_history import FundHistoryStore
+
+CSV = """Fund Name,Ticker,Date,Close Price,NAV,Discount (%)
+Greencoat UK Wind,UKW.L,2025-07-17,142.0,160.0,-11.25
+Gore Street Energy Storage Fund,GSF.L,2025-07-18,51.0,105.0,-51.43
+Foresight Solar Fund,FSFL.L,2025-07-16,90.0,115.0,-21.74
+"""
+
+
+@pytest.fixture
+def fund_csv(tmp_path):
+    path = tmp_path / "fund_analysis_results.csv"
+    path.write_text(CSV)
+    return str(path)
+
+
+def test_load_fund_data_sorts_and_splits(fund_csv):
+    fund_data = load_fund_data(fund_csv)
+    assert [r["Fund Name"] for r in fund_data["records"]][0] == "Greencoat UK Wind"
+    assert len(fund_data["best_performers"]) == 2
+    assert fund_data["worst_performers"][0]["Ticker"] == "GSF.L"
+    assert fund_data["latest_date"] == "2025-07-18"
+    assert set(get_fund_performance(fund_csv)) == {"best_performers", "worst_performers", "last_updated"}
+
+
+def test_load_fund_data_is_cached_until_file_changes(fund_csv, monkeypatch):
+    first = load_fund_data(fund_csv)
+    monkeypatch.setattr(fund_info.pd, "read_csv", lambda *a, **k: pytest.fail("CSV parsed twice"))
+    assert load_fund_data(fund_csv) is first
+    monkeypatch.undo()
+
+    with open(fund_csv, "a") as f:
+        f.write("US Solar Fund,USF.L,2025-07-19,40.0,80.0,-50.0\n")
+    refreshed = load_fund_data(fund_csv)
+    assert refreshed is not first
+    assert refreshed["latest_date"] == "2025-07-19"
+
+
+def test_read_fund_metadata_uses_sidecar(fund_csv, monkeypatch):
+    meta = read_fund_metadata(fund_csv)
+    assert meta["latest_date"] == "2025-07-18" and meta["rows"] == 3
+    assert os.path.exists(metadata_path(fund_csv))
+    monkeypatch.setattr(fund_info, "load_fund_data", lambda *a, **k: pytest.fail("sidecar not used"))
+    assert read_fund_metadata(fund_csv)["latest_date"] == "2025-07-18"
+
+
+def test_missing_fund_data(tmp_path):
+    missing = str(tmp_path / "missing.csv")
+    assert load_fund_data(missing) is None
+    assert read_fund_metadata(missing) is None
+    assert fund_info.is_fund_data_current(missing) is False
+
+
+def test_refresh_fund_data_only_requests_stale_tickers(tmp_path, fund_csv, monkeypatch):
+    from datetime import date
+    from market_data import FileMarketDataProvider
+    import pandas as pd
+
+    monkeypatch.setattr(fund_info, "acceptable_data_date", lambda today=None: date(2025, 7, 17))
+    tickers_path = tmp_path / "tickers.csv"
+    tickers_path.write_text("Investment trust name,Ticker\nGreencoat UK Wind,UKW.L\nGore Street Energy Storage Fund,GSF.L\nForesight Solar Fund,FSFL.L\n")
+    history_path = tmp_path / "history.csv"
+    today = date.today().isoformat()
+    history_path.write_text(f"Ticker,Date,Close Price,NAV\nFSFL.L,{today},95.0,115.0\nUKW.L,{today},1.0,2.0\n")
+
+    old = os.path.getmtime(fund_csv) - 24 * 3600
+    os.utime(fund_csv, (old, old))
+
+    requested = []
+    provider = FileMarketDataProvider(str(history_path))
+    original = provider.get_history
+    monkeypatch.setattr(provider, "get_history", lambda tickers, *a: requested.extend(tickers) or original(tickers, *a))
+
+    history_store = FundHistoryStore(str(tmp_path / "history"))
+    assert fund_info.refresh_fund_data(force=False, provider=provider, tickers_path=str(tickers_path),
+                                       output_path=fund_csv, history_store=history_store)
+    assert requested == ["FSFL.L"]
+    assert provider.calls == 1
+    df = pd.read_csv(fund_csv).set_index("Ticker")
+    assert df.loc["FSFL.L", "Close Price"] == 95.0
+    assert df.loc["UKW.L", "Close Price"] == 142.0
+    assert history_store.load()["rows"]["Ticker"].tolist() == ["FSFL.L"]
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+import ingest
+from ingest import ingest_news, is_truncated, load_candidates, load_corpus, save_corpus
+
+
+def article(title, days_ago=0, content="Full text about offshore wind.", url=None):
+    published = (datetime.now(timezone.utc) - timedelta(days=days_ago)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return {
+        "title": title,
+        "description": "",
+        "content": content,
+        "url": url or f"https://example.com/{title.replace(' ', '-')}",
+        "publishedAt": published,
+        "source": {"name": "Example"},
+    }
+
+
+@pytest.fixture
+def corpus_path(tmp_path):
+    return str(tmp_path / "candidates.json")
+
+
+def test_load_candidates_filters_window_and_keywords(corpus_path):
+    save_corpus({
+        "ingested_at": datetime.now().isoformat(timespec="seconds"),
+        "keywords": ["offshore wind", "green hydrogen"],
+        "articles": [
+            article("Offshore wind record", 0),
+            article("Hydrogen plant opens", 1, content="green hydrogen electrolyser"),
+            article("Old wind story", 6),
+        ],
+    }, corpus_path)
+    assert len(load_candidates(None, from_days_ago=3, path=corpus_path)) == 2
+    titles = [a["title"] for a in load_candidates(["green hydrogen"], from_days_ago=3, path=corpus_path)]
+    assert titles == ["Hydrogen plant opens"]
+
+
+def test_load_candidates_falls_back_when_corpus_cannot_answer(corpus_path):
+    assert load_candidates(None, path=corpus_path) is None
+    save_corpus({
+        "ingested_at": (datetime.now() - timedelta(hours=5)).isoformat(timespec="seconds"),
+        "keywords": ["offshore wind"],
+        "articles": [article("Offshore wind record")],
+    }, corpus_path)
+    assert load_candidates(None, path=corpus_path) is None
+    assert load_candidates(None, path=corpus_path, max_age_hours=24) is not None
+    assert load_candidates(["solar"], path=corpus_path, max_age_hours=24) is None
+
+
+def test_ingest_news_merges_scores_and_dedups(corpus_path, tmp_path, monkeypatch):
+    from news_store import NEWSAPI, NewsStore
+
+    store = NewsStore(str(tmp_path / "news.db"))
+    batches = [
+        [article("Offshore wind record"), article("Offshore wind record!", url="https://other.com/a")],
+        [article("Offshore wind record"), article("Hydrogen plant opens")],
+    ]
+    monkeypatch.setattr("news_fetcher.fetch_articles", lambda keywords, from_days_ago: batches.pop(0))
+    monkeypatch.setattr(ingest, "score_article", lambda a: "Neutral")  # VADER lexicon needs a download
+    assert ingest_news(["offshore wind"], path=corpus_path, enrich=False, store=store) == 1  # the near-duplicate is dropped
+    assert ingest_news(["offshore wind"], path=corpus_path, enrich=False, store=store) == 1
+    corpus = load_corpus(corpus_path)
+    assert corpus["keywords"] == ["offshore wind"]
+    assert sorted(a["title"] for a in corpus["articles"]) == ["Hydrogen plant opens", "Offshore wind record"]
+    assert all(a["sentiment"] == "Neutral" for a in corpus["articles"])
+    stored = store.query(kind=NEWSAPI)["articles"]
+    assert sorted(a["title"] for a in stored) == ["Hydrogen plant opens", "Offshore wind record"]
+
+
+def test_is_truncated():
+    assert is_truncated({"content": "Shares rose on Monday after… [+2345 chars]"})
+    assert is_truncated({"content": None})
+    assert not is_truncated({"content": "Complete article text."})
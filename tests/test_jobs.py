@@ -0,0 +1,90 @@
+import sqlite3
+import threading
+import pytest
+from jobs import JobRunner, FAILED, SUCCEEDED
+
+
+@pytest.fixture
+def runner(tmp_path):
+    runner = JobRunner(db_path=str(tmp_path / "jobs.db"))
+    yield runner
+    runner.shutdown()
+
+
+def wait_for(runner, job_id):
+    runner.shutdown(wait=True)
+    return runner.get(job_id)
+
+
+def test_job_records_stages_and_result(runner):
+    def work(articles, progress=None):
+        progress("build")
+        progress("render")
+        return {"count": len(articles)}
+
+    job_id = runner.submit("briefing", work, articles=[{"title": "a"}, {"title": "b"}])
+    job = wait_for(runner, job_id)
+    assert job["status"] == SUCCEEDED
+    assert job["stage"] == "render"
+    assert [s["stage"] for s in job["stages"]] == ["build", "render"]
+    assert job["result"] == {"count": 2}
+
+
+def test_failed_job_records_error(runner):
+    def work(progress=None):
+        progress("summarise")
+        raise ValueError("GOOGLE_API_KEY is missing or None.")
+
+    job = wait_for(runner, runner.submit("briefing", work))
+    assert job["status"] == FAILED
+    assert job["stage"] == "summarise"
+    assert "GOOGLE_API_KEY" in job["error"]
+
+
+def test_submit_returns_before_job_finishes(runner):
+    release = threading.Event()
+
+    def work(progress=None):
+        release.wait(5)
+        return {}
+
+    job_id = runner.submit("briefing", work)
+    assert runner.get(job_id)["status"] in ("queued", "running")
+    release.set()
+    assert wait_for(runner, job_id)["status"] == SUCCEEDED
+
+
+def test_unfinished_jobs_marked_interrupted_on_restart(tmp_path):
+    db_path = str(tmp_path / "jobs.db")
+    JobRunner(db_path=db_path).shutdown()
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "INSERT INTO jobs (id, kind, status, created_at, updated_at) VALUES ('abc', 'briefing', 'running', '', '')"
+        )
+    runner = JobRunner(db_path=db_path)
+    job = runner.get("abc")
+    runner.shutdown()
+    assert job["status"] == FAILED
+    assert job["error"] == "interrupted"
+    assert runner.get("missing") is None
+
+
+def test_restart_only_interrupts_jobs_whose_owner_exited(tmp_path):
+    import os
+    import socket
+    import subprocess
+    import sys
+
+    db_path = str(tmp_path / "jobs.db")
+    JobRunner(db_path=db_path).shutdown()
+    exited = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True)
+    host = socket.gethostname()
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO jobs (id, kind, status, owner, created_at, updated_at) VALUES (?, 'briefing', 'running', ?, '', '')",
+            [("live", f"{host}:{os.getpid()}"), ("dead", f"{host}:{exited.stdout.strip()}")],
+        )
+    runner = JobRunner(db_path=db_path)  # e.g. a second web worker starting up
+    runner.shutdown()
+    assert runner.get("live")["status"] == "running"
+    assert runner.get("dead")["status"] == FAILED
@@ -0,0 +1,73 @@
+from datetime import datetime
+import pandas as pd
+import pytest
+from market_data import FileMarketDataProvider, get_provider, latest_discounts, _refinitiv_to_long, MarketDataError
+
+
+@pytest.fixture
+def history_csv(tmp_path):
+    path = tmp_path / "history.csv"
+    pd.DataFrame([
+        {"Ticker": "UKW.L", "Date": "2025-07-16", "Close Price": 140.0, "NAV": 160.0},
+        {"Ticker": "UKW.L", "Date": "2025-07-17", "Close Price": 142.0, "NAV": 160.0},
+        {"Ticker": "GSF.L", "Date": "2025-07-17", "Close Price": 51.0, "NAV": 105.0},
+        {"Ticker": "GSF.L", "Date": "2025-07-18", "Close Price": 52.0, "NAV": None},
+        {"Ticker": "OLD.L", "Date": "2025-06-01", "Close Price": 10.0, "NAV": 12.0},
+    ]).to_csv(path, index=False)
+    return str(path)
+
+
+def test_file_provider_filters_by_ticker_and_date(history_csv):
+    with FileMarketDataProvider(history_csv) as provider:
+        history = provider.get_history(["UKW.L", "GSF.L", "OLD.L"], ["Close Price", "NAV"], datetime(2025, 7, 10), datetime(2025, 7, 18))
+    assert set(history["Ticker"]) == {"UKW.L", "GSF.L"}
+    assert provider.calls == 1
+
+
+def test_latest_discounts_uses_latest_complete_row(history_csv):
+    with FileMarketDataProvider(history_csv) as provider:
+        history = provider.get_history(["UKW.L", "GSF.L"], ["Close Price", "NAV"], datetime(2025, 7, 10), datetime(2025, 7, 18))
+    results = latest_discounts(history, {"UKW.L": "Greencoat UK Wind", "GSF.L": "Gore Street"}).set_index("Ticker")
+    assert results.loc["UKW.L", "Date"] == "2025-07-17"
+    assert results.loc["UKW.L", "Discount (%)"] == pytest.approx(-11.25)
+    assert results.loc["GSF.L", "Date"] == "2025-07-17"
+    assert results.loc["GSF.L", "Fund Name"] == "Gore Street"
+
+
+def test_refinitiv_multi_instrument_frame_to_long():
+    index = pd.to_datetime(["2025-07-17", "2025-07-18"])
+    columns = pd.MultiIndex.from_tuples([("UKW.L", "Close Price"), ("UKW.L", "Net Asset Value"), ("GSF.L", "Close Price"), ("GSF.L", "Net Asset Value")])
+    data = pd.DataFrame([[1, 2, 3, 4], [5, 6, 7, 8]], index=index, columns=columns)
+    long_df = _refinitiv_to_long(data, ["UKW.L", "GSF.L"], ["Close Price", "NAV"])
+    assert list(long_df.columns) == ["Ticker", "Date", "Close Price", "NAV"]
+    assert len(long_df) == 4
+    assert long_df[long_df["Ticker"] == "GSF.L"]["NAV"].tolist() == [4, 8]
+
+
+def test_get_provider_specs(tmp_path):
+    assert get_provider(f"file:{tmp_path / 'x.csv'}").name == "file"
+    assert get_provider("refinitiv").name == "refinitiv"
+    with pytest.raises(MarketDataError):
+        get_provider("bogus")
+
+
+def test_refinitiv_columns_are_matched_by_name_not_position():
+    index = pd.to_datetime(["2025-07-17"])
+    data = pd.DataFrame([[1.6, 1.42, "x"]], index=index, columns=["NETASSETVAL", "Close Price", "Currency"])
+    long_df = _refinitiv_to_long(data, ["UKW.L"], ["Close Price", "NAV"])
+    assert long_df[["Ticker", "Close Price", "NAV"]].values.tolist() == [["UKW.L", 1.42, 1.6]]
+
+    only_price = _refinitiv_to_long(data[["Close Price"]], ["UKW.L"], ["Close Price", "NAV"])
+    assert only_price["NAV"].isna().all()
+    with pytest.raises(MarketDataError):
+        _refinitiv_to_long(data[["Currency"]], ["UKW.L"], ["Close Price", "NAV"])
+
+
+def test_market_data_provider_requires_get_history():
+    from market_data import MarketDataProvider
+
+    class Incomplete(MarketDataProvider):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
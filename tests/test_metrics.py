@@ -0,0 +1,106 @@
+import json
+from unittest.mock import Mock
+
+import pytest
+
+import metrics
+from summariser import generate_summary
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    metrics.get_registry().reset()
+    yield
+    metrics.get_registry().reset()
+
+
+def test_render_prometheus_text():
+    metrics.inc("cache_requests_total", cache="artifact", result="hit")
+    metrics.inc("cache_requests_total", 2, cache="artifact", result="hit")
+    metrics.observe("upstream_request_seconds", 0.3, service="newsapi")
+    metrics.observe("upstream_request_seconds", 12, service="newsapi")
+
+    text = metrics.render()
+
+    assert "# TYPE cache_requests_total counter" in text
+    assert 'cache_requests_total{cache="artifact",result="hit"} 3' in text
+    assert 'upstream_request_seconds_bucket{service="newsapi",le="0.25"} 0' in text
+    assert 'upstream_request_seconds_bucket{service="newsapi",le="0.5"} 1' in text
+    assert 'upstream_request_seconds_bucket{service="newsapi",le="+Inf"} 2' in text
+    assert 'upstream_request_seconds_count{service="newsapi"} 2' in text
+    assert "llm_requests_total" not in text  # nothing recorded yet
+    with pytest.raises(ValueError):
+        metrics.inc("upstream_request_seconds")
+
+
+def test_run_report_collects_stages_and_counters(tmp_path):
+    path = str(tmp_path / "briefing_2025-06-18.run.json")
+    with metrics.run("briefing") as report:
+        with metrics.stage("dedup", articles_in=5) as stage:
+            stage.articles_out = 3
+        with metrics.run("briefing") as nested:  # joins the enclosing run
+            assert nested is report
+            metrics.inc("llm_tokens_total", 120, call="summary", kind="prompt")
+        with pytest.raises(RuntimeError):
+            with metrics.stage("render"):
+                raise RuntimeError("boom")
+        report.path = path
+
+    data = json.loads(open(path, encoding="utf-8").read())
+    assert data["status"] == "succeeded"
+    assert [(s["stage"], s["articles_in"], s["articles_out"]) for s in data["stages"]] == [("dedup", 5, 3), ("render", None, None)]
+    assert data["stages"][1]["error"] == "RuntimeError"
+    assert data["counters"] == {'llm_tokens_total{call="summary",kind="prompt"}': 120}
+    registry = metrics.get_registry()
+    assert registry.value("briefing_runs_total", kind="briefing", status="succeeded") == 1
+    assert registry.value("briefing_stage_articles_total", stage="dedup", direction="out") == 3
+    assert registry.value("briefing_stage_seconds", stage="render") == 1
+
+
+def test_streamed_stages_overlap_and_stop_early():
+    pulled = []
+
+    def source():
+        for i in range(100):
+            pulled.append(i)
+            yield i
+
+    with metrics.run("briefing") as report:
+        evens = metrics.streamed("filter", lambda items: (i for i in items if i % 2 == 0), source())
+        squares = metrics.streamed("square", lambda items: (i * i for i in items), evens)
+        first = [next(squares) for _ in range(3)]
+        squares.close()
+        evens.close()
+
+    assert first == [0, 4, 16] and pulled == [0, 1, 2, 3, 4]
+    filtered, squared = report.stages  # in pipeline order, although the inner stage finished first
+    assert (filtered["stage"], filtered["articles_in"], filtered["articles_out"]) == ("filter", 5, 3)
+    assert (squared["stage"], squared["articles_in"], squared["articles_out"]) == ("square", 3, 3)
+    assert squared["started_ms"] <= squared["first_out_ms"] <= squared["finished_ms"]
+    assert metrics.get_registry().value("briefing_stage_articles_total", stage="filter", direction="in") == 5
+
+
+def test_summariser_records_llm_usage():
+    model = Mock()
+    model.generate_content.return_value = Mock(parts=True, text="- point",
+                                               usage_metadata=Mock(prompt_token_count=400, candidates_token_count=60))
+    generate_summary(model, "text")
+    model.generate_content.side_effect = Exception("quota")
+    generate_summary(model, "text")
+
+    registry = metrics.get_registry()
+    assert registry.value("llm_tokens_total", call="summary", kind="prompt") == 400
+    assert registry.value("llm_tokens_total", call="summary", kind="output") == 60
+    assert registry.value("llm_requests_total", call="summary", status="error") == 1
+    assert registry.value("llm_request_seconds", call="summary") == 2
+
+
+def test_metrics_endpoint():
+    from app import create_app
+
+    metrics.inc("cache_requests_total", cache="corpus", result="miss")
+    response = create_app().test_client().get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    assert 'cache_requests_total{cache="corpus",result="miss"} 1' in response.get_data(as_text=True)
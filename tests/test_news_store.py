@@ -0,0 +1,144 @@
+import json
+import sqlite3
+import pytest
+from news_store import NewsStore, decode_cursor, encode_cursor
+
+
+def fund_article(i, fund="Greencoat UK Wind", sentiment=0.5, day=1):
+    return {
+        "uuid": f"uuid-{i:04d}",
+        "title": f"Article {i} about {fund}",
+        "description": "Wind farm output" if i % 2 else "Dividend update",
+        "url": f"https://example.com/{i}",
+        "source": "example.com",
+        "published_at": f"2025-03-{day:02d}T{i % 24:02d}:00:00.000000Z",
+        "entities": [{"symbol": "UKW.L", "sentiment_score": sentiment}],
+        "funds": [fund],
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    return NewsStore(str(tmp_path / "news.db"))
+
+
+def test_precomputed_fields_and_facets(store):
+    store.upsert([fund_article(1), fund_article(2, fund="Bluefield Solar", sentiment=-0.4)])
+    page = store.query()
+    first = page["articles"][1]
+    assert first["published_at"] == "2025-03-01T01:00:00"
+    assert first["published_at_readable"] == "01 Mar 2025, 01:00"
+    assert first["sentiment_label"] == "Positive"
+    assert store.funds() == [{"name": "Bluefield Solar", "articles": 1}, {"name": "Greencoat UK Wind", "articles": 1}]
+
+    # Re-ingesting an article under a different fund moves the facet count
+    store.upsert([fund_article(1, fund="Bluefield Solar")])
+    assert store.funds() == [{"name": "Bluefield Solar", "articles": 2}]
+
+
+def test_filters(store):
+    store.upsert([fund_article(i, fund="A" if i < 5 else "B", sentiment=0.5 if i % 3 else -0.5, day=1 + i // 4)
+                  for i in range(10)])
+    assert {a["funds"][0] for a in store.query(fund="B")["articles"]} == {"B"}
+    assert len(store.query(fund="B")["articles"]) == 5
+    assert all(a["sentiment_label"] == "Negative" for a in store.query(sentiment="Negative")["articles"])
+    dated = store.query(start="2025-03-02", end="2025-03-02")["articles"]
+    assert sorted(a["id"] for a in dated) == [f"uuid-{i:04d}" for i in range(4, 8)]
+    assert all("Wind" in a["description"] for a in store.query(text="wind farm")["articles"])
+
+
+@pytest.mark.parametrize("fund", [None, "A"])
+def test_cursor_pagination_visits_every_article_once(store, fund):
+    store.upsert([fund_article(i, fund="A", day=1 + i % 3) for i in range(23)])
+    seen, cursor = [], None
+    while True:
+        page = store.query(fund=fund, cursor=cursor, limit=5)
+        seen += [a["id"] for a in page["articles"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert len(seen) == 23 == len(set(seen))
+    assert seen == [a["id"] for a in store.query(fund=fund, limit=100)["articles"]]
+
+
+def test_get_many_and_sync_file(store, tmp_path):
+    path = tmp_path / "news.json"
+    path.write_text(json.dumps([fund_article(1), fund_article(2)]))
+    assert store.sync_file(str(path)) is True
+    assert store.sync_file(str(path)) is False
+    articles = store.get_many(["uuid-0001", "uuid-0002", "missing"])
+    assert [a["uuid"] for a in articles] == ["uuid-0002", "uuid-0001"]
+    assert articles[0]["entities"][0]["symbol"] == "UKW.L"
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor("2025-03-01T00:00:00", "a|b")) == ("2025-03-01T00:00:00", "a|b")
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor")
+
+
+def test_search_ranks_title_matches_and_highlights(store):
+    store.upsert([
+        dict(fund_article(1), title="Quarterly update", description="Greencoat mentioned in passing"),
+        dict(fund_article(2), title="Greencoat raises dividend", description="Dividend growth"),
+        dict(fund_article(3), title="Solar output", description="Unrelated <b>markup</b>"),
+    ])
+    results = store.search("greencoat")
+    assert results["total"] == 2
+    assert [r["id"] for r in results["results"]] == ["uuid-0002", "uuid-0001"]
+    assert "<mark>Greencoat</mark>" in results["results"][0]["snippet"]
+    assert store.search("markup")["results"][0]["snippet"].count("&lt;b&gt;") == 1
+    # Stemming and prefix match on the last word
+    assert store.search("dividends")["total"] == 1
+    assert store.search("green")["total"] == 2
+    assert store.search('"unbalanced (')["total"] == 0
+    assert store.search("")["total"] == 0
+
+
+def test_search_indexes_content_and_keeps_it_on_reingest(store):
+    store.upsert([dict(fund_article(1), content="The electrolyser project in Teesside")])
+    store.upsert([fund_article(1)])  # results file copy without extracted content
+    assert store.search("teesside")["total"] == 1
+    assert store.query(text="electrolyser")["articles"][0]["id"] == "uuid-0001"
+
+
+def test_search_filters(store):
+    store.upsert([fund_article(i, fund="A" if i % 2 else "B", day=1 + i) for i in range(6)])
+    store.upsert([{"title": "Article about offshore wind", "url": "https://news.example/1",
+                   "publishedAt": "2025-03-02T09:00:00Z", "source": {"name": "Wire"}, "sentiment": "Neutral"}],
+                 kind="newsapi")
+    assert store.search("article", fund="A")["total"] == 3
+    assert store.search("article", kind="newsapi")["results"][0]["source"] == "Wire"
+    assert store.search("article", start="2025-03-02", end="2025-03-03")["total"] == 3
+    page = store.search("article", limit=2, offset=6)
+    assert page["total"] == 7 and len(page["results"]) == 1
+
+
+def test_search_index_rebuilt_for_older_store(tmp_path):
+    path = str(tmp_path / "news.db")
+    NewsStore(path).upsert([fund_article(1)])
+    with sqlite3.connect(path) as conn:
+        conn.execute("DELETE FROM articles_fts")
+    assert NewsStore(path).search("article")["total"] == 1
+
+
+def test_published_at_is_stored_in_utc(store):
+    # 01:30 in New York on 1 March is 06:30 UTC, so it sorts after a 05:00Z article
+    store.upsert([dict(fund_article(1), published_at="2025-03-01T01:30:00-05:00"),
+                  dict(fund_article(2), published_at="2025-03-01T05:00:00Z")])
+    assert [a["published_at"] for a in store.query()["articles"]] == ["2025-03-01T06:30:00", "2025-03-01T05:00:00"]
+
+
+def test_get_news_store_syncs_the_fund_news_files_once(tmp_path, monkeypatch):
+    import news_store
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(news_store, "_store", None)
+    (tmp_path / "data").mkdir()
+    (tmp_path / news_store.FUND_NEWS_PATH).write_text(json.dumps([fund_article(1)]))
+    store = news_store.get_news_store()
+    assert len(store.query()["articles"]) == 1
+
+    synced = []
+    monkeypatch.setattr(store, "sync_file", lambda *args, **kwargs: synced.append(args))
+    assert news_store.get_news_store() is store and synced == []
@@ -0,0 +1,87 @@
+import asyncio
+import json
+import os
+import time
+from news_scraper.playwright_layer import get_domain, storage_state_path, load_storage_state, save_storage_state
+
+
+def test_get_domain_strips_www():
+    assert get_domain("https://www.ft.com/content/abc") == "ft.com"
+    assert get_domain("https://News.Example.co.uk/a?b=c") == "news.example.co.uk"
+
+
+def test_load_storage_state_missing(tmp_path):
+    assert load_storage_state("example.com", state_dir=str(tmp_path)) is None
+
+
+def test_load_storage_state_fresh(tmp_path):
+    path = storage_state_path("example.com", str(tmp_path))
+    with open(path, "w") as f:
+        f.write('{"cookies": [], "origins": []}')
+    assert load_storage_state("example.com", state_dir=str(tmp_path)) == path
+
+
+def test_load_storage_state_expired_is_removed(tmp_path):
+    path = storage_state_path("example.com", str(tmp_path))
+    with open(path, "w") as f:
+        f.write('{"cookies": [], "origins": []}')
+    old = time.time() - 3 * 3600
+    os.utime(path, (old, old))
+    assert load_storage_state("example.com", max_age_hours=1, state_dir=str(tmp_path)) is None
+    assert not os.path.exists(path)
+
+
+class FakeContext:
+    """Writes a storage state the way BrowserContext.storage_state(path=...) does, after a pause."""
+
+    def __init__(self, cookie):
+        self.cookie = cookie
+
+    async def storage_state(self, path):
+        await asyncio.sleep(0.01)
+        with open(path, "w") as f:
+            json.dump({"cookies": [{"name": "consent", "value": self.cookie}], "origins": []}, f)
+
+
+def test_concurrent_saves_of_a_domain_each_write_a_whole_file(tmp_path):
+    async def save_both():
+        return await asyncio.gather(*(save_storage_state(FakeContext(cookie), "example.com", state_dir=str(tmp_path))
+                                      for cookie in ("first", "second")))
+
+    first, second = asyncio.run(save_both())
+    assert first == second == storage_state_path("example.com", str(tmp_path))
+    with open(first) as f:
+        assert json.load(f)["cookies"][0]["value"] in ("first", "second")
+    assert os.listdir(tmp_path) == [os.path.basename(first)]  # no temp files left behind
+
+
+class FakeButton:
+    def __init__(self, visible, click_error=None):
+        self.visible, self.click_error, self.first = visible, click_error, self
+
+    async def is_visible(self, timeout):
+        return self.visible
+
+    async def click(self, timeout):
+        if self.click_error:
+            raise self.click_error
+
+
+class FakePage:
+    def __init__(self, button):
+        self.button = button
+
+    def locator(self, selector):
+        return self.button
+
+    async def wait_for_load_state(self, state, timeout):
+        pass
+
+
+def test_consent_hook_reports_whether_the_state_can_be_saved():
+    from news_scraper.playwright_layer import run_consent_hook
+
+    assert asyncio.run(run_consent_hook(FakePage(FakeButton(visible=False)), "example.com"))  # no banner
+    assert asyncio.run(run_consent_hook(FakePage(FakeButton(visible=True)), "example.com"))  # accepted
+    timed_out = FakeButton(visible=True, click_error=TimeoutError("click timed out"))
+    assert not asyncio.run(run_consent_hook(FakePage(timed_out), "example.com"))
@@ -0,0 +1,54 @@
+import json
+import os
+import pstats
+import time
+
+import metrics
+from profiling import profile_run
+
+
+def busy(ms):
+    end = time.perf_counter() + ms / 1000
+    total = 0
+    while time.perf_counter() < end:
+        total += sum(range(100))
+    return total
+
+
+def allocate():
+    return [str(i) * 10 for i in range(20000)]
+
+
+def test_profiled_run_writes_summary_flamegraph_and_pstats(tmp_path):
+    with metrics.run("briefing") as report, profile_run(report, str(tmp_path), top=5):
+        with metrics.stage("summarise"):
+            busy(60)
+        with metrics.stage("render"):
+            kept = allocate()
+        report.path = str(tmp_path / "briefing_2025-06-18.run.json")
+
+    base = tmp_path / "briefing_2025-06-18"
+    summary = open(f"{base}.profile.txt", encoding="utf-8").read()
+    assert summary.startswith("Profiled run:")
+    assert "summarise:" in summary and "busy" in summary
+    assert "render:" in summary and "allocation sites" in summary and "test_profiling.py" in summary
+
+    stacks = [line.rsplit(" ", 1) for line in open(f"{base}.profile.collapsed", encoding="utf-8").read().splitlines()]
+    assert stacks and all(int(count) > 0 for _, count in stacks)
+    assert any(stack.startswith("summarise;") and "test_profiling:busy" in stack for stack, _ in stacks)
+
+    assert "test_profiling.py" in "".join(name[0] for name in pstats.Stats(f"{base}.profile.pstats").stats)
+    assert json.loads(open(report.path, encoding="utf-8").read())["profile_files"] == [
+        "briefing_2025-06-18.profile.txt", "briefing_2025-06-18.profile.collapsed", "briefing_2025-06-18.profile.pstats"]
+    assert report.profiler is None and len(kept) == 20000
+
+
+def test_failed_run_profile_goes_to_output_dir(tmp_path):
+    try:
+        with metrics.run("briefing") as report, profile_run(report, str(tmp_path)):
+            with metrics.stage("fetch"):
+                raise RuntimeError("NewsAPI down")
+    except RuntimeError:
+        pass
+    names = sorted(os.listdir(tmp_path))
+    assert len(names) == 3 and all(name.startswith("profile_") for name in names)
@@ -0,0 +1,81 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import replay
+
+
+class NewsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps({"status": "ok", "path": self.path.split("?")[0]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Set-Cookie", "session=secret")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    monkeypatch.setattr(replay, "LOCAL_HOSTS", ())  # record the local server as if it were remote
+    server = ThreadingHTTPServer(("127.0.0.1", 0), NewsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+def test_record_then_replay_offline(upstream, tmp_path):
+    path = str(tmp_path / "cassette.json")
+    with replay.cassette(path, replay.RECORD):
+        live = requests.get(f"{upstream}/v2/everything?q=wind&from=2025-06-01&apiKey=abc123")
+    recorded = open(path, encoding="utf-8").read()
+    assert "abc123" not in recorded and "REDACTED" in recorded and "Set-Cookie" not in recorded
+
+    with replay.cassette(path) as cassette:
+        # Another day and another key still match; nothing is sent
+        replayed = requests.get(f"{upstream}/v2/everything?apiKey=xyz&from=2025-07-01&q=wind")
+        with pytest.raises(requests.ConnectionError, match="No recorded response"):
+            requests.get(f"{upstream}/v2/everything?q=solar")
+    assert replayed.status_code == 200 and replayed.json() == live.json()
+    assert (cassette.hits, cassette.misses) == (1, 1)
+    assert replay.active() is None
+
+
+def test_responses_for_the_same_request_are_served_in_turn(tmp_path):
+    cassette = replay.Cassette(str(tmp_path / "cassette.json"), replay.RECORD)
+    for page in (1, 2):
+        cassette.add("GET", "https://newsapi.org/v2/everything?q=wind", {"page": page})
+    cassette.save()
+    with replay.cassette(cassette.path):
+        pages = [requests.get("https://newsapi.org/v2/everything?q=wind").json()["page"] for _ in range(3)]
+    assert pages == [1, 2, 2]
+
+
+def test_pipeline_runs_offline(tmp_path, stub_model, articles):
+    from main import fetch_articles_for_briefing, generate_briefing_from_articles
+    from news_fetcher import everything_url
+
+    keywords = ["offshore wind"]
+    cassette = replay.Cassette(str(tmp_path / "cassette.json"), replay.RECORD)
+    cassette.add("GET", everything_url(keywords, 3), {"status": "ok", "totalResults": 3, "articles": articles})
+    cassette.save()
+
+    with replay.cassette(cassette.path):
+        fetched = fetch_articles_for_briefing(keywords, from_days_ago=3, use_corpus=False)
+        result = generate_briefing_from_articles(fetched, output_dir=str(tmp_path / "output"), pdf=False)
+
+    assert result["pdf"] is None
+    markdown = open(tmp_path / "output" / result["markdown"], encoding="utf-8").read()
+    assert "Developer 2 closed a refinancing" in markdown and "Investors welcomed the deal." in markdown
+    assert os.path.exists(tmp_path / "data" / "fund_analysis_results.csv")
+    stages = {s["stage"]: s for s in json.load(open(tmp_path / "output" / result["run_report"], encoding="utf-8"))["stages"]}
+    assert [stages[name]["articles_out"] for name in ("filter", "dedup", "summarise")] == [3, 3, 3]
+    # The fund refresh runs alongside the streamed stages, not after them
+    assert stages["fund_refresh"]["started_ms"] < stages["summarise"]["finished_ms"]
@@ -0,0 +1,35 @@
+from scheduler import Scheduler, load_state
+
+
+def make_scheduler(tmp_path, calls, now):
+    def ok():
+        calls.append("news")
+        return 3
+
+    def boom():
+        calls.append("fund_data")
+        raise RuntimeError("provider down")
+
+    tasks = {"news": (60, ok), "fund_data": (3600, boom)}
+    return Scheduler(tasks, state_path=str(tmp_path / "state.json"), clock=lambda: now[0])
+
+
+def test_runs_due_tasks_and_records_state(tmp_path):
+    calls, now = [], [10_000.0]
+    scheduler = make_scheduler(tmp_path, calls, now)
+    assert scheduler.run_pending() == ["news", "fund_data"]
+    state = load_state(str(tmp_path / "state.json"))
+    assert state["news"]["status"] == "ok"
+    assert state["fund_data"]["status"] == "error"
+    assert state["fund_data"]["error"] == "provider down"
+
+    now[0] += 120
+    assert scheduler.run_pending() == ["news"]
+    assert calls == ["news", "fund_data", "news"]
+
+
+def test_state_survives_restart(tmp_path):
+    calls, now = [], [10_000.0]
+    make_scheduler(tmp_path, calls, now).run_pending()
+    now[0] += 30
+    assert make_scheduler(tmp_path, calls, now).due() == []
@@ -0,0 +1,34 @@
+import pytest
+from screening_store import ScreeningStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ScreeningStore(str(tmp_path / "screening.db"))
+
+
+def articles(n):
+    return [{"title": f"Article {i}", "url": f"https://example.com/{i}", "source": {"name": "Example"}} for i in range(n)]
+
+
+def test_run_round_trip(store):
+    run_id = store.create_run(articles(5))
+    assert store.total(run_id) == 5
+    assert store.get_article(run_id, 3)["title"] == "Article 3"
+    assert store.get_article(run_id, 5) is None
+
+
+def test_get_articles_in_screening_order(store):
+    run_id = store.create_run(articles(5))
+    titles = [a["title"] for a in store.get_articles(run_id, {4, 0, 2})]
+    assert titles == ["Article 0", "Article 2", "Article 4"]
+    assert store.get_articles(run_id, set()) == []
+
+
+def test_delete_run(store):
+    run_id = store.create_run(articles(2))
+    other = store.create_run(articles(1))
+    store.delete_run(run_id)
+    assert store.total(run_id) is None
+    assert store.get_article(run_id, 0) is None
+    assert store.total(other) == 1
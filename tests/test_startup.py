@@ -0,0 +1,15 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFERRED_MODULES = ["google.generativeai", "playwright", "nltk", "textblob", "pandas"]
+
+
+@pytest.mark.parametrize("statement", ["import main", "from app import create_app; create_app()"])
+def test_startup_does_not_import_heavy_dependencies(statement):
+    check = f"{statement}; import sys; print([m for m in {DEFERRED_MODULES!r} if m in sys.modules])"
+    result = subprocess.run([sys.executable, "-c", check], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip().splitlines()[-1] == "[]"
@@ -103,3 +103,13 @@ def test_generate_intro_api_exception():
 
     summary = generate_summary(mock_model, "Important article")
     assert "Error generating summary" in summary
+
+
+def test_stub_backend_answers_in_summary_format():
+    model, chat = configure_model(None, backend="stub")
+    summary = generate_summary(model, "Solar fund raises capital. The deal closed in June. Investors welcomed it.")
+    assert summary.splitlines()[:3] == ["- Solar fund raises capital.", "- The deal closed in June.", "- Investors welcomed it."]
+    assert "Topic:" in summary and summary.endswith("Mentioned Companies: None")
+    assert summary == generate_summary(model, "Solar fund raises capital. The deal closed in June. Investors welcomed it.")
+    assert generate_intro(model, [summary]).endswith("developments in sustainable finance. Solar fund raises capital.")
+    assert model.calls == 3